@@ -0,0 +1,4 @@
+"""Run the modular BNA CLI with `python -m modular_bna`."""
+from modular_bna.cli import app
+
+app()
@@ -5,7 +5,9 @@ import pathlib
 import shutil
 import subprocess
 import sys
+import tempfile
 import time
+import typing
 from datetime import timedelta
 
 import typer
@@ -14,7 +16,16 @@ from loguru import logger
 from typing_extensions import Annotated
 
 from modular_bna.core import (
+    batch,
     bna,
+    cache,
+    checkpoint,
+    connectivity,
+    database,
+    pipeline,
+    profiling,
+    telemetry,
+    template,
     utm,
 )
 
@@ -67,9 +78,137 @@ def run(
     country: str,
     city_fips: str,
     prepare: Annotated[bool, typer.Option(help="Prepare input files")] = False,
+    routing_engine: Annotated[
+        connectivity.RoutingEngine,
+        typer.Option(help="Engine computing the reachable roads"),
+    ] = connectivity.RoutingEngine.PGROUTING,
+    explain: Annotated[
+        int, typer.Option(help="Capture the plans of the N slowest statements")
+    ] = 0,
+    executor: Annotated[
+        pipeline.Executor,
+        typer.Option(help="Run the SQL files natively or with the bash scripts"),
+    ] = pipeline.Executor.NATIVE,
+    workers: Annotated[
+        typing.Optional[int],
+        typer.Option(help="Maximum number of concurrent database sessions"),
+    ] = None,
+    data_dir: Annotated[
+        pathlib.Path, typer.Option(help="Directory containing the city directories")
+    ] = pathlib.Path("tests/samples"),
+    use_cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache", help="Reuse the import results of identical inputs"
+        ),
+    ] = True,
+    ephemeral: Annotated[
+        bool,
+        typer.Option(help="Use unlogged tables, for a disposable database"),
+    ] = False,
+    setup: Annotated[
+        bool,
+        typer.Option(help="Set the database up, unless it comes from the template"),
+    ] = True,
+    resume: Annotated[
+        bool, typer.Option(help="Skip the stages completed by a previous run")
+    ] = False,
+    telemetry_interval: Annotated[
+        float,
+        typer.Option(help="Seconds between two samples of the resources, 0 to disable"),
+    ] = 1.0,
 ):
     """Run an analysis with the modular-bna."""
-    asyncio.run(run_(city, state, country, city_fips, prepare))
+    asyncio.run(
+        run_(
+            city,
+            state,
+            country,
+            city_fips,
+            prepare,
+            routing_engine,
+            explain,
+            executor,
+            workers,
+            data_dir,
+            use_cache,
+            ephemeral,
+            setup,
+            resume,
+            telemetry_interval,
+        )
+    )
+
+
+@app.command()
+def run_with_template(
+    city: str,
+    state: str,
+    country: str,
+    city_fips: str,
+    prepare: Annotated[bool, typer.Option(help="Prepare input files")] = False,
+    routing_engine: Annotated[
+        connectivity.RoutingEngine,
+        typer.Option(help="Engine computing the reachable roads"),
+    ] = connectivity.RoutingEngine.PGROUTING,
+    executor: Annotated[
+        pipeline.Executor,
+        typer.Option(help="Run the SQL files natively or with the bash scripts"),
+    ] = pipeline.Executor.NATIVE,
+    workers: Annotated[
+        typing.Optional[int],
+        typer.Option(help="Maximum number of concurrent database sessions"),
+    ] = None,
+    data_dir: Annotated[
+        pathlib.Path, typer.Option(help="Directory containing the city directories")
+    ] = pathlib.Path("tests/samples"),
+    use_cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache", help="Reuse the import results of identical inputs"
+        ),
+    ] = True,
+    ephemeral: Annotated[
+        bool,
+        typer.Option(help="Use unlogged tables, for a disposable database"),
+    ] = False,
+    keep_database: Annotated[
+        bool, typer.Option(help="Keep the database of the analyzed city")
+    ] = False,
+    resume: Annotated[
+        bool, typer.Option(help="Skip the stages completed by a previous run")
+    ] = False,
+    keep_on_failure: Annotated[
+        bool, typer.Option(help="Keep the database if the analysis fails, to resume it")
+    ] = False,
+):
+    """
+    Run an analysis in a fresh database on a long-lived database server.
+
+    The database is copied from a template database already set up, and
+    dropped at the end of the analysis. A resumed analysis continues in the
+    database kept by the previous run.
+    """
+    # Load the environment variables.
+    load_dotenv()
+    asyncio.run(
+        run_with_template_(
+            city,
+            state,
+            country,
+            city_fips,
+            prepare,
+            routing_engine,
+            executor,
+            workers,
+            data_dir,
+            use_cache,
+            ephemeral,
+            keep_database,
+            resume,
+            keep_on_failure,
+        )
+    )
 
 
 @app.command()
@@ -79,23 +218,338 @@ def run_with_compose(
     country: str,
     city_fips: str,
     prepare: Annotated[bool, typer.Option(help="Prepare input files")] = False,
+    routing_engine: Annotated[
+        connectivity.RoutingEngine,
+        typer.Option(help="Engine computing the reachable roads"),
+    ] = connectivity.RoutingEngine.PGROUTING,
+    explain: Annotated[
+        int, typer.Option(help="Capture the plans of the N slowest statements")
+    ] = 0,
+    executor: Annotated[
+        pipeline.Executor,
+        typer.Option(help="Run the SQL files natively or with the bash scripts"),
+    ] = pipeline.Executor.NATIVE,
+    workers: Annotated[
+        typing.Optional[int],
+        typer.Option(help="Maximum number of concurrent database sessions"),
+    ] = None,
+    ephemeral: Annotated[
+        bool,
+        typer.Option(
+            help="Use unlogged tables and no durability, for a disposable database"
+        ),
+    ] = False,
+    resume: Annotated[
+        bool, typer.Option(help="Skip the stages completed by a previous run")
+    ] = False,
+    keep_on_failure: Annotated[
+        bool, typer.Option(help="Keep the database if the analysis fails, to resume it")
+    ] = False,
 ):
     """Start and stop docker compose when running an analysis."""
     # Load the environment variables.
     load_dotenv()
     asyncio.run(
-        bna.modular_bna_run_n_clean_up(city, state, country, city_fips, prepare)
+        bna.modular_bna_run_n_clean_up(
+            city,
+            state,
+            country,
+            city_fips,
+            prepare,
+            routing_engine,
+            explain,
+            executor,
+            workers,
+            ephemeral,
+            resume,
+            keep_on_failure,
+        )
+    )
+
+
+@app.command(name="batch")
+def run_batch(
+    cities_file: Annotated[
+        pathlib.Path, typer.Argument(help="CSV file with city,state,country,city_fips")
+    ],
+    jobs: Annotated[int, typer.Option(help="Number of cities analyzed at once")] = 2,
+    cores: Annotated[
+        typing.Optional[int],
+        typer.Option(help="Number of cores shared by the cities [default: all]"),
+    ] = None,
+    memory: Annotated[
+        typing.Optional[float],
+        typer.Option(help="Memory in GB shared by the database sessions"),
+    ] = None,
+    data_dir: Annotated[
+        pathlib.Path, typer.Option(help="Directory containing the city directories")
+    ] = pathlib.Path("tests/samples"),
+    summary_file: Annotated[
+        pathlib.Path, typer.Option(help="CSV file summarizing the analyses")
+    ] = pathlib.Path("summary.csv"),
+    prepare: Annotated[bool, typer.Option(help="Prepare input files")] = False,
+    routing_engine: Annotated[
+        connectivity.RoutingEngine,
+        typer.Option(help="Engine computing the reachable roads"),
+    ] = connectivity.RoutingEngine.PGROUTING,
+    executor: Annotated[
+        pipeline.Executor,
+        typer.Option(help="Run the SQL files natively or with the bash scripts"),
+    ] = pipeline.Executor.NATIVE,
+    keep_databases: Annotated[
+        bool, typer.Option(help="Keep the database of the analyzed cities")
+    ] = False,
+    use_cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache", help="Reuse the import results of identical inputs"
+        ),
+    ] = True,
+    ephemeral: Annotated[
+        bool,
+        typer.Option(help="Use unlogged tables, for a disposable database"),
+    ] = False,
+    use_template: Annotated[
+        bool,
+        typer.Option(
+            "--template/--no-template",
+            help="Create the databases from a template database already set up",
+        ),
+    ] = True,
+):
+    """
+    Analyze many cities on a long-lived database server.
+
+    Each city is analyzed in its own database. Running the same batch again
+    skips the cities already analyzed.
+    """
+    # Load the environment variables.
+    load_dotenv()
+    asyncio.run(
+        batch.run_batch(
+            batch.read_cities(cities_file),
+            data_dir,
+            summary_file,
+            jobs,
+            cores,
+            memory,
+            routing_engine,
+            executor,
+            prepare,
+            keep_databases,
+            use_cache,
+            ephemeral,
+            use_template,
+        )
+    )
+
+
+@app.command()
+def rescore(
+    city: str,
+    state: str,
+    country: str,
+    param: Annotated[
+        typing.Optional[typing.List[str]],
+        typer.Option(
+            "--param",
+            "-p",
+            help=(
+                "Override a variable of a step, "
+                "e.g. access_destinations.colleges_first=0.5"
+            ),
+        ),
+    ] = None,
+    workers: Annotated[
+        typing.Optional[int],
+        typer.Option(help="Maximum number of concurrent database sessions"),
+    ] = None,
+    data_dir: Annotated[
+        pathlib.Path, typer.Option(help="Directory containing the city directories")
+    ] = pathlib.Path("tests/samples"),
+):
+    """
+    Compute the scores again after changing the scoring parameters.
+
+    Only the steps whose variables changed since the last run, and the ones
+    depending on them, are executed against the existing database.
+    """
+    asyncio.run(
+        rescore_(
+            city,
+            state,
+            country,
+            pipeline.parse_overrides(param or []),
+            workers,
+            data_dir,
+        )
     )
 
 
+async def rescore_(
+    city: str,
+    state: str,
+    country: str,
+    overrides: typing.Mapping[str, typing.Mapping[str, str]],
+    workers: typing.Optional[int] = None,
+    data_dir: pathlib.Path = pathlib.Path("tests/samples"),
+):
+    """Compute the scores again after changing the scoring parameters."""
+    # Load the environment variables.
+    load_dotenv()
+
+    # Restore the environment of the previous run.
+    root = pathlib.Path(".")
+    script_dir = root / "scripts"
+    sql_dir = root / "sql"
+    output_dir = data_dir / f"{city}-{state}" / "modular-bna"
+    manifest = pipeline.read_manifest(output_dir)
+    os.environ.update(**manifest["environment"])
+
+    # Rescore.
+    logger.info("Rescore")
+    start = time.time()
+    sql_profiler = profiling.SQLProfiler()
+    sql_profiler.stage = "Rescore"
+    steps = await pipeline.rescore(sql_dir, manifest, overrides, workers, sql_profiler)
+    logger.debug(f"Rescore wall clock time: {timedelta(seconds=time.time() - start)}")
+
+    # Export.
+    # The results are exported next to the ones of the run, and only replace
+    # them once the export succeeded. The other files of the run are kept.
+    logger.info("Export results")
+    start = time.time()
+    with tempfile.TemporaryDirectory(
+        prefix=".rescore-", dir=output_dir.parent
+    ) as export_dir:
+        export_path = pathlib.Path(export_dir)
+        script = script_dir / "40-export-export_connectivity.sh"
+        subprocess.run(
+            [str(script.absolute()), str(export_path.absolute())], check=True
+        )
+        pipeline.write_manifest(
+            export_path, manifest["environment"], manifest["run_import_jobs"], steps
+        )
+        for path in export_path.iterdir():
+            os.replace(path, output_dir / path.name)
+    rescore_dir = output_dir / "rescore"
+    rescore_dir.mkdir(exist_ok=True)
+    sql_profiler.save(rescore_dir)
+    logger.debug(f"Export wall clock time: {timedelta(seconds=time.time() - start)}")
+
+
+async def run_with_template_(
+    city: str,
+    state: str,
+    country: str,
+    city_fips: str,
+    prepare: bool = False,
+    routing_engine: connectivity.RoutingEngine = connectivity.RoutingEngine.PGROUTING,
+    executor: pipeline.Executor = pipeline.Executor.NATIVE,
+    workers: typing.Optional[int] = None,
+    data_dir: pathlib.Path = pathlib.Path("tests/samples"),
+    use_cache: bool = True,
+    ephemeral: bool = False,
+    keep_database: bool = False,
+    resume: bool = False,
+    keep_on_failure: bool = False,
+):
+    """Run an analysis in a database copied from the template database."""
+    dbname = batch.database_name(batch.City(city, state, country, city_fips))
+    if not (resume and await batch.database_exists(dbname)):
+        template_database = await template.build_template(pathlib.Path("."), ephemeral)
+        await batch.provision_database(dbname, None, template_database)
+
+    # The server database is restored to drop the city database at the end.
+    server_database = os.environ.get("PGDATABASE")
+    os.environ["PGDATABASE"] = dbname
+    try:
+        await run_(
+            city,
+            state,
+            country,
+            city_fips,
+            prepare,
+            routing_engine,
+            0,
+            executor,
+            workers,
+            data_dir,
+            use_cache,
+            ephemeral,
+            setup=False,
+            resume=resume,
+        )
+    except BaseException:
+        if keep_on_failure:
+            keep_database = True
+            logger.warning(f"Keeping {dbname} to resume the analysis")
+        raise
+    finally:
+        if server_database is None:
+            os.environ.pop("PGDATABASE")
+        else:
+            os.environ["PGDATABASE"] = server_database
+        if not keep_database:
+            await batch.drop_database(dbname)
+
+
 async def run_(
     city: str,
     state: str,
     country: str,
     city_fips: str,
     prepare: Annotated[bool, typer.Option(help="Prepare input files")] = False,
+    routing_engine: Annotated[
+        connectivity.RoutingEngine,
+        typer.Option(help="Engine computing the reachable roads"),
+    ] = connectivity.RoutingEngine.PGROUTING,
+    explain: Annotated[
+        int, typer.Option(help="Capture the plans of the N slowest statements")
+    ] = 0,
+    executor: Annotated[
+        pipeline.Executor,
+        typer.Option(help="Run the SQL files natively or with the bash scripts"),
+    ] = pipeline.Executor.NATIVE,
+    workers: Annotated[
+        typing.Optional[int],
+        typer.Option(help="Maximum number of concurrent database sessions"),
+    ] = None,
+    data_dir: Annotated[
+        pathlib.Path, typer.Option(help="Directory containing the city directories")
+    ] = pathlib.Path("tests/samples"),
+    use_cache: Annotated[
+        bool,
+        typer.Option(
+            "--cache/--no-cache", help="Reuse the import results of identical inputs"
+        ),
+    ] = True,
+    ephemeral: Annotated[
+        bool,
+        typer.Option(help="Use unlogged tables, for a disposable database"),
+    ] = False,
+    setup: Annotated[
+        bool,
+        typer.Option(help="Set the database up, unless it comes from the template"),
+    ] = True,
+    resume: Annotated[
+        bool, typer.Option(help="Skip the stages completed by a previous run")
+    ] = False,
+    telemetry_interval: Annotated[
+        float,
+        typer.Option(help="Seconds between two samples of the resources, 0 to disable"),
+    ] = 1.0,
 ):
-    """Run an analysis with the modular-bna."""
+    """
+    Run an analysis with the modular-bna.
+
+    A checkpoint is recorded in the database after each stage. A resumed
+    analysis skips the stages completed by the previous runs with the same
+    inputs.
+
+    The resources used are sampled every `telemetry_interval` seconds, and
+    their timeline is saved with the results.
+    """
     # Load the environment variables.
     load_dotenv()
 
@@ -103,13 +557,15 @@ async def run_(
     normalized_city_name = bna.sanitize_value(f"{city}-{state}-{country}")
     print(f"{normalized_city_name=}")
     root = pathlib.Path(".")
-    test_dir = root / "tests"
     script_dir = root / "scripts"
-    sample_dir = test_dir / "samples"
-    city_dir = sample_dir / f"{city}-{state}"
+    sql_dir = root / "sql"
+    city_dir = data_dir / f"{city}-{state}"
     output_dir = city_dir / "modular-bna"
     city_data_file = city_dir / normalized_city_name
-    city_osm_file = city_data_file.with_suffix(".osm")
+    # Prefer the PBF file, which is faster to read, when there is one.
+    city_osm_file = city_data_file.with_suffix(".osm.pbf")
+    if not city_osm_file.exists():
+        city_osm_file = city_data_file.with_suffix(".osm")
     city_boundary_file = city_data_file.with_suffix(".shp")
 
     # Derive some city information.
@@ -118,110 +574,256 @@ async def run_(
 
     # Measure the processing time.
     profiler = {}
+    sql_profiler = profiling.SQLProfiler(explain)
+    timeline = telemetry.Telemetry(telemetry_interval)
+    timeline.start()
     total_time = time.time()
 
-    # Prepare the input files for the analysis.
-    if prepare:
-        logger.info("Prepare input files")
-        start = time.time()
-        await bna.brokenspoke_analyzer_run_prepare(city, state, country, city_dir)
-        elapsed = timedelta(seconds=time.time() - start)
-        profiler["Prepare input files"] = elapsed
-        logger.debug(f"Prepare input files wall clock time: {elapsed}")
-
-    # Define the variables required by the original BNA scripts.
-    absolute_boundary_file = str(city_boundary_file.absolute())
-    debug = "1" if appstate["verbose"] else "0"
-    bna_env = bna.prepare_environment(
-        city, state, country, city_fips, state_fips, state_abbrev, run_import_jobs
-    )
-    bna_env["PFB_DEBUG"] = debug
-    bna_env["NB_BOUNDARY_FILE"] = absolute_boundary_file
-    bna_env["NB_TEMPDIR"] = str(city_dir.absolute())
-    logger.debug(f"{bna_env=}")
-    os.environ.update(**bna_env)
-
-    # Prepare.
-    logger.info("Setup database")
-    start = time.time()
-    script = script_dir / "01-better_setup_database.sh"
-    subprocess.run([str(script.absolute())], check=True)
-    elapsed = timedelta(seconds=time.time() - start)
-    # profiler["-- Setup database"] = elapsed
-    logger.debug(f"Setup database wall clock time: {elapsed}")
-
-    # Detect output SRID.
-    output_srid = utm.get_srid(absolute_boundary_file)
-    os.environ["NB_OUTPUT_SRID"] = output_srid
-
-    # Import.
-    logger.info("Import neighborhood")
-    start_import = start = time.time()
-    script = script.with_name("21-import_neighborhood.sh")
-    subprocess.run([str(script.absolute())], check=True)
-    elapsed = timedelta(seconds=time.time() - start)
-    profiler["21-import_neighborhood.sh"] = elapsed
-    logger.debug(f"Import neighborhood: wall clock time: {elapsed}")
-
-    if run_import_jobs == "1":
-        logger.info("Import jobs")
-        start = time.time()
-        script = script.with_name("22-import_jobs.sh")
-        subprocess.run([str(script.absolute())], check=True)
-        elapsed = timedelta(seconds=time.time() - start)
-        profiler["22-import_jobs.sh"] = elapsed
-        logger.debug(f"Import jobs: all clock time: {elapsed}")
-
-    logger.info("Import OSM")
-    start = time.time()
-    script = script.with_name("23-import_osm.sh")
-    subprocess.run([str(script), str(city_osm_file.absolute())], check=True)
-    elapsed = timedelta(seconds=time.time() - start)
-    profiler["23-import_osm.sh"] = elapsed
-    logger.debug(f"Import OSM wall clock time: {elapsed}")
-    elapsed = timedelta(seconds=time.time() - start_import)
-    profiler["-- Import"] = elapsed
-    logger.debug(f"Import wall clock time: {elapsed}")
-
-    # Compute.
-    logger.info("Compute features")
-    start_compute = start = time.time()
-    script = script.with_name("30-compute-features.sh")
-    subprocess.run([str(script.absolute())], check=True)
-    elapsed = timedelta(seconds=time.time() - start)
-    profiler["30-compute-features.sh"] = elapsed
-    logger.debug(f"Compute features: all clock time: {elapsed}")
-
-    logger.info("Compute stress")
-    start = time.time()
-    script = script.with_name("31-compute-stress.sh")
-    subprocess.run([str(script.absolute())], check=True)
-    elapsed = timedelta(seconds=time.time() - start)
-    profiler["31-compute-stress.sh"] = elapsed
-    logger.debug(f"Compute stress wall clock time: {elapsed}")
-
-    logger.info("Compute connectivity")
-    start = time.time()
-    script = script.with_name("32-compute-run-connectivity.sh")
-    subprocess.run([str(script.absolute())], check=True)
-    elapsed = timedelta(seconds=time.time() - start)
-    profiler["32-compute-run-connectivity.sh"] = elapsed
-    logger.debug(f"Compute connectivity wall clock time: {elapsed}")
-
-    elapsed = timedelta(seconds=time.time() - start_compute)
-    profiler["-- Compute"] = elapsed
-    logger.debug(f"Compute wall clock time: {elapsed}")
-
-    # Export.
-    logger.info("Export results")
-    start = time.time()
-    shutil.rmtree(output_dir, ignore_errors=True)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    script = script.with_name("40-export-export_connectivity.sh")
-    subprocess.run([str(script.absolute()), str(output_dir.absolute())], check=True)
-    elapsed = timedelta(seconds=time.time() - start)
-    profiler["-- Export"] = elapsed
-    logger.debug(f"Export wall clock time: {elapsed}")
+    try:
+        # Prepare the input files for the analysis.
+        if prepare:
+            logger.info("Prepare input files")
+            timeline.stage("Prepare input files")
+            start = time.time()
+            await bna.brokenspoke_analyzer_run_prepare(city, state, country, city_dir)
+            elapsed = timedelta(seconds=time.time() - start)
+            profiler["Prepare input files"] = elapsed
+            logger.debug(f"Prepare input files wall clock time: {elapsed}")
+
+        # Define the variables required by the original BNA scripts.
+        absolute_boundary_file = str(city_boundary_file.absolute())
+        debug = "1" if appstate["verbose"] else "0"
+        bna_env = bna.prepare_environment(
+            city, state, country, city_fips, state_fips, state_abbrev, run_import_jobs
+        )
+        bna_env["PFB_DEBUG"] = debug
+        bna_env["NB_BOUNDARY_FILE"] = absolute_boundary_file
+        bna_env["NB_TEMPDIR"] = str(city_dir.absolute())
+        bna_env["NB_EPHEMERAL"] = "1" if ephemeral else "0"
+        logger.debug(f"{bna_env=}")
+        os.environ.update(**bna_env)
+
+        # Detect output SRID.
+        output_srid = utm.get_srid(absolute_boundary_file)
+        os.environ["NB_OUTPUT_SRID"] = output_srid
+
+        # Load the checkpoints of the previous runs.
+        checkpoints = checkpoint.Checkpoints(
+            checkpoint.run_key(
+                root,
+                cache.input_files(city_dir, normalized_city_name),
+                {
+                    "import": {
+                        variable: os.environ.get(variable, "")
+                        for variable in cache.IMPORT_VARIABLES
+                    },
+                    "routing_engine": routing_engine.value,
+                    "executor": executor.value,
+                    "prune_roads": pipeline.prune_routing_roads(),
+                    "steps": {
+                        step.sql_file: step.variables
+                        for step in pipeline.features_steps()
+                        + pipeline.network_steps()
+                        + pipeline.connectivity_steps(run_import_jobs == "1")
+                    },
+                },
+            ),
+            resume,
+        )
+        await checkpoints.load(ephemeral)
+
+        # Prepare.
+        script = script_dir / "01-better_setup_database.sh"
+        if setup and not checkpoints.done("Setup database"):
+            logger.info("Setup database")
+            timeline.stage("Setup database")
+            start = time.time()
+            subprocess.run([str(script.absolute())], check=True)
+            elapsed = timedelta(seconds=time.time() - start)
+            # profiler["-- Setup database"] = elapsed
+            logger.debug(f"Setup database wall clock time: {elapsed}")
+            await checkpoints.record("Setup database")
+
+        # Import.
+        start_import = time.time()
+        import_stages = ["21-import_neighborhood.sh", "23-import_osm.sh"]
+        if run_import_jobs == "1":
+            import_stages.insert(1, "22-import_jobs.sh")
+        # Hashing the input files is expensive, therefore the key is only
+        # computed when the cache may be used.
+        cache_key = None
+        cache_entry = None
+        if use_cache and not all(map(checkpoints.done, import_stages)):
+            cache_key = cache.cache_key(
+                root, city_dir, normalized_city_name, os.environ
+            )
+            cache_entry = cache.lookup(cache_key)
+        if cache_entry:
+            logger.info("Restore cached import")
+            timeline.stage("Restore cached import")
+            cache.restore(cache_entry)
+            for stage in import_stages:
+                await checkpoints.record(stage)
+        else:
+            if not checkpoints.done("21-import_neighborhood.sh"):
+                logger.info("Import neighborhood")
+                timeline.stage("Import neighborhood")
+                start = time.time()
+                script = script.with_name("21-import_neighborhood.sh")
+                subprocess.run([str(script.absolute())], check=True)
+                elapsed = timedelta(seconds=time.time() - start)
+                profiler["21-import_neighborhood.sh"] = elapsed
+                logger.debug(f"Import neighborhood: wall clock time: {elapsed}")
+                await checkpoints.record("21-import_neighborhood.sh")
+
+            if run_import_jobs == "1" and not checkpoints.done("22-import_jobs.sh"):
+                logger.info("Import jobs")
+                timeline.stage("Import jobs")
+                start = time.time()
+                script = script.with_name("22-import_jobs.sh")
+                subprocess.run([str(script.absolute())], check=True)
+                elapsed = timedelta(seconds=time.time() - start)
+                profiler["22-import_jobs.sh"] = elapsed
+                logger.debug(f"Import jobs: all clock time: {elapsed}")
+                await checkpoints.record("22-import_jobs.sh")
+
+            if not checkpoints.done("23-import_osm.sh"):
+                logger.info("Import OSM")
+                timeline.stage("Import OSM")
+                start = time.time()
+                script = script.with_name("23-import_osm.sh")
+                subprocess.run([str(script), str(city_osm_file.absolute())], check=True)
+                elapsed = timedelta(seconds=time.time() - start)
+                profiler["23-import_osm.sh"] = elapsed
+                logger.debug(f"Import OSM wall clock time: {elapsed}")
+                await checkpoints.record("23-import_osm.sh")
+                if cache_key:
+                    cache.store(cache_key)
+        elapsed = timedelta(seconds=time.time() - start_import)
+        profiler["-- Import"] = elapsed
+        logger.debug(f"Import wall clock time: {elapsed}")
+
+        # Compute.
+        start_compute = time.time()
+        if not checkpoints.done("Compute features"):
+            logger.info("Compute features")
+            timeline.stage("Compute features")
+            start = time.time()
+            if executor == pipeline.Executor.BASH:
+                script = script.with_name("30-compute-features.sh")
+                subprocess.run([str(script.absolute())], check=True)
+                await checkpoints.record("Compute features")
+            else:
+                sql_profiler.stage = "Compute features"
+                await pipeline.compute_features(sql_dir, sql_profiler, checkpoints)
+            elapsed = timedelta(seconds=time.time() - start)
+            profiler["Compute features"] = elapsed
+            logger.debug(f"Compute features: all clock time: {elapsed}")
+
+        if not checkpoints.done("Compute stress"):
+            logger.info("Compute stress")
+            timeline.stage("Compute stress")
+            start = time.time()
+            if executor == pipeline.Executor.BASH:
+                script = script.with_name("31-compute-stress.sh")
+                subprocess.run([str(script.absolute())], check=True)
+                await checkpoints.record("Compute stress")
+            else:
+                sql_profiler.stage = "Compute stress"
+                await pipeline.compute_stress(
+                    sql_dir, bna_env["PFB_CITY_FIPS"], sql_profiler, checkpoints
+                )
+            elapsed = timedelta(seconds=time.time() - start)
+            profiler["Compute stress"] = elapsed
+            logger.debug(f"Compute stress wall clock time: {elapsed}")
+
+        if not checkpoints.done("Compute network"):
+            logger.info("Compute network")
+            timeline.stage("Compute network")
+            start = time.time()
+            if executor == pipeline.Executor.BASH:
+                script = script.with_name("32-compute-network.sh")
+                subprocess.run([str(script.absolute())], check=True)
+                await checkpoints.record("Compute network")
+            else:
+                sql_profiler.stage = "Compute network"
+                await pipeline.compute_network(sql_dir, sql_profiler, checkpoints)
+            elapsed = timedelta(seconds=time.time() - start)
+            profiler["Compute network"] = elapsed
+            logger.debug(f"Compute network wall clock time: {elapsed}")
+
+        if not checkpoints.done("Compute reachable roads"):
+            logger.info("Compute reachable roads")
+            timeline.stage("Compute reachable roads")
+            start = time.time()
+            if executor == pipeline.Executor.BASH:
+                script = script.with_name("33-compute-reachable-roads.sh")
+                subprocess.run([str(script.absolute())], check=True)
+            else:
+                sql_profiler.stage = "Compute reachable roads"
+                await connectivity.compute_reachable_roads(
+                    sql_dir,
+                    pipeline.max_trip_distance(),
+                    routing_engine,
+                    workers,
+                    sql_profiler,
+                    pipeline.prune_routing_roads(),
+                    checkpoints,
+                )
+            elapsed = timedelta(seconds=time.time() - start)
+            profiler["Compute reachable roads"] = elapsed
+            logger.debug(f"Compute reachable roads wall clock time: {elapsed}")
+            await checkpoints.record("Compute reachable roads")
+
+        if not checkpoints.done("Compute connectivity"):
+            logger.info("Compute connectivity")
+            timeline.stage("Compute connectivity")
+            start = time.time()
+            if executor == pipeline.Executor.BASH:
+                script = script.with_name("34-compute-run-connectivity.sh")
+                subprocess.run([str(script.absolute())], check=True)
+            else:
+                sql_profiler.stage = "Compute connectivity"
+                await pipeline.compute_connectivity(
+                    sql_dir, run_import_jobs == "1", workers, sql_profiler, checkpoints
+                )
+            elapsed = timedelta(seconds=time.time() - start)
+            profiler["Compute connectivity"] = elapsed
+            logger.debug(f"Compute connectivity wall clock time: {elapsed}")
+            await checkpoints.record("Compute connectivity")
+
+        elapsed = timedelta(seconds=time.time() - start_compute)
+        profiler["-- Compute"] = elapsed
+        logger.debug(f"Compute wall clock time: {elapsed}")
+
+        # Export.
+        if not checkpoints.done("Export results"):
+            logger.info("Export results")
+            timeline.stage("Export results")
+            start = time.time()
+            shutil.rmtree(output_dir, ignore_errors=True)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            script = script.with_name("40-export-export_connectivity.sh")
+            subprocess.run(
+                [str(script.absolute()), str(output_dir.absolute())], check=True
+            )
+            # The database may come from the libpq defaults or a service file.
+            async with await database.connect() as conn:
+                dbname = conn.info.dbname
+            pipeline.write_manifest(
+                output_dir,
+                bna_env | {"NB_OUTPUT_SRID": output_srid, "PGDATABASE": dbname},
+                run_import_jobs == "1",
+                pipeline.connectivity_steps(run_import_jobs == "1"),
+            )
+            elapsed = timedelta(seconds=time.time() - start)
+            profiler["-- Export"] = elapsed
+            logger.debug(f"Export wall clock time: {elapsed}")
+            await checkpoints.record("Export results")
+    finally:
+        timeline.stop()
+        timeline.save(output_dir)
+        sql_profiler.save(output_dir)
 
     total_elapsed = timedelta(seconds=time.time() - total_time)
     profiler["Total"] = total_elapsed
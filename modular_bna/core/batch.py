@@ -0,0 +1,325 @@
+"""Functions related to the analysis of many cities at once."""
+import asyncio
+import csv
+import multiprocessing
+import os
+import pathlib
+import sys
+import time
+import typing
+from datetime import datetime
+
+from loguru import logger
+from psycopg import sql
+
+from modular_bna.core import (
+    bna,
+    connectivity,
+    database,
+    pipeline,
+    template,
+)
+
+# Number of sort or hash operations a session is expected to run at once, used
+# to derive `work_mem` from the memory budget.
+SORTS_PER_SESSION = 4
+
+# Maximum length of a PostgreSQL identifier.
+MAX_IDENTIFIER_LENGTH = 63
+
+SCORES = (
+    "people",
+    "opportunity",
+    "core_services",
+    "retail",
+    "recreation",
+    "transit",
+    "overall_score",
+)
+SUMMARY_COLUMNS = (
+    "city",
+    "state",
+    "country",
+    "city_fips",
+    "database",
+    "status",
+    "started_at",
+    "duration",
+) + SCORES
+
+
+class City(typing.NamedTuple):
+    """Represent a city to analyze."""
+
+    city: str
+    state: str
+    country: str
+    city_fips: str
+
+    @property
+    def slug(self) -> str:
+        """Return the normalized name of the city."""
+        return bna.sanitize_value(f"{self.city}-{self.state}-{self.country}")
+
+
+def read_cities(cities_file: os.PathLike) -> typing.List[City]:
+    """Read the cities to analyze from a CSV file."""
+    with pathlib.Path(cities_file).open(newline="") as f:
+        return [
+            City(row["city"], row["state"], row["country"], row.get("city_fips", "0"))
+            for row in csv.DictReader(f)
+        ]
+
+
+def database_name(city: City) -> str:
+    """
+    Return the name of the database dedicated to a city.
+
+    Example:
+        >>> database_name(City("Cañon city", "colorado", "usa", "0811810"))
+        bna_canon_city_colorado_usa
+    """
+    name = "bna_" + "".join(c if c.isalnum() else "_" for c in city.slug)
+    return name[:MAX_IDENTIFIER_LENGTH]
+
+
+def work_mem(memory: float, sessions: int) -> int:
+    """
+    Compute the `work_mem` in MB allowing all the sessions to fit in memory.
+
+    Examples:
+        >>> assert work_mem(32, 8) == 1024
+        >>> assert work_mem(1, 1_000) == 1
+    """
+    return max(1, int(memory * 1024 / (sessions * SORTS_PER_SESSION)))
+
+
+def read_summary(summary_file: pathlib.Path) -> typing.Dict[str, typing.Dict]:
+    """Read the summary of a previous batch, indexed by database name."""
+    if not summary_file.exists():
+        return {}
+    with summary_file.open(newline="") as f:
+        return {row["database"]: row for row in csv.DictReader(f)}
+
+
+def write_summary(
+    summary_file: pathlib.Path, rows: typing.Iterable[typing.Mapping]
+) -> None:
+    """Write the summary of the batch."""
+    tmp_file = summary_file.with_suffix(".tmp")
+    with tmp_file.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    tmp_file.replace(summary_file)
+
+
+def read_scores(output_dir: pathlib.Path) -> typing.Dict[str, str]:
+    """Read the main scores of a city."""
+    with (output_dir / "neighborhood_overall_scores.csv").open(newline="") as f:
+        scores = {row["score_id"]: row["score_normalized"] for row in csv.DictReader(f)}
+    return {score: scores.get(score, "") for score in SCORES}
+
+
+async def provision_database(
+    dbname: str,
+    work_mem_mb: typing.Optional[int],
+    template_database: typing.Optional[str] = None,
+) -> None:
+    """
+    Create a database, dropping the one left by a previous attempt.
+
+    The database is a copy of the `template_database` if there is one, or an
+    empty one otherwise.
+    """
+    async with await database.connect() as conn:
+        identifier = sql.Identifier(dbname)
+        await conn.execute(
+            sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE);").format(identifier)
+        )
+        if template_database:
+            await conn.execute(
+                sql.SQL("CREATE DATABASE {} TEMPLATE {};").format(
+                    identifier, sql.Identifier(template_database)
+                )
+            )
+        else:
+            await conn.execute(sql.SQL("CREATE DATABASE {};").format(identifier))
+        if work_mem_mb:
+            await conn.execute(
+                sql.SQL("ALTER DATABASE {} SET work_mem TO {};").format(
+                    identifier, sql.Literal(f"{work_mem_mb}MB")
+                )
+            )
+
+
+async def database_exists(dbname: str) -> bool:
+    """Return whether the database of a city exists."""
+    async with await database.connect() as conn:
+        cur = await conn.execute(
+            "SELECT 1 FROM pg_database WHERE datname = %s;", (dbname,)
+        )
+        return await cur.fetchone() is not None
+
+
+async def drop_database(dbname: str) -> None:
+    """Drop the database of a city."""
+    async with await database.connect() as conn:
+        await conn.execute(
+            sql.SQL("DROP DATABASE IF EXISTS {};").format(sql.Identifier(dbname))
+        )
+
+
+async def analyze_city(
+    city: City,
+    data_dir: pathlib.Path,
+    workers: int,
+    work_mem_mb: typing.Optional[int],
+    routing_engine: connectivity.RoutingEngine,
+    executor: pipeline.Executor,
+    prepare: bool,
+    keep_database: bool,
+    use_cache: bool,
+    ephemeral: bool,
+    template_database: typing.Optional[str] = None,
+) -> typing.Dict[str, typing.Any]:
+    """
+    Analyze a city in its own database.
+
+    The analysis runs in a separate process, since the BNA scripts are
+    configured via the environment. Its output is logged in the city directory.
+
+    A database created from the `template_database` is already set up.
+    """
+    dbname = database_name(city)
+    city_dir = data_dir / f"{city.city}-{city.state}"
+    city_dir.mkdir(parents=True, exist_ok=True)
+    row = city._asdict() | {
+        "database": dbname,
+        "started_at": datetime.now().isoformat(),
+    }
+    logger.info(f"Analyzing {city.slug} in {dbname}")
+    start = time.time()
+    await provision_database(dbname, work_mem_mb, template_database)
+    args = [
+        sys.executable,
+        "-m",
+        "modular_bna",
+        "-vv",
+        "run",
+        *city,
+        "--data-dir",
+        str(data_dir),
+        "--workers",
+        str(workers),
+        "--routing-engine",
+        routing_engine.value,
+        "--executor",
+        executor.value,
+    ]
+    if prepare:
+        args.append("--prepare")
+    if not use_cache:
+        args.append("--no-cache")
+    if ephemeral:
+        args.append("--ephemeral")
+    if template_database:
+        args.append("--no-setup")
+    with (city_dir / "modbna.log").open("w") as log:
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=log,
+            stderr=asyncio.subprocess.STDOUT,
+            env=os.environ | {"PGDATABASE": dbname},
+        )
+        try:
+            returncode = await process.wait()
+        except asyncio.CancelledError:
+            process.kill()
+            raise
+    row["duration"] = f"{time.time() - start:.1f}"
+    if returncode:
+        logger.error(f"{city.slug} failed, see {city_dir / 'modbna.log'}")
+        row["status"] = "failed"
+        return row
+
+    row["status"] = "done"
+    row |= read_scores(city_dir / "modular-bna")
+    if not keep_database:
+        await drop_database(dbname)
+    logger.info(f"{city.slug} analyzed in {row['duration']}s")
+    return row
+
+
+async def run_batch(
+    cities: typing.Sequence[City],
+    data_dir: pathlib.Path,
+    summary_file: pathlib.Path,
+    jobs: int,
+    cores: typing.Optional[int] = None,
+    memory: typing.Optional[float] = None,
+    routing_engine: connectivity.RoutingEngine = connectivity.RoutingEngine.PGROUTING,
+    executor: pipeline.Executor = pipeline.Executor.NATIVE,
+    prepare: bool = False,
+    keep_databases: bool = False,
+    use_cache: bool = True,
+    ephemeral: bool = False,
+    use_template: bool = True,
+) -> typing.List[typing.Dict]:
+    """
+    Analyze many cities concurrently, each one in its own database.
+
+    At most `jobs` cities run at the same time, and the `cores` are shared
+    between them. If a `memory` budget in GB is given, the `work_mem` of the
+    databases is capped so that all the sessions fit in it.
+
+    An `ephemeral` batch creates unlogged tables, since the databases are
+    disposable. The durability settings of the server are left untouched.
+
+    The databases are created from a template database, built once with the
+    extensions, the schemas and the static tables, unless `use_template` is
+    disabled.
+
+    The summary is updated as soon as a city completes. The cities already
+    done in a previous run are skipped, allowing to resume a batch.
+    """
+    cores = cores or multiprocessing.cpu_count()
+    workers = max(1, cores // jobs)
+    work_mem_mb = work_mem(memory, jobs * workers) if memory else None
+    summary = read_summary(summary_file)
+    remaining = [
+        city
+        for city in cities
+        if summary.get(database_name(city), {}).get("status") != "done"
+    ]
+    logger.info(
+        f"Analyzing {len(remaining)}/{len(cities)} cities, {jobs} at a time "
+        f"with {workers} workers each"
+    )
+
+    template_database = None
+    if use_template and remaining:
+        template_database = await template.build_template(pathlib.Path("."), ephemeral)
+
+    semaphore = asyncio.Semaphore(jobs)
+
+    async def run(city: City) -> None:
+        async with semaphore:
+            row = await analyze_city(
+                city,
+                data_dir,
+                workers,
+                work_mem_mb,
+                routing_engine,
+                executor,
+                prepare,
+                keep_databases,
+                use_cache,
+                ephemeral,
+                template_database,
+            )
+        summary[row["database"]] = row
+        write_summary(summary_file, summary.values())
+
+    await asyncio.gather(*[run(city) for city in remaining])
+    return list(summary.values())
@@ -12,12 +12,30 @@ from brokenspoke_analyzer.core import (
     analysis,
     processhelper,
 )
+from loguru import logger
 
 from modular_bna import cli
+from modular_bna.core import (
+    cache,
+    connectivity,
+    pipeline,
+)
 
 CONTAINER_NAME = "brokenspoke_analyzer"
 DOCKER_IMAGE = "azavea/pfb-network-connectivity:0.18.0"
 
+# Compose file turning the durability off, for the ephemeral databases.
+EPHEMERAL_COMPOSE_FILE = "docker-compose.ephemeral.yml"
+
+# Compose file keeping the data directory of the ephemeral databases in memory.
+TMPFS_COMPOSE_FILE = "docker-compose.tmpfs.yml"
+
+# Expected ratio between the size of a database and the one of its input files.
+DATABASE_EXPANSION_FACTOR = 10
+
+# Share of the available memory an in-memory data directory may use.
+TMPFS_MEMORY_SHARE = 0.5
+
 
 def prepare_sample_folder(
     city: str, state: str
@@ -175,28 +193,96 @@ async def brokenspoke_analyzer_run_n_cleanup(
         subprocess.run(["docker", "stop", CONTAINER_NAME])
 
 
+def tmpfs_size(input_size: int, available_memory: int) -> typing.Optional[int]:
+    """
+    Return the size of an in-memory data directory, if the database fits in RAM.
+
+    Examples:
+        >>> assert tmpfs_size(100 * 2**20, 8 * 2**30) == 1000 * 2**20
+        >>> assert tmpfs_size(1 * 2**30, 8 * 2**30) is None
+        >>> assert tmpfs_size(0, 8 * 2**30) is None
+    """
+    size = input_size * DATABASE_EXPANSION_FACTOR
+    if not size or size > available_memory * TMPFS_MEMORY_SHARE:
+        return None
+    return size
+
+
+def compose_files(city: str, state: str, country: str) -> typing.List[str]:
+    """
+    Return the compose files running an ephemeral database.
+
+    The server of the run is dedicated to it, therefore its durability is
+    turned off. The data directory is kept in memory when the database is
+    expected to fit.
+    """
+    files = ["-f", "docker-compose.yml", "-f", EPHEMERAL_COMPOSE_FILE]
+    city_dir = pathlib.Path(f"tests/samples/{city}-{state}")
+    name = sanitize_value(f"{city}-{state}-{country}")
+    input_size = sum(path.stat().st_size for path in cache.input_files(city_dir, name))
+    available_memory = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    size = tmpfs_size(input_size, available_memory)
+    if size:
+        os.environ["NB_TMPFS_SIZE"] = f"{size // 2**20}m"
+        files += ["-f", TMPFS_COMPOSE_FILE]
+    return files
+
+
 async def modular_bna_run_n_clean_up(
-    city: str, state: str, country: str, city_fips: str, prepare: bool = False
+    city: str,
+    state: str,
+    country: str,
+    city_fips: str,
+    prepare: bool = False,
+    routing_engine: connectivity.RoutingEngine = connectivity.RoutingEngine.PGROUTING,
+    explain: int = 0,
+    executor: pipeline.Executor = pipeline.Executor.NATIVE,
+    workers: typing.Optional[int] = None,
+    ephemeral: bool = False,
+    resume: bool = False,
+    keep_on_failure: bool = False,
 ) -> None:
     """
     Run the modular BNA.
 
     Clean up the docker compose environment at the end of the process or in case
-    of failure.
+    of failure. With `keep_on_failure`, a failed analysis leaves the environment
+    running instead, to be resumed.
+
+    An `ephemeral` database runs without durability, and keeps its data
+    directory in memory when it fits.
     """
+    files = compose_files(city, state, country) if ephemeral else []
+    succeeded = False
     try:
         try:
-            subprocess.run(["docker-compose", "up", "-d"], check=True)
+            subprocess.run(["docker-compose", *files, "up", "-d"], check=True)
         except Exception:
-            subprocess.run(["docker", "compose", "up", "-d"], check=True)
+            subprocess.run(["docker", "compose", *files, "up", "-d"], check=True)
         subprocess.run("until pg_isready ; do sleep 5 ; done", shell=True, check=True)
-        await cli.run_(city, state, country, city_fips, prepare)
+        await cli.run_(
+            city,
+            state,
+            country,
+            city_fips,
+            prepare,
+            routing_engine,
+            explain,
+            executor,
+            workers,
+            ephemeral=ephemeral,
+            resume=resume,
+        )
+        succeeded = True
     finally:
-        try:
-            subprocess.run(["docker-compose", "rm", "-sfv"], check=True)
-        except Exception:
-            subprocess.run(["docker", "compose", "rm", "-sfv"], check=True)
-        subprocess.run(["docker", "volume", "rm", "-f", "modular-bna_postgres"])
+        if succeeded or not keep_on_failure:
+            try:
+                subprocess.run(["docker-compose", "rm", "-sfv"], check=True)
+            except Exception:
+                subprocess.run(["docker", "compose", "rm", "-sfv"], check=True)
+            subprocess.run(["docker", "volume", "rm", "-f", "modular-bna_postgres"])
+        else:
+            logger.warning("Keeping the docker compose environment to resume the run")
 
 
 def delta_df(output_dir: os.PathLike, modular_bna_output_dir: os.PathLike):
@@ -0,0 +1,193 @@
+"""Functions related to the cache of the import results."""
+import hashlib
+import multiprocessing
+import os
+import pathlib
+import subprocess
+import typing
+
+import psycopg
+from loguru import logger
+
+from modular_bna.core import database
+
+# Files produced by the preparation step and read by the import scripts,
+# relative to the city directory. `{name}` is the normalized city name.
+INPUT_PATTERNS = (
+    "{name}.*",
+    "population.*",
+    "censuswaterblocks.csv",
+    "state_fips_speed.csv",
+    "city_fips_speed.csv",
+    "*_od_*_JT00_*.csv",
+)
+
+# Files defining the import, relative to the root of the project.
+IMPORT_FILES = (
+    "scripts/21-import_neighborhood.sh",
+    "scripts/22-import_jobs.sh",
+    "scripts/23-import_osm.sh",
+    "scripts/mapconfig_cycleway.xml",
+    "scripts/mapconfig_highway.xml",
+    "scripts/pfb.style",
+    "sql/create_us_water_blocks_table.sql",
+    "sql/speed_tables.sql",
+)
+
+# Environment variables read by the import scripts. The dump of an ephemeral
+# database creates unlogged tables, therefore NB_EPHEMERAL is part of the key.
+IMPORT_VARIABLES = (
+    "CENSUS_YEAR",
+    "NB_BOUNDARY_BUFFER",
+    "NB_COUNTRY",
+    "NB_EPHEMERAL",
+    "NB_INPUT_SRID",
+    "NB_MAX_TRIP_DISTANCE",
+    "NB_OUTPUT_SRID",
+    "PFB_CITY_FIPS",
+    "PFB_RESIDENTIAL_SPEED_LIMIT",
+    "PFB_STATE",
+    "PFB_STATE_FIPS",
+    "RUN_IMPORT_JOBS",
+)
+
+# Schemas containing the import results.
+SCHEMAS = ("generated", "received", "scratch")
+
+# Default location and size (in GB) of the cache.
+CACHE_DIR = pathlib.Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")) / "modular-bna"
+CACHE_SIZE = 50
+
+# Size of the blocks read when hashing a file.
+BLOCK_SIZE = 2**20
+
+
+def cache_dir() -> pathlib.Path:
+    """Return the cache directory, which can be set with `MODBNA_CACHE_DIR`."""
+    return pathlib.Path(os.environ.get("MODBNA_CACHE_DIR", CACHE_DIR)).expanduser()
+
+
+def cache_size() -> int:
+    """Return the cache size in bytes, which can be set with `MODBNA_CACHE_SIZE`."""
+    return int(float(os.environ.get("MODBNA_CACHE_SIZE", CACHE_SIZE)) * 1024**3)
+
+
+def input_files(city_dir: pathlib.Path, name: str) -> typing.List[pathlib.Path]:
+    """List the input files of a city."""
+    return sorted(
+        {
+            path
+            for pattern in INPUT_PATTERNS
+            for path in city_dir.glob(pattern.format(name=name))
+            if path.is_file()
+        }
+    )
+
+
+def hash_file(digest: "hashlib._Hash", path: pathlib.Path) -> None:
+    """Feed the name and the content of a file to a digest."""
+    digest.update(path.name.encode())
+    with path.open("rb") as f:
+        while block := f.read(BLOCK_SIZE):
+            digest.update(block)
+
+
+def cache_key(
+    root: pathlib.Path,
+    city_dir: pathlib.Path,
+    name: str,
+    env: typing.Mapping[str, str],
+) -> str:
+    """
+    Compute the key identifying the import results.
+
+    The key covers the content of the input files, the import scripts and
+    their configuration files, and the environment variables they read.
+    """
+    digest = hashlib.sha256()
+    for path in input_files(city_dir, name):
+        hash_file(digest, path)
+    for path in IMPORT_FILES:
+        hash_file(digest, root / path)
+    for variable in IMPORT_VARIABLES:
+        digest.update(f"{variable}={env.get(variable, '')}\n".encode())
+    return digest.hexdigest()
+
+
+def entry_path(key: str) -> pathlib.Path:
+    """Return the path of a cache entry."""
+    return cache_dir() / f"{key}.dump"
+
+
+def lookup(key: str) -> typing.Optional[pathlib.Path]:
+    """Return the cache entry of a key, marking it as recently used."""
+    entry = entry_path(key)
+    if not entry.exists():
+        return None
+    entry.touch()
+    return entry
+
+
+def restore(entry: pathlib.Path) -> None:
+    """
+    Restore the import results from a cache entry.
+
+    pg_restore requires a database name, which is read from a connection
+    since it may come from the libpq defaults or a service file, like for
+    `store`.
+    """
+    logger.debug(f"Restoring the import results from {entry}")
+    with psycopg.connect(database.conninfo()) as conn:
+        dbname = conn.info.dbname
+    subprocess.run(
+        [
+            "pg_restore",
+            "--clean",
+            "--if-exists",
+            "--no-owner",
+            "--jobs",
+            str(multiprocessing.cpu_count()),
+            "--dbname",
+            dbname,
+            str(entry),
+        ],
+        check=True,
+    )
+
+
+def store(key: str) -> pathlib.Path:
+    """Dump the import results into the cache."""
+    entry = entry_path(key)
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp_entry = entry.with_suffix(f".{os.getpid()}.tmp")
+    logger.debug(f"Storing the import results into {entry}")
+    schemas = [f"--schema={schema}" for schema in SCHEMAS]
+    try:
+        subprocess.run(
+            ["pg_dump", "--format=custom", *schemas, f"--file={tmp_entry}"],
+            check=True,
+        )
+        tmp_entry.replace(entry)
+    finally:
+        tmp_entry.unlink(missing_ok=True)
+    evict(cache_size())
+    return entry
+
+
+def evict(max_size: int) -> typing.List[pathlib.Path]:
+    """
+    Remove the least recently used entries until the cache fits in `max_size`.
+
+    Returns the removed entries.
+    """
+    entries = sorted(cache_dir().glob("*.dump"), key=lambda p: p.stat().st_mtime)
+    size = sum(entry.stat().st_size for entry in entries)
+    evicted = []
+    for entry in entries:
+        if size <= max_size:
+            break
+        size -= entry.stat().st_size
+        entry.unlink(missing_ok=True)
+        evicted.append(entry)
+        logger.debug(f"Evicted {entry} from the cache")
+    return evicted
@@ -0,0 +1,133 @@
+"""Functions related to the checkpoints allowing to resume an analysis."""
+import hashlib
+import json
+import pathlib
+import typing
+
+import psycopg
+from loguru import logger
+from psycopg import sql
+
+from modular_bna.core import (
+    cache,
+    database,
+)
+
+# Table recording the completed stages, in the database of the analysis.
+CHECKPOINT_TABLE = "modbna_checkpoints"
+
+# Directories containing the files defining the analysis, relative to the root
+# of the project.
+ANALYSIS_DIRS = ("scripts", "sql")
+
+
+def run_key(
+    root: pathlib.Path,
+    inputs: typing.Iterable[pathlib.Path],
+    variables: typing.Mapping[str, typing.Any],
+) -> str:
+    """
+    Compute the key identifying the inputs of an analysis.
+
+    The key covers the scripts and the SQL files, and the variables of the
+    analysis. The input files are large, therefore they are identified by
+    their name, size and modification time rather than by their content.
+    """
+    digest = hashlib.sha256()
+    for path in inputs:
+        stat = path.stat()
+        digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    for path in sorted(
+        path
+        for directory in ANALYSIS_DIRS
+        for path in (root / directory).rglob("*")
+        if path.is_file()
+    ):
+        cache.hash_file(digest, path)
+    digest.update(json.dumps(variables, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class Checkpoints:
+    """
+    Record the stages of an analysis completed in its database.
+
+    The checkpoints live in the database they describe, therefore they are
+    lost with it. A stage is complete if it was recorded with the key of the
+    run. A run which does not resume forgets the previous checkpoints.
+    """
+
+    def __init__(self, key: str, resume: bool = False) -> None:
+        self.key = key
+        self.resume = resume
+        self.completed: typing.Set[str] = set()
+
+    async def load(self, ephemeral: bool = False) -> None:
+        """
+        Read the stages completed by the previous runs.
+
+        The checkpoints of an `ephemeral` database are unlogged, like its
+        tables, to be lost with them in case of crash.
+        """
+        table = sql.Identifier("public", CHECKPOINT_TABLE)
+        async with await database.connect() as conn:
+            await conn.execute(
+                sql.SQL(
+                    """
+                    CREATE {} TABLE IF NOT EXISTS {} (
+                        stage TEXT PRIMARY KEY,
+                        key TEXT NOT NULL,
+                        completed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                    );
+                    """
+                ).format(sql.SQL("UNLOGGED" if ephemeral else ""), table)
+            )
+            if not self.resume:
+                await conn.execute(sql.SQL("TRUNCATE {};").format(table))
+                return
+            cur = await conn.execute(
+                sql.SQL("SELECT stage FROM {} WHERE key = %s;").format(table),
+                (self.key,),
+            )
+            self.completed = {stage for (stage,) in await cur.fetchall()}
+        logger.info(f"Resuming after {len(self.completed)} completed stages")
+        logger.debug(f"Completed stages: {sorted(self.completed)}")
+
+    def done(self, stage: str) -> bool:
+        """Return whether a stage was completed by a previous run."""
+        return stage in self.completed
+
+    async def record(
+        self, stage: str, conn: typing.Optional[psycopg.AsyncConnection] = None
+    ) -> None:
+        """
+        Record the completion of a stage.
+
+        The record is part of the current transaction of `conn` if provided,
+        to be committed with the work of the stage.
+        """
+        statement = sql.SQL(
+            """
+            INSERT INTO {} (stage, key)
+            VALUES (%s, %s)
+            ON CONFLICT (stage) DO UPDATE
+            SET key = EXCLUDED.key, completed_at = now();
+            """
+        ).format(sql.Identifier("public", CHECKPOINT_TABLE))
+        if conn:
+            await conn.execute(statement, (stage, self.key))
+        else:
+            async with await database.connect() as conn:
+                await conn.execute(statement, (stage, self.key))
+        self.completed.add(stage)
+
+    async def forget(self, prefix: str) -> None:
+        """Forget the stages starting with a prefix, since their work is undone."""
+        async with await database.connect() as conn:
+            await conn.execute(
+                sql.SQL("DELETE FROM {} WHERE starts_with(stage, %s);").format(
+                    sql.Identifier("public", CHECKPOINT_TABLE)
+                ),
+                (prefix,),
+            )
+        self.completed = {s for s in self.completed if not s.startswith(prefix)}
@@ -0,0 +1,287 @@
+"""Functions related to the computation of the network connectivity."""
+import asyncio
+import math
+import multiprocessing
+import os
+import pathlib
+import time
+import typing
+from datetime import timedelta
+from enum import Enum
+
+from loguru import logger
+from psycopg_pool import AsyncConnectionPool
+
+from modular_bna.core import (
+    checkpoint,
+    database,
+    profiling,
+    routing,
+)
+
+STRESS_LEVELS = ("high", "low")
+
+# Minimum number of roads to process per shard. Below that, the overhead of
+# dispatching a query outweighs the benefits of the parallelism.
+MIN_ROADS_PER_SHARD = 500
+
+# Maximum number of shards per worker. Having more shards than workers
+# balances the load, since the processing time of each shard is not uniform.
+MAX_SHARDS_PER_WORKER = 4
+
+
+class RoutingEngine(str, Enum):
+    """Define the engines available to compute the reachable roads."""
+
+    PGROUTING = "pgrouting"
+    NATIVE = "native"
+
+
+class Shard(typing.NamedTuple):
+    """Represent a subset of the roads to route from."""
+
+    stress: str
+    number: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"reachable_roads_{self.stress}_stress [{self.number + 1}/{self.count}]"
+
+
+def shard_count(road_count: int, workers: int) -> int:
+    """
+    Compute the number of shards to split the reachable roads computation into.
+
+    Examples:
+        >>> assert shard_count(0, 8) == 1
+        >>> assert shard_count(1200, 8) == 3
+        >>> assert shard_count(1_000_000, 8) == 32
+    """
+    shards = math.ceil(road_count / MIN_ROADS_PER_SHARD)
+    return max(1, min(shards, workers * MAX_SHARDS_PER_WORKER))
+
+
+def sql_file(sql_dir: os.PathLike, stress: str, step: str) -> pathlib.Path:
+    """Return the path of a reachable roads SQL file."""
+    return (
+        pathlib.Path(sql_dir)
+        / "connectivity"
+        / f"reachable_roads_{stress}_stress_{step}.sql"
+    )
+
+
+async def compute_shard(
+    pool: AsyncConnectionPool,
+    sql_dir: os.PathLike,
+    shard: Shard,
+    max_trip_distance: int,
+    prune_roads: bool = True,
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+    checkpoints: typing.Optional[checkpoint.Checkpoints] = None,
+) -> timedelta:
+    """
+    Compute the reachable roads for a shard and return its wall clock time.
+
+    The checkpoint of the shard is committed along with its reachable roads.
+    """
+    variables = {
+        "nb_max_trip_distance": max_trip_distance,
+        "prune_roads": str(prune_roads).lower(),
+        "thread_num": shard.count,
+        "thread_no": shard.number,
+    }
+    async with pool.connection() as conn:
+        start = time.time()
+        async with conn.transaction():
+            await database.execute_file(
+                conn, sql_file(sql_dir, shard.stress, "calc"), variables, profiler
+            )
+            if checkpoints:
+                await checkpoints.record(str(shard), conn)
+        elapsed = timedelta(seconds=time.time() - start)
+    logger.info(f"{shard} wall clock time: {elapsed}")
+    return elapsed
+
+
+async def fetch_shard_count(pool: AsyncConnectionPool, workers: int) -> int:
+    """Return the number of shards per stress level."""
+    async with pool.connection() as conn:
+        cur = await conn.execute("SELECT COUNT(*) FROM neighborhood_ways;")
+        (road_count,) = await cur.fetchone()
+
+    count = shard_count(road_count, workers)
+    logger.info(f"Computing {road_count} roads in {count} shards per stress level")
+    return count
+
+
+def prep_stage(stress: str, count: int) -> str:
+    """
+    Return the name of the checkpoint of the preparation of the shards.
+
+    Example:
+        >>> prep_stage("high", 16)
+        reachable_roads_high_stress [prep, 16 shards]
+    """
+    return f"reachable_roads_{stress}_stress [prep, {count} shards]"
+
+
+async def compute_shards(
+    pool: AsyncConnectionPool,
+    sql_dir: os.PathLike,
+    max_trip_distance: int,
+    count: int,
+    prune_roads: bool = True,
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+    checkpoints: typing.Optional[checkpoint.Checkpoints] = None,
+) -> typing.Dict[str, timedelta]:
+    """
+    Compute the reachable roads with pgRouting.
+
+    The roads are split into `count` shards per stress level, which are
+    computed concurrently. Both stress levels are processed at the same time.
+    If a shard fails, the other ones are cancelled and the error is raised.
+    The shards completed by a previous run are skipped.
+
+    Returns the wall clock time of each shard.
+    """
+    shards = [
+        Shard(stress, number, count)
+        for number in range(count)
+        for stress in STRESS_LEVELS
+    ]
+    if checkpoints:
+        shards = [shard for shard in shards if not checkpoints.done(str(shard))]
+    tasks = {
+        asyncio.create_task(
+            compute_shard(
+                pool,
+                sql_dir,
+                shard,
+                max_trip_distance,
+                prune_roads,
+                profiler,
+                checkpoints,
+            )
+        ): shard
+        for shard in shards
+    }
+    if not tasks:
+        return {}
+    done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    for task in done:
+        if task.exception():
+            logger.error(f"{tasks[task]} failed: {task.exception()}")
+            raise task.exception()
+
+    return {str(shard): task.result() for task, shard in tasks.items()}
+
+
+async def compute_native(
+    pool: AsyncConnectionPool,
+    max_trip_distance: int,
+    workers: int,
+    prune_roads: bool = True,
+) -> typing.Dict[str, timedelta]:
+    """
+    Compute the reachable roads with the native routing engine.
+
+    The network is loaded only once, and each origin is routed at all the
+    stress levels in the same task. If `prune_roads` is set, only the
+    routing roads are routed from and kept.
+
+    Returns the wall clock time of the computation.
+    """
+    async with pool.connection() as conn:
+        network = await routing.fetch_network(conn)
+        origins, origin_roads = await routing.fetch_origins(conn, network, prune_roads)
+        targets = await routing.fetch_targets(conn, network) if prune_roads else None
+    logger.info(
+        f"Routing from {len(origins)} roads over {len(network)} vertices "
+        f"and {len(network.sources)} links"
+    )
+
+    elapsed = await routing.compute_reachable_roads(
+        pool,
+        STRESS_LEVELS,
+        network,
+        origins,
+        origin_roads,
+        max_trip_distance,
+        workers,
+        targets,
+    )
+    return {"reachable_roads [native]": elapsed}
+
+
+async def compute_reachable_roads(
+    sql_dir: os.PathLike,
+    max_trip_distance: int,
+    engine: RoutingEngine = RoutingEngine.PGROUTING,
+    workers: typing.Optional[int] = None,
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+    prune_roads: bool = True,
+    checkpoints: typing.Optional[checkpoint.Checkpoints] = None,
+) -> typing.Dict[str, timedelta]:
+    """
+    Compute the high and low stress reachable roads.
+
+    The computation runs over a connection pool sized after the number of
+    cores. If a profiler is provided, the execution of each SQL file is
+    recorded.
+
+    If `prune_roads` is set, the routing starts only from the roads of the
+    census blocks in the boundary, and keeps only the roads of the census
+    blocks and of the paths, the only ones the connectivity looks up.
+
+    If `checkpoints` are provided, the pgRouting shards completed by a previous
+    run are kept, as long as the sharding is the same.
+
+    Returns the wall clock time of each unit of work.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    # The native engine writes all the stress levels at once.
+    async with database.create_pool(max(workers, len(STRESS_LEVELS))) as pool:
+        count = 0
+        if engine == RoutingEngine.PGROUTING:
+            count = await fetch_shard_count(pool, workers)
+        async with pool.connection() as conn:
+            for stress in STRESS_LEVELS:
+                stage = prep_stage(stress, count)
+                if engine == RoutingEngine.PGROUTING and checkpoints:
+                    if checkpoints.done(stage):
+                        continue
+                    # The preparation empties the reachable roads of the shards.
+                    await checkpoints.forget(f"reachable_roads_{stress}_stress [")
+                await database.execute_file(
+                    conn, sql_file(sql_dir, stress, "prep"), profiler=profiler
+                )
+                if engine == RoutingEngine.PGROUTING and checkpoints:
+                    await checkpoints.record(stage)
+
+        if engine == RoutingEngine.NATIVE:
+            timings = await compute_native(
+                pool, max_trip_distance, workers, prune_roads
+            )
+        else:
+            timings = await compute_shards(
+                pool,
+                sql_dir,
+                max_trip_distance,
+                count,
+                prune_roads,
+                profiler,
+                checkpoints,
+            )
+
+        async def cleanup(stress: str) -> None:
+            async with pool.connection() as conn:
+                await database.execute_file(
+                    conn, sql_file(sql_dir, stress, "cleanup"), profiler=profiler
+                )
+
+        await asyncio.gather(*[cleanup(stress) for stress in STRESS_LEVELS])
+
+    return timings
@@ -0,0 +1,159 @@
+"""Functions related to the database."""
+import os
+import pathlib
+import re
+import typing
+
+import psycopg
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import AsyncConnectionPool
+
+from modular_bna.core import profiling
+
+# Tokens psql cares about when interpolating variables and splitting a script
+# into statements. The order matters: literals and comments must be matched
+# before the variables so that their content is left untouched.
+PSQL_TOKENS = re.compile(
+    r"""
+    (?P<literal>[eE]?'(?:[^']|'')*')
+    | (?P<dollar>\$(?P<tag>[A-Za-z_]\w*)?\$.*?\$(?P=tag)?\$)
+    | (?P<identifier>"(?:[^"]|"")*")
+    | (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<cast>::)
+    | (?P<variable>:(?P<quote>['"]?)(?P<name>[A-Za-z_]\w*)(?P=quote))
+    | (?P<open>\()
+    | (?P<close>\))
+    | (?P<semicolon>;)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+
+def conninfo(**kwargs) -> str:
+    """
+    Build the connection string used to reach the database.
+
+    The connection parameters are read from the same `PG*` environment
+    variables as the ones used by `psql` in the bash scripts, therefore both
+    always target the same database.
+
+    Example:
+        >>> assert conninfo() == ""
+        >>> assert conninfo(dbname="bna") == "dbname=bna"
+    """
+    return make_conninfo("", **kwargs)
+
+
+def render(sql: str, variables: typing.Mapping[str, typing.Any]) -> str:
+    """
+    Interpolate psql variables into a SQL script.
+
+    `:var` is replaced verbatim, `:'var'` as a literal and `:"var"` as an
+    identifier. Like psql, variables appearing in literals, comments or
+    undefined ones are left untouched.
+
+    Examples:
+        >>> variables = {"a": 1, "b": "x", "c": "t"}
+        >>> print(render("SELECT :a, :'b', :\\"c\\", ':a', 1::INT -- :a", variables))
+        SELECT 1, 'x', "t", ':a', 1::INT -- :a
+        >>> print(render("SELECT :undefined", {}))
+        SELECT :undefined
+    """
+
+    def replace(match: re.Match) -> str:
+        name = match.group("name")
+        if match.group("variable") is None or name not in variables:
+            return match.group(0)
+        value = str(variables[name])
+        quote = match.group("quote")
+        if quote == "'":
+            return "'" + value.replace("'", "''") + "'"
+        if quote == '"':
+            return '"' + value.replace('"', '""') + '"'
+        return value
+
+    return PSQL_TOKENS.sub(replace, sql)
+
+
+def split(sql: str) -> typing.List[str]:
+    """
+    Split a SQL script into individual statements, like psql does.
+
+    Statements must be sent one by one since some of them, like `VACUUM`,
+    cannot run inside a multi-statement query string.
+
+    Example:
+        >>> split("SELECT ';'; -- ;\\nSELECT (1;2);VACUUM;  ")
+        ["SELECT ';'", '-- ;\\nSELECT (1;2)', 'VACUUM']
+    """
+    statements = []
+    depth = 0
+    start = 0
+    for match in PSQL_TOKENS.finditer(sql):
+        if match.group("open"):
+            depth += 1
+        elif match.group("close"):
+            depth = max(depth - 1, 0)
+        elif match.group("semicolon") and depth == 0:
+            statements.append(sql[start : match.start()])
+            start = match.end()
+    statements.append(sql[start:])
+    return [s.strip() for s in statements if _has_code(s)]
+
+
+def _has_code(statement: str) -> bool:
+    """Return True if a statement is not only made of whitespaces and comments."""
+    remainder = PSQL_TOKENS.sub(
+        lambda m: "" if m.group("comment") else m.group(0), statement
+    )
+    return bool(remainder.strip())
+
+
+def load(
+    sql_file: os.PathLike, variables: typing.Optional[typing.Mapping] = None
+) -> typing.List[str]:
+    """Load a SQL file and return its statements ready to be executed."""
+    sql = pathlib.Path(sql_file).read_text()
+    return split(render(sql, variables or {}))
+
+
+async def execute_file(
+    conn: psycopg.AsyncConnection,
+    sql_file: os.PathLike,
+    variables: typing.Optional[typing.Mapping] = None,
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+) -> int:
+    """
+    Execute a SQL file statement by statement.
+
+    Returns the total number of rows affected by the statements.
+    """
+    statements = load(sql_file, variables)
+    async with conn.cursor() as cur:
+        if profiler:
+            async with profiler.measure(conn, sql_file) as record:
+                for statement in statements:
+                    await profiler.execute(cur, record, statement)
+            return record["rows"]
+
+        rowcount = 0
+        for statement in statements:
+            await cur.execute(statement)
+            rowcount += max(cur.rowcount, 0)
+        return rowcount
+
+
+async def connect() -> psycopg.AsyncConnection:
+    """Open an autocommit connection."""
+    return await psycopg.AsyncConnection.connect(conninfo(), autocommit=True)
+
+
+def create_pool(size: int) -> AsyncConnectionPool:
+    """Create a pool of autocommit connections."""
+    return AsyncConnectionPool(
+        conninfo(),
+        min_size=size,
+        max_size=size,
+        kwargs={"autocommit": True},
+        open=False,
+    )
@@ -0,0 +1,747 @@
+"""Functions related to the execution of the pipeline stages."""
+import asyncio
+import json
+import multiprocessing
+import os
+import pathlib
+import typing
+from enum import Enum
+
+import psycopg
+from loguru import logger
+from psycopg_pool import AsyncConnectionPool
+
+from modular_bna.core import (
+    checkpoint,
+    database,
+    profiling,
+)
+
+# Name of the file recording the variables applied by a run.
+MANIFEST = "manifest.json"
+
+# Destinations, with the environment variable defining their cluster tolerance
+# and its default value.
+DESTINATIONS = (
+    ("colleges", "TOLERANCE_COLLEGES", 100),
+    ("community_centers", "TOLERANCE_COMM_CTR", 50),
+    ("doctors", "TOLERANCE_DOCTORS", 50),
+    ("dentists", "TOLERANCE_DENTISTS", 50),
+    ("hospitals", "TOLERANCE_HOSPITALS", 50),
+    ("pharmacies", "TOLERANCE_PHARMACIES", 50),
+    ("parks", "TOLERANCE_PARKS", 50),
+    ("retail", "TOLERANCE_RETAIL", 50),
+    ("schools", None, None),
+    ("social_services", None, None),
+    ("supermarkets", None, None),
+    ("transit", "TOLERANCE_TRANSIT", 75),
+    ("universities", "TOLERANCE_UNIVERSITIES", 150),
+)
+
+# Destination access, with the scores of the first, second and third
+# destinations reached.
+DESTINATION_ACCESS = (
+    ("colleges", 0.7, 0, 0),
+    ("community_centers", 0.4, 0.2, 0.1),
+    ("doctors", 0.4, 0.2, 0.1),
+    ("dentists", 0.4, 0.2, 0.1),
+    ("hospitals", 0.7, 0, 0),
+    ("pharmacies", 0.4, 0.2, 0.1),
+    ("parks", 0.3, 0.2, 0.2),
+    ("retail", 0.4, 0.2, 0.1),
+    ("schools", 0.3, 0.2, 0.2),
+    ("social_services", 0.7, 0, 0),
+    ("supermarkets", 0.6, 0.2, 0),
+    ("trails", 0.7, 0.2, 0),
+    ("transit", 0.6, 0, 0),
+    ("universities", 0.7, 0, 0),
+)
+
+# Scoring steps of the population and jobs access.
+STEP_SCORES = {
+    "max_score": 1,
+    "step1": 0.03,
+    "score1": 0.1,
+    "step2": 0.2,
+    "score2": 0.4,
+    "step3": 0.5,
+    "score3": 0.8,
+}
+
+
+class Executor(str, Enum):
+    """Define the executors available to run the SQL files of the stages."""
+
+    NATIVE = "native"
+    BASH = "bash"
+
+
+class Step(typing.NamedTuple):
+    """Represent a SQL file to execute with its psql variables."""
+
+    sql_file: str
+    variables: typing.Mapping[str, typing.Any] = {}
+    # Tables read and written, used to schedule the steps concurrently.
+    reads: typing.FrozenSet[str] = frozenset()
+    writes: typing.FrozenSet[str] = frozenset()
+
+    @property
+    def name(self) -> str:
+        """Return the name of the step, used to override its variables."""
+        return pathlib.Path(self.sql_file).stem
+
+
+def env(name: str, default: typing.Any) -> str:
+    """
+    Read an environment variable like `${NAME:-default}` does in bash.
+
+    Example:
+        >>> assert env("MODULAR_BNA_UNDEFINED_VARIABLE", 42) == "42"
+    """
+    return os.environ.get(name) or str(default)
+
+
+def output_srid() -> str:
+    """Return the SRID of the analysis."""
+    return env("NB_OUTPUT_SRID", 2163)
+
+
+def max_trip_distance() -> int:
+    """Return the maximum trip distance."""
+    return int(env("NB_MAX_TRIP_DISTANCE", 2680))
+
+
+def prune_routing_roads() -> bool:
+    """Return whether the routing is restricted to the roads of the blocks and paths."""
+    return env("ROUTING_PRUNE_ROADS", "true").lower() in ("1", "true", "yes", "on")
+
+
+def score_variables() -> typing.Dict[str, str]:
+    """Return the weights of the score categories."""
+    return {
+        "total": env("SCORE_TOTAL", 100),
+        "people": env("SCORE_PEOPLE", 15),
+        "opportunity": env("SCORE_OPPORTUNITY", 20),
+        "core_services": env("SCORE_CORESVCS", 20),
+        "retail": env("SCORE_RETAIL", 15),
+        "recreation": env("SCORE_RECREATION", 15),
+        "transit": env("SCORE_TRANSIT", 15),
+    }
+
+
+def features_steps() -> typing.List[Step]:
+    """Return the steps of `30-compute-features.sh`."""
+    srid = {"nb_output_srid": output_srid()}
+    signal = {"sigctl_search_dist": env("NB_SIGCTL_SEARCH_DIST", 25)}
+    buffer = {"nb_boundary_buffer": env("NB_BOUNDARY_BUFFER", max_trip_distance())}
+    return [
+        Step("prepare_tables.sql", srid),
+        Step("clip_osm.sql", buffer),
+        Step("features/remove_bicycle_prohibited_paths.sql"),
+        Step("features/road_features.sql"),
+        Step("features/paths.sql", srid),
+        Step("features/legs.sql"),
+        Step("features/signalized.sql", signal),
+        Step("features/stops.sql", signal),
+        Step("features/rrfb.sql", signal),
+        Step("features/island.sql", signal),
+    ]
+
+
+def stress_steps(state_default: str, city_default: str) -> typing.List[Step]:
+    """Return the steps of `31-compute-stress.sh`."""
+    higher_order = {
+        "default_parking": 1,
+        "default_parking_width": 8,
+        "default_facility_width": 5,
+    }
+    lower_order = {
+        "default_lanes": 1,
+        "default_parking": 1,
+        "default_roadway_width": 27,
+    }
+    return [
+        Step("stress/stress_motorway-trunk.sql"),
+        Step(
+            "stress/stress_segments_higher_order.sql",
+            {"class": "primary", "default_speed": 40, "default_lanes": 2}
+            | higher_order,
+        ),
+        Step(
+            "stress/stress_segments_higher_order.sql",
+            {"class": "secondary", "default_speed": 40, "default_lanes": 2}
+            | higher_order,
+        ),
+        Step(
+            "stress/stress_segments_higher_order.sql",
+            {"class": "tertiary", "default_speed": 30, "default_lanes": 1}
+            | higher_order,
+        ),
+        Step(
+            "stress/stress_segments_lower_order_res.sql",
+            {
+                "class": "residential",
+                "state_default": state_default,
+                "city_default": city_default,
+            }
+            | lower_order,
+        ),
+        Step(
+            "stress/stress_segments_lower_order.sql",
+            {"class": "unclassified", "default_speed": 25} | lower_order,
+        ),
+        Step("stress/stress_living_street.sql"),
+        Step("stress/stress_track.sql"),
+        Step("stress/stress_path.sql"),
+        Step("stress/stress_one_way_reset.sql"),
+        Step("stress/stress_motorway-trunk_ints.sql"),
+        Step("stress/stress_primary_ints.sql"),
+        Step("stress/stress_secondary_ints.sql"),
+        Step(
+            "stress/stress_tertiary_ints.sql",
+            {
+                "primary_speed": 40,
+                "secondary_speed": 40,
+                "primary_lanes": 2,
+                "secondary_lanes": 2,
+            },
+        ),
+        Step(
+            "stress/stress_lesser_ints.sql",
+            {
+                "primary_speed": 40,
+                "secondary_speed": 40,
+                "tertiary_speed": 30,
+                "primary_lanes": 2,
+                "secondary_lanes": 2,
+                "tertiary_lanes": 1,
+            },
+        ),
+        Step("stress/stress_link_ints.sql"),
+    ]
+
+
+def stress_step(state_default: str, city_default: str) -> Step:
+    """
+    Return the step computing all the stress ratings in a single pass.
+
+    It is equivalent to the steps of `31-compute-stress.sh`, which remain the
+    reference the single pass is tested against.
+    """
+    return Step(
+        "stress/stress.sql",
+        {
+            "primary_speed": 40,
+            "secondary_speed": 40,
+            "tertiary_speed": 30,
+            "unclassified_speed": 25,
+            "primary_lanes": 2,
+            "secondary_lanes": 2,
+            "tertiary_lanes": 1,
+            "default_parking": 1,
+            "default_parking_width": 8,
+            "default_facility_width": 5,
+            "default_roadway_width": 27,
+            "state_default": state_default,
+            "city_default": city_default,
+        },
+    )
+
+
+def network_steps() -> typing.List[Step]:
+    """Return the steps of `32-compute-network.sh`."""
+    srid = output_srid()
+    return [
+        Step(
+            "connectivity/build_network.sql",
+            {
+                "nb_output_srid": srid,
+                "link_geom": env("NETWORK_LINK_GEOM", "false"),
+            },
+        ),
+        Step(
+            "connectivity/census_blocks.sql",
+            {
+                "nb_output_srid": srid,
+                "block_road_buffer": env("BLOCK_ROAD_BUFFER", 15),
+                "block_road_min_length": env("BLOCK_ROAD_MIN_LENGTH", 30),
+            },
+        ),
+        Step("connectivity/routing_roads.sql"),
+    ]
+
+
+def connectivity_steps(
+    run_import_jobs: bool,
+    overrides: typing.Optional[typing.Mapping[str, typing.Mapping]] = None,
+) -> typing.List[Step]:
+    """
+    Return the steps of `34-compute-run-connectivity.sh`.
+
+    The steps declare the tables they read and write, to be scheduled as a
+    graph. The destinations do not depend on the connected census blocks,
+    therefore they are listed first to be computed alongside them.
+
+    The variables of the steps can be overridden by step name. Only the
+    variables a step defines can be overridden.
+    """
+    srid = output_srid()
+    steps = [
+        Step(
+            "connectivity/connected_census_blocks.sql",
+            {"nb_max_trip_distance": max_trip_distance(), "nb_output_srid": srid},
+            reads=frozenset(
+                {
+                    "neighborhood_boundary",
+                    "neighborhood_census_blocks",
+                    "neighborhood_reachable_roads_low_stress",
+                }
+            ),
+            writes=frozenset({"neighborhood_connected_census_blocks"}),
+        )
+    ]
+    if run_import_jobs:
+        steps.append(
+            Step(
+                "connectivity/census_block_jobs.sql",
+                reads=frozenset({"neighborhood_census_blocks"}),
+                writes=frozenset({"neighborhood_census_block_jobs"}),
+            )
+        )
+
+    # The OSM features of all the destinations are selected in a single scan.
+    features = frozenset(
+        {"neighborhood_destination_points", "neighborhood_destination_polygons"}
+    )
+    steps.append(
+        Step(
+            "connectivity/destination_features.sql",
+            reads=frozenset(
+                {"neighborhood_osm_full_point", "neighborhood_osm_full_polygon"}
+            ),
+            writes=features,
+        )
+    )
+    for destination, tolerance, default in DESTINATIONS:
+        variables = {"nb_output_srid": srid}
+        if tolerance:
+            variables["cluster_tolerance"] = env(tolerance, default)
+        steps.append(
+            Step(
+                f"connectivity/destinations/{destination}.sql",
+                variables,
+                reads=frozenset({"neighborhood_census_blocks"}) | features,
+                writes=frozenset({f"neighborhood_{destination}"}),
+            )
+        )
+
+    # All the access steps update the census blocks.
+    access = frozenset(
+        {"neighborhood_boundary", "neighborhood_connected_census_blocks"}
+    )
+    steps.append(
+        Step(
+            "connectivity/access_population.sql",
+            STEP_SCORES,
+            reads=access,
+            writes=frozenset({"neighborhood_census_blocks"}),
+        )
+    )
+    if run_import_jobs:
+        steps.append(
+            Step(
+                "connectivity/access_jobs.sql",
+                STEP_SCORES,
+                reads=access | {"neighborhood_census_block_jobs"},
+                writes=frozenset({"neighborhood_census_blocks"}),
+            )
+        )
+
+    # The access to all the destinations, but the trails, is computed at once.
+    destinations = {f"neighborhood_{d}" for d, *_ in DESTINATIONS}
+    variables: typing.Dict[str, typing.Any] = {"max_score": 1}
+    for destination, first, second, third in DESTINATION_ACCESS:
+        if destination == "trails":
+            trails = {"first": first, "second": second, "third": third, "max_score": 1}
+            continue
+        variables[f"{destination}_first"] = first
+        variables[f"{destination}_second"] = second
+        variables[f"{destination}_third"] = third
+    steps.extend(
+        [
+            Step(
+                "connectivity/access_destinations.sql",
+                variables,
+                reads=access | destinations,
+                writes=frozenset({"neighborhood_census_blocks"}) | destinations,
+            ),
+            Step(
+                "connectivity/access_trails.sql",
+                trails
+                | {
+                    "min_path_length": env("MIN_PATH_LENGTH", 4800),
+                    "min_bbox_length": env("MIN_PATH_BBOX", 3300),
+                },
+                reads=frozenset(
+                    {
+                        "neighborhood_boundary",
+                        "neighborhood_paths",
+                        "neighborhood_reachable_roads_high_stress",
+                        "neighborhood_reachable_roads_low_stress",
+                    }
+                ),
+                writes=frozenset({"neighborhood_census_blocks"}),
+            ),
+            Step(
+                "connectivity/access_overall.sql",
+                score_variables(),
+                reads=frozenset(
+                    {"neighborhood_boundary", "neighborhood_census_blocks"}
+                ),
+                writes=frozenset({"neighborhood_census_blocks"}),
+            ),
+            Step(
+                "connectivity/score_inputs.sql",
+                reads=frozenset(
+                    {"neighborhood_boundary", "neighborhood_census_blocks"}
+                    | destinations
+                ),
+                writes=frozenset({"neighborhood_score_inputs"}),
+            ),
+            Step(
+                "connectivity/overall_scores.sql",
+                score_variables(),
+                reads=frozenset(
+                    {
+                        "neighborhood_boundary",
+                        "neighborhood_census_blocks",
+                        "neighborhood_score_inputs",
+                        "neighborhood_ways",
+                    }
+                ),
+                writes=frozenset({"neighborhood_overall_scores"}),
+            ),
+        ]
+    )
+    overrides = overrides or {}
+    for step in steps:
+        unknown = set(overrides.get(step.name, {})) - set(step.variables)
+        if unknown:
+            raise ValueError(
+                f"unknown variables of {step.name}: {', '.join(sorted(unknown))}"
+            )
+    return [
+        step._replace(variables={**step.variables, **overrides.get(step.name, {})})
+        for step in steps
+    ]
+
+
+def parse_overrides(
+    assignments: typing.Iterable[str],
+) -> typing.Dict[str, typing.Dict[str, str]]:
+    """
+    Parse variable overrides written as `step.variable=value`.
+
+    Example:
+        >>> parse_overrides(["access_trails.first=0.5", "overall_scores.people=20"])
+        {'access_trails': {'first': '0.5'}, 'overall_scores': {'people': '20'}}
+    """
+    overrides: typing.Dict[str, typing.Dict[str, str]] = {}
+    for assignment in assignments:
+        target, sep, value = assignment.partition("=")
+        step, dot, variable = target.partition(".")
+        if not (sep and dot and step and variable):
+            raise ValueError(
+                f"invalid override {assignment!r}, expected step.var=value"
+            )
+        overrides.setdefault(step, {})[variable] = value
+    return overrides
+
+
+def stale_steps(
+    steps: typing.Sequence[Step],
+    applied: typing.Mapping[str, typing.Mapping[str, str]],
+) -> typing.List[Step]:
+    """
+    Return the steps to run again for the results to reflect their variables.
+
+    A step is stale if its variables differ from the applied ones, or if it
+    reads a table written by a stale step.
+
+    Example:
+        >>> steps = [
+        >>>     Step("a.sql", {"x": 1}, writes=frozenset({"a"})),
+        >>>     Step("b.sql", {"y": 2}, writes=frozenset({"b"})),
+        >>>     Step("c.sql", reads=frozenset({"a"}), writes=frozenset({"c"})),
+        >>> ]
+        >>> applied = {"a.sql": {"x": "0"}, "b.sql": {"y": "2"}, "c.sql": {}}
+        >>> stale = stale_steps(steps, applied)
+        >>> assert [s.sql_file for s in stale] == ["a.sql", "c.sql"]
+    """
+    stale: typing.List[Step] = []
+    for step in steps:
+        variables = {k: str(v) for k, v in step.variables.items()}
+        if applied.get(step.sql_file) != variables or any(
+            before.writes & step.reads for before in stale
+        ):
+            stale.append(step)
+    return stale
+
+
+def dependencies(steps: typing.Sequence[Step]) -> typing.List[typing.Set[int]]:
+    """
+    Compute the steps each step depends on.
+
+    A step runs after the steps listed before it which write a table it reads
+    or writes. The writers of a table are therefore serialized, since their
+    updates would otherwise block each other on the row locks. A step reading
+    a table does not hold back its later writers, since it only reads the
+    columns produced before it.
+
+    Example:
+        >>> steps = [
+        >>>     Step("a.sql", writes=frozenset({"a"})),
+        >>>     Step("b.sql", reads=frozenset({"x"}), writes=frozenset({"b"})),
+        >>>     Step("c.sql", reads=frozenset({"a", "b"}), writes=frozenset({"x"})),
+        >>>     Step("d.sql", writes=frozenset({"x"})),
+        >>> ]
+        >>> assert dependencies(steps) == [set(), set(), {0, 1}, {2}]
+    """
+    return [
+        {
+            i
+            for i, before in enumerate(steps[:n])
+            if before.writes & (step.reads | step.writes)
+        }
+        for n, step in enumerate(steps)
+    ]
+
+
+async def execute_steps(
+    conn: psycopg.AsyncConnection,
+    sql_dir: os.PathLike,
+    steps: typing.Iterable[Step],
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+) -> None:
+    """Execute the steps one after the other within the same session."""
+    for step in steps:
+        logger.debug(f"Executing {step.sql_file}")
+        await database.execute_file(
+            conn, pathlib.Path(sql_dir) / step.sql_file, step.variables, profiler
+        )
+
+
+async def execute_stage(
+    conn: psycopg.AsyncConnection,
+    sql_dir: os.PathLike,
+    steps: typing.Iterable[Step],
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+    checkpoints: typing.Optional[checkpoint.Checkpoints] = None,
+    stage: str = "",
+) -> None:
+    """
+    Execute the steps of a stage in a single transaction.
+
+    The steps are not re-runnable once partially applied, therefore a failed
+    stage is rolled back entirely. The checkpoint of the stage is committed
+    with its work.
+    """
+    async with conn.transaction():
+        await execute_steps(conn, sql_dir, steps, profiler)
+        if checkpoints:
+            await checkpoints.record(stage, conn)
+
+
+async def compute_features(
+    sql_dir: os.PathLike,
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+    checkpoints: typing.Optional[checkpoint.Checkpoints] = None,
+    stage: str = "Compute features",
+) -> None:
+    """Compute the features of the road segments and of the intersections."""
+    async with await database.connect() as conn:
+        await execute_stage(
+            conn, sql_dir, features_steps(), profiler, checkpoints, stage
+        )
+
+
+async def compute_stress(
+    sql_dir: os.PathLike,
+    city_fips: str,
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+    checkpoints: typing.Optional[checkpoint.Checkpoints] = None,
+    stage: str = "Compute stress",
+) -> None:
+    """
+    Compute the stress of the road segments and of the intersections.
+
+    The default residential speed limits are looked up for the city. All the
+    ratings are computed in a single pass and written back at once.
+    """
+    async with await database.connect() as conn:
+        cur = await conn.execute(
+            """
+            SELECT  state_speed, city_speed
+            FROM    residential_speed_limit
+            WHERE   city_fips_code = %s;
+            """,
+            (city_fips,),
+        )
+        state_default, city_default = await cur.fetchone() or (None, None)
+        await execute_stage(
+            conn,
+            sql_dir,
+            [
+                stress_step(
+                    "NULL" if state_default is None else state_default,
+                    "NULL" if city_default is None else city_default,
+                )
+            ],
+            profiler,
+            checkpoints,
+            stage,
+        )
+
+
+async def compute_network(
+    sql_dir: os.PathLike,
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+    checkpoints: typing.Optional[checkpoint.Checkpoints] = None,
+    stage: str = "Compute network",
+) -> None:
+    """Build the routing network and associate the roads to the census blocks."""
+    async with await database.connect() as conn:
+        await execute_stage(
+            conn, sql_dir, network_steps(), profiler, checkpoints, stage
+        )
+
+
+async def execute_graph(
+    pool: AsyncConnectionPool,
+    sql_dir: os.PathLike,
+    steps: typing.Sequence[Step],
+    workers: int,
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+    checkpoints: typing.Optional[checkpoint.Checkpoints] = None,
+) -> None:
+    """
+    Execute the steps concurrently, following their dependencies.
+
+    The steps run as soon as the ones they depend on are done, with at most
+    `workers` steps at the same time. If a step fails, the running ones are
+    cancelled and the error is raised.
+
+    If `checkpoints` are provided, the steps completed by a previous run are
+    skipped, and the completion of the others is recorded along with their
+    work, in the same transaction.
+    """
+    if checkpoints:
+        steps = [step for step in steps if not checkpoints.done(step.sql_file)]
+
+    async def execute_step(step: Step) -> None:
+        async with pool.connection() as conn:
+            await execute_stage(
+                conn, sql_dir, [step], profiler, checkpoints, step.sql_file
+            )
+
+    requirements = dependencies(steps)
+    pending = list(range(len(steps)))
+    running: typing.Dict[asyncio.Task, int] = {}
+    done: typing.Set[int] = set()
+    try:
+        while pending or running:
+            ready = [i for i in pending if requirements[i] <= done]
+            for i in ready[: workers - len(running)]:
+                pending.remove(i)
+                running[asyncio.create_task(execute_step(steps[i]))] = i
+            finished, _ = await asyncio.wait(
+                running, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in finished:
+                i = running.pop(task)
+                if task.exception():
+                    logger.error(f"{steps[i].sql_file} failed: {task.exception()}")
+                    raise task.exception()
+                done.add(i)
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+async def compute_connectivity(
+    sql_dir: os.PathLike,
+    run_import_jobs: bool,
+    workers: typing.Optional[int] = None,
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+    checkpoints: typing.Optional[checkpoint.Checkpoints] = None,
+) -> None:
+    """
+    Compute the connected census blocks, the access metrics and the scores.
+
+    The independent steps run concurrently over a connection pool sized after
+    the number of cores. The steps completed by a previous run are skipped.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    async with database.create_pool(workers) as pool:
+        await execute_graph(
+            pool,
+            sql_dir,
+            connectivity_steps(run_import_jobs),
+            workers,
+            profiler,
+            checkpoints,
+        )
+
+
+def write_manifest(
+    output_dir: pathlib.Path,
+    environment: typing.Mapping[str, str],
+    run_import_jobs: bool,
+    steps: typing.Iterable[Step],
+) -> None:
+    """Record the environment of a run and the variables applied to its steps."""
+    manifest = {
+        "environment": dict(environment),
+        "run_import_jobs": run_import_jobs,
+        "steps": {
+            step.sql_file: {k: str(v) for k, v in step.variables.items()}
+            for step in steps
+        },
+    }
+    (output_dir / MANIFEST).write_text(json.dumps(manifest, indent=2))
+
+
+def read_manifest(output_dir: pathlib.Path) -> typing.Dict[str, typing.Any]:
+    """Read the manifest of a previous run."""
+    return json.loads((output_dir / MANIFEST).read_text())
+
+
+async def rescore(
+    sql_dir: os.PathLike,
+    manifest: typing.Mapping[str, typing.Any],
+    overrides: typing.Optional[typing.Mapping[str, typing.Mapping]] = None,
+    workers: typing.Optional[int] = None,
+    profiler: typing.Optional[profiling.SQLProfiler] = None,
+) -> typing.List[Step]:
+    """
+    Run again the connectivity steps whose variables changed since the run.
+
+    The connected census blocks cannot be recomputed this way, since they
+    depend on the reachable roads.
+
+    Returns the steps to record in the manifest.
+    """
+    steps = connectivity_steps(manifest["run_import_jobs"], overrides)
+    unknown = set(overrides or {}) - {step.name for step in steps}
+    if unknown:
+        raise ValueError(f"unknown steps: {', '.join(sorted(unknown))}")
+    stale = stale_steps(steps, manifest["steps"])
+    if any(step.name == "connected_census_blocks" for step in stale):
+        raise ValueError("the connected census blocks changed, a full run is needed")
+    logger.info(f"Rescoring {len(stale)}/{len(steps)} steps")
+    if stale:
+        workers = workers or multiprocessing.cpu_count()
+        async with database.create_pool(workers) as pool:
+            await execute_graph(pool, sql_dir, stale, workers, profiler)
+    return steps
@@ -0,0 +1,226 @@
+"""Functions related to the profiling of the SQL files."""
+import contextlib
+import csv
+import heapq
+import json
+import os
+import pathlib
+import time
+import typing
+from datetime import datetime
+
+import psycopg
+from loguru import logger
+
+# Counters of `pg_stat_statements` summed for the current database.
+STAT_COLUMNS = (
+    "calls",
+    "shared_blks_hit",
+    "shared_blks_read",
+    "shared_blks_dirtied",
+    "shared_blks_written",
+    "temp_blks_read",
+    "temp_blks_written",
+    "blk_read_time",
+    "blk_write_time",
+    "wal_bytes",
+)
+
+# Expressions of the counters renamed by PostgreSQL 17, which splits the block
+# IO times between the shared and the local blocks.
+STAT_EXPRESSIONS_17 = {
+    "blk_read_time": "shared_blk_read_time + local_blk_read_time",
+    "blk_write_time": "shared_blk_write_time + local_blk_write_time",
+}
+
+# Statements which can be wrapped into `EXPLAIN (ANALYZE, BUFFERS)`.
+EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+CSV_COLUMNS = (
+    "stage",
+    "sql_file",
+    "started_at",
+    "duration",
+    "statements",
+    "rows",
+    "error",
+) + STAT_COLUMNS
+
+
+class Plan(typing.NamedTuple):
+    """Represent the plan of an explained statement."""
+
+    duration: float
+    sql_file: str
+    statement: str
+    plan: typing.Any
+
+
+def is_explainable(statement: str) -> bool:
+    """
+    Return True if a statement can be explained.
+
+    Examples:
+        >>> assert is_explainable("-- comment\\nUPDATE t SET a = 1")
+        >>> assert not is_explainable("VACUUM ANALYZE t")
+    """
+    lines = [
+        line
+        for line in statement.splitlines()
+        if line.strip() and not line.strip().startswith("--")
+    ]
+    return bool(lines) and lines[0].lstrip().upper().startswith(EXPLAINABLE)
+
+
+def stat_query(server_version: int) -> str:
+    """
+    Return the query summing the `pg_stat_statements` counters.
+
+    Examples:
+        >>> assert "SUM(blk_read_time)" in stat_query(160000)
+        >>> assert "SUM(shared_blk_read_time + local" in stat_query(170000)
+    """
+    expressions = STAT_EXPRESSIONS_17 if server_version >= 170000 else {}
+    columns = ", ".join(
+        f"COALESCE(SUM({expressions.get(c, c)}), 0)::FLOAT" for c in STAT_COLUMNS
+    )
+    return f"""
+    SELECT  {columns}
+    FROM    pg_stat_statements
+    WHERE   dbid = (SELECT oid FROM pg_database WHERE datname = current_database());
+    """
+
+
+def plan_rows(plan: typing.Mapping) -> int:
+    """
+    Return the number of rows processed by an explained statement.
+
+    For the data modifying statements, the rows are counted from the node
+    feeding the modification.
+
+    Example:
+        >>> plan = {"Node Type": "ModifyTable", "Actual Rows": 0, "Actual Loops": 1,
+        >>>         "Plans": [{"Actual Rows": 3, "Actual Loops": 2}]}
+        >>> assert plan_rows(plan) == 6
+    """
+    if plan.get("Node Type") == "ModifyTable" and plan.get("Plans"):
+        plan = plan["Plans"][0]
+    return int(plan.get("Actual Rows", 0) * plan.get("Actual Loops", 1))
+
+
+class SQLProfiler:
+    """
+    Record the execution metrics of each SQL file.
+
+    For each file, the wall clock time, the number of rows affected and the
+    buffer/IO counters from `pg_stat_statements` are recorded. The counters
+    are database wide, therefore they also include the activity of the
+    statements running concurrently.
+
+    If `explain` is set, the statements are run with
+    `EXPLAIN (ANALYZE, BUFFERS)` and the plans of the `explain` slowest ones
+    are kept.
+    """
+
+    def __init__(self, explain: int = 0):
+        # Label of the stage being profiled, set by the caller.
+        self.stage = ""
+        self.explain = explain
+        self.records: typing.List[typing.Dict[str, typing.Any]] = []
+        self.plans: typing.List[Plan] = []
+        self.stat_statements: typing.Optional[bool] = None
+
+    async def snapshot(
+        self, conn: psycopg.AsyncConnection
+    ) -> typing.Optional[typing.Dict[str, float]]:
+        """
+        Return the `pg_stat_statements` counters, if available.
+
+        The counters are read in a savepoint when a transaction is in
+        progress, which an unavailable extension would abort otherwise.
+        """
+        if self.stat_statements is False:
+            return None
+        try:
+            async with conn.transaction():
+                cur = await conn.execute(stat_query(conn.info.server_version))
+                row = await cur.fetchone()
+        except psycopg.Error as e:
+            logger.warning(f"pg_stat_statements is not available: {e}")
+            self.stat_statements = False
+            return None
+        self.stat_statements = True
+        return dict(zip(STAT_COLUMNS, row))
+
+    @contextlib.asynccontextmanager
+    async def measure(self, conn: psycopg.AsyncConnection, sql_file: os.PathLike):
+        """
+        Measure the execution of a SQL file.
+
+        A failed file is recorded with its error. Its counters are not read,
+        since its transaction may be aborted.
+        """
+        record = {
+            "stage": self.stage,
+            "sql_file": str(sql_file),
+            "started_at": datetime.now().isoformat(),
+            "statements": 0,
+            "rows": 0,
+            "error": None,
+        }
+        before = await self.snapshot(conn)
+        start = time.time()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record["duration"] = time.time() - start
+            after = None if record["error"] else await self.snapshot(conn)
+            for column in STAT_COLUMNS:
+                record[column] = after[column] - before[column] if after else None
+            self.records.append(record)
+
+    async def execute(
+        self,
+        cur: psycopg.AsyncCursor,
+        record: typing.Dict[str, typing.Any],
+        statement: str,
+    ) -> None:
+        """Execute a statement, explaining it if requested."""
+        record["statements"] += 1
+        if not (self.explain and is_explainable(statement)):
+            await cur.execute(statement)
+            record["rows"] += max(cur.rowcount, 0)
+            return
+
+        start = time.time()
+        await cur.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}")
+        duration = time.time() - start
+        ((plan,),) = await cur.fetchall()
+        record["rows"] += plan_rows(plan[0]["Plan"])
+        self.plans = heapq.nlargest(
+            self.explain,
+            self.plans + [Plan(duration, record["sql_file"], statement, plan)],
+            key=lambda p: p.duration,
+        )
+
+    def save(self, output_dir: os.PathLike) -> None:
+        """
+        Save the records as CSV and JSON in the output directory.
+
+        Nothing is saved if no SQL file ran, which keeps the profile of a run
+        completed before resuming it.
+        """
+        if not self.records:
+            return
+        output_dir = pathlib.Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with (output_dir / "profile.csv").open("w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.records)
+        plans = [plan._asdict() for plan in self.plans]
+        with (output_dir / "profile.json").open("w") as f:
+            json.dump({"sql_files": self.records, "plans": plans}, f, indent=2)
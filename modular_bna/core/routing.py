@@ -0,0 +1,317 @@
+"""Functions related to the native routing engine."""
+import asyncio
+import contextlib
+import math
+import struct
+import time
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import numpy as np
+import psycopg
+from loguru import logger
+from psycopg_pool import AsyncConnectionPool
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+# Maximum number of cells of the distance matrix computed at once by a worker.
+# The matrix has one row per origin and one column per vertex.
+MAX_CHUNK_CELLS = 2**22
+
+# Number of chunks per worker, to balance the load between them.
+CHUNKS_PER_WORKER = 4
+
+# Binary COPY format.
+# https://www.postgresql.org/docs/current/sql-copy.html#id-1.9.3.55.9.4
+COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+COPY_TRAILER = struct.pack("!h", -1)
+# Field count and base road of a row.
+COPY_ROW_HEADER = struct.Struct("!hii")
+# Size of the field, dimensions, null flag, element type OID, length and lower
+# bound of a one dimension array.
+# https://github.com/postgres/postgres/blob/master/src/backend/utils/adt/arrayfuncs.c
+COPY_ARRAY_HEADER = struct.Struct("!iiiiii")
+INT4_OID = 23
+FLOAT8_OID = 701
+TARGET_ROAD = np.dtype([("size", ">i4"), ("value", ">i4")])
+TOTAL_COST = np.dtype([("size", ">i4"), ("value", ">f8")])
+
+# State of the worker processes, set by `init_worker`.
+_worker: typing.Dict[str, typing.Any] = {}
+
+
+class Network(typing.NamedTuple):
+    """Represent the road network, where each road is a vertex."""
+
+    # Sorted vertex IDs, and road of each vertex.
+    vert_ids: np.ndarray
+    vert_roads: np.ndarray
+    # Links, expressed as vertex positions.
+    sources: np.ndarray
+    targets: np.ndarray
+    costs: np.ndarray
+    stresses: np.ndarray
+
+    def graph(self, low_stress: bool = False) -> csr_matrix:
+        """Build the graph of the network, optionally keeping only low stress links."""
+        mask = self.stresses == 1 if low_stress else slice(None)
+        return build_graph(
+            self.sources[mask], self.targets[mask], self.costs[mask], len(self)
+        )
+
+    def __len__(self) -> int:
+        return len(self.vert_roads)
+
+
+def build_graph(
+    sources: np.ndarray, targets: np.ndarray, costs: np.ndarray, size: int
+) -> csr_matrix:
+    """
+    Build a directed graph as a CSR matrix.
+
+    Like pgRouting, only the cheapest of the parallel links is kept.
+
+    Example:
+        >>> g = build_graph(
+        ...     np.array([0, 0, 1]), np.array([1, 1, 0]), np.array([5, 3, 2]), 2
+        ... )
+        >>> assert g.toarray().tolist() == [[0, 3], [2, 0]]
+    """
+    order = np.lexsort((costs, targets, sources))
+    sources, targets, costs = sources[order], targets[order], costs[order]
+    first = np.ones(len(sources), dtype=bool)
+    first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+    return csr_matrix(
+        (costs[first].astype(np.float64), (sources[first], targets[first])),
+        shape=(size, size),
+    )
+
+
+def copy_rows(
+    base_roads: np.ndarray, target_roads: np.ndarray, total_costs: np.ndarray
+) -> bytes:
+    """
+    Encode reachable roads in the PostgreSQL binary COPY format.
+
+    Each base road becomes a single row, with its target roads sorted and their
+    costs. The header and the trailer are not included.
+
+    Example:
+        >>> data = copy_rows(np.array([1, 1]), np.array([3, 2]), np.array([4.0, 5.0]))
+        >>> assert len(data) == 2 + (4 + 4) + (4 + 20 + 2 * 8) + (4 + 20 + 2 * 12)
+        >>> assert copy_rows(np.array([]), np.array([]), np.array([])) == b""
+    """
+    if not len(base_roads):
+        return b""
+    order = np.lexsort((target_roads, base_roads))
+    base_roads = base_roads[order]
+    targets = np.empty(len(order), dtype=TARGET_ROAD)
+    targets["size"] = TARGET_ROAD["value"].itemsize
+    targets["value"] = target_roads[order]
+    costs = np.empty(len(order), dtype=TOTAL_COST)
+    costs["size"] = TOTAL_COST["value"].itemsize
+    costs["value"] = total_costs[order]
+    target_bytes, cost_bytes = targets.tobytes(), costs.tobytes()
+
+    # One row per base road.
+    bounds = np.flatnonzero(base_roads[1:] != base_roads[:-1]) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(order)]))
+    target_size, cost_size = TARGET_ROAD.itemsize, TOTAL_COST.itemsize
+    chunks = []
+    for start, end in zip(starts, ends):
+        count = end - start
+        chunks += [
+            COPY_ROW_HEADER.pack(3, 4, base_roads[start]),
+            COPY_ARRAY_HEADER.pack(20 + count * target_size, 1, 0, INT4_OID, count, 1),
+            target_bytes[start * target_size : end * target_size],
+            COPY_ARRAY_HEADER.pack(20 + count * cost_size, 1, 0, FLOAT8_OID, count, 1),
+            cost_bytes[start * cost_size : end * cost_size],
+        ]
+    return b"".join(chunks)
+
+
+def init_worker(
+    graphs: typing.Mapping[str, csr_matrix],
+    vert_roads: np.ndarray,
+    max_distance: int,
+    targets: typing.Optional[np.ndarray] = None,
+) -> None:
+    """Store the graphs in the worker process, to send them only once."""
+    _worker["graphs"] = graphs
+    _worker["vert_roads"] = vert_roads
+    _worker["max_distance"] = max_distance
+    _worker["targets"] = targets
+
+
+def route(origins: np.ndarray, origin_roads: np.ndarray) -> typing.Dict[str, bytes]:
+    """
+    Compute the roads reachable from each origin within the maximum distance.
+
+    This is the equivalent of `pgr_drivingDistance` for many origins at once,
+    over the graph of each stress level in turn. Only the target vertices are
+    kept, if the worker has some.
+    Returns, for each stress level, the rows ready to be copied into its
+    compact reachable roads table.
+    """
+    results = {}
+    for stress, graph in _worker["graphs"].items():
+        distances = dijkstra(
+            graph,
+            directed=True,
+            indices=origins,
+            limit=_worker["max_distance"],
+        )
+        reached = np.isfinite(distances)
+        if _worker["targets"] is not None:
+            reached &= _worker["targets"]
+        rows, cols = np.nonzero(reached)
+        results[stress] = copy_rows(
+            origin_roads[rows], _worker["vert_roads"][cols], distances[rows, cols]
+        )
+    return results
+
+
+async def fetch_network(conn: psycopg.AsyncConnection) -> Network:
+    """Load the network vertices and links."""
+    cur = await conn.execute(
+        "SELECT vert_id, road_id FROM neighborhood_ways_net_vert ORDER BY vert_id;"
+    )
+    verts = np.array(await cur.fetchall(), dtype=np.int64).reshape(-1, 2)
+    cur = await conn.execute(
+        """
+        SELECT  source_vert, target_vert, link_cost, COALESCE(link_stress, 0)
+        FROM    neighborhood_ways_net_link
+        WHERE   link_cost >= 0;
+        """
+    )
+    links = np.array(await cur.fetchall(), dtype=np.int64).reshape(-1, 4)
+    vert_ids = verts[:, 0]
+    return Network(
+        vert_ids=vert_ids,
+        vert_roads=verts[:, 1],
+        sources=np.searchsorted(vert_ids, links[:, 0]),
+        targets=np.searchsorted(vert_ids, links[:, 1]),
+        costs=links[:, 2],
+        stresses=links[:, 3],
+    )
+
+
+async def fetch_origins(
+    conn: psycopg.AsyncConnection, network: Network, prune_roads: bool = False
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the vertex positions and the roads to route from.
+
+    If `prune_roads` is set, only the origin routing roads are routed from.
+    """
+    cur = await conn.execute(
+        """
+        SELECT  v.vert_id, r.road_id
+        FROM    neighborhood_ways r,
+                neighborhood_ways_net_vert v
+        WHERE   r.road_id = v.road_id
+        AND     EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(b.geom, r.geom)
+                )
+        AND     (
+                    NOT %s
+                OR  r.road_id IN (
+                        SELECT road_id FROM neighborhood_routing_roads WHERE origin
+                    )
+                );
+        """,
+        (prune_roads,),
+    )
+    origins = np.array(await cur.fetchall(), dtype=np.int64).reshape(-1, 2)
+    return np.searchsorted(network.vert_ids, origins[:, 0]), origins[:, 1]
+
+
+async def fetch_targets(conn: psycopg.AsyncConnection, network: Network) -> np.ndarray:
+    """Return the mask of the vertices of the routing roads."""
+    cur = await conn.execute("SELECT road_id FROM neighborhood_routing_roads;")
+    roads = np.array(await cur.fetchall(), dtype=np.int64).reshape(-1)
+    return np.isin(network.vert_roads, roads)
+
+
+def chunk_size(vertex_count: int, origin_count: int, workers: int) -> int:
+    """
+    Compute the number of origins to route from at once.
+
+    The chunks are small enough to keep the distance matrix in memory, and
+    numerous enough to keep all the workers busy.
+
+    Examples:
+        >>> assert chunk_size(1_000, 1_000, 8) == 32
+        >>> assert chunk_size(10_000, 1_000_000, 8) == 419
+        >>> assert chunk_size(10_000_000, 1_000, 8) == 1
+    """
+    per_worker = math.ceil(origin_count / (workers * CHUNKS_PER_WORKER))
+    return max(1, min(MAX_CHUNK_CELLS // max(vertex_count, 1), per_worker))
+
+
+async def compute_reachable_roads(
+    pool: AsyncConnectionPool,
+    stresses: typing.Sequence[str],
+    network: Network,
+    origins: np.ndarray,
+    origin_roads: np.ndarray,
+    max_trip_distance: int,
+    workers: int,
+    targets: typing.Optional[np.ndarray] = None,
+) -> timedelta:
+    """
+    Compute the reachable roads of all the stress levels with the native engine.
+
+    The origins are split into chunks routed by a pool of processes, each chunk
+    over the graphs of all the stress levels at once. The results are streamed
+    into the compact reachable roads tables with a binary COPY per table, one
+    row per origin. The pool must provide a connection per stress level.
+
+    If a `targets` mask is given, only the vertices it selects are kept.
+    """
+    start = time.time()
+    graphs = {stress: network.graph(low_stress=stress == "low") for stress in stresses}
+    size = chunk_size(len(network), len(origins), workers)
+    loop = asyncio.get_running_loop()
+    executor = ProcessPoolExecutor(
+        workers,
+        initializer=init_worker,
+        initargs=(graphs, network.vert_roads, max_trip_distance, targets),
+    )
+    try:
+        futures = [
+            loop.run_in_executor(
+                executor, route, origins[i : i + size], origin_roads[i : i + size]
+            )
+            for i in range(0, len(origins), size)
+        ]
+        async with contextlib.AsyncExitStack() as stack:
+            copies = {}
+            for stress in stresses:
+                table = f"neighborhood_reachable_roads_{stress}_stress_compact"
+                conn = await stack.enter_async_context(pool.connection())
+                cur = await stack.enter_async_context(conn.cursor())
+                copies[stress] = await stack.enter_async_context(
+                    cur.copy(
+                        f"""
+                        COPY generated.{table}
+                            (base_road, target_roads, total_costs)
+                        FROM STDIN (FORMAT BINARY);
+                        """
+                    )
+                )
+                await copies[stress].write(COPY_HEADER)
+            for future in asyncio.as_completed(futures):
+                for stress, data in (await future).items():
+                    await copies[stress].write(data)
+            for copy in copies.values():
+                await copy.write(COPY_TRAILER)
+    finally:
+        executor.shutdown(cancel_futures=True)
+    elapsed = timedelta(seconds=time.time() - start)
+    logger.info(f"reachable_roads [native] wall clock time: {elapsed}")
+    return elapsed
@@ -0,0 +1,409 @@
+"""Functions related to the telemetry of the resources used by an analysis."""
+import html
+import json
+import os
+import pathlib
+import threading
+import time
+import typing
+from datetime import datetime
+
+import psycopg
+from loguru import logger
+
+from modular_bna.core import database
+
+# Names of the processes of the PostgreSQL server.
+POSTGRES_PROCESSES = ("postgres", "postmaster")
+
+# External tools run by the import scripts, by process name.
+TOOLS = ("osmconvert", "osm2pgrouting", "osm2pgsql")
+
+# Group of the analysis process and its children, e.g. the routing workers.
+ANALYSIS_GROUP = "modbna"
+
+# Counters of `pg_stat_database` recorded as rates.
+DATABASE_COUNTERS = ("blks_read", "blks_hit", "temp_files", "temp_bytes")
+DATABASE_QUERY = f"""
+SELECT  {", ".join(f"d.{c}::FLOAT" for c in DATABASE_COUNTERS)},
+        (
+            SELECT  COUNT(*)
+            FROM    pg_stat_activity a
+            WHERE   a.datid = d.datid
+            AND     a.state = 'active'
+            AND     a.pid != pg_backend_pid()
+        ) AS active,
+        (
+            SELECT  COUNT(*)
+            FROM    pg_stat_activity a
+            WHERE   a.datid = d.datid
+            AND     a.state = 'active'
+            AND     a.wait_event_type = 'IO'
+        ) AS waiting_io
+FROM    pg_stat_database d
+WHERE   d.datname = current_database();
+"""
+
+# Size of the temporary files in use, which requires the `pg_monitor` role.
+TEMP_DIR_QUERY = "SELECT COALESCE(SUM(size), 0)::FLOAT FROM pg_ls_tmpdir();"
+
+# Charts of the HTML report: the metric, its title and its scale.
+CHARTS = (
+    ("cpu", "CPU (cores)", 1),
+    ("rss", "Resident memory (MB)", 2**20),
+    ("read_bytes", "Disk reads (MB/s)", 2**20),
+    ("write_bytes", "Disk writes (MB/s)", 2**20),
+    ("temp_bytes", "Temporary files written (MB/s)", 2**20),
+    ("temp_dir_bytes", "Temporary files in use (MB)", 2**20),
+    ("active", "Active backends", 1),
+    ("waiting_io", "Backends waiting for IO", 1),
+)
+COLORS = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b")
+CHART_WIDTH = 960
+CHART_HEIGHT = 160
+CHART_MARGIN = 40
+
+
+class ProcessCounters(typing.NamedTuple):
+    """Represent the counters of a process."""
+
+    name: str
+    ppid: int
+    ticks: int
+    rss: int
+    read_bytes: int
+    write_bytes: int
+
+
+def parse_stat(stat: str) -> typing.Tuple[str, int, int, int]:
+    """
+    Parse the name, the parent, the CPU ticks and the resident pages of a process.
+
+    Example:
+        >>> stat = "42 (osm2pgsql) R 1 42 42 0 -1 0 0 0 0 0 150 50 0 0 20 0 1 0 9 9 300"
+        >>> parse_stat(stat)
+        ('osm2pgsql', 1, 200, 300)
+    """
+    # The name is between parentheses and may contain spaces.
+    name_end = stat.rindex(")")
+    name = stat[stat.index("(") + 1 : name_end]
+    fields = stat[name_end + 2 :].split()
+    return name, int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21])
+
+
+def read_processes(
+    proc: pathlib.Path = pathlib.Path("/proc"),
+) -> typing.Dict[int, ProcessCounters]:
+    """Read the counters of the running processes."""
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    processes = {}
+    for path in proc.iterdir():
+        if not path.name.isdigit():
+            continue
+        try:
+            name, ppid, ticks, pages = parse_stat((path / "stat").read_text())
+        except (OSError, ValueError, IndexError):
+            continue
+        io = {}
+        try:
+            for line in (path / "io").read_text().splitlines():
+                key, _, value = line.partition(":")
+                io[key] = int(value)
+        except (OSError, ValueError):
+            # The IO counters of the processes of other users are not readable.
+            pass
+        processes[int(path.name)] = ProcessCounters(
+            name,
+            ppid,
+            ticks,
+            pages * page_size,
+            io.get("read_bytes", 0),
+            io.get("write_bytes", 0),
+        )
+    return processes
+
+
+def process_group(
+    pid: int, processes: typing.Mapping[int, ProcessCounters], root: int
+) -> typing.Optional[str]:
+    """
+    Return the group of a process, or `None` if it is not recorded.
+
+    Example:
+        >>> p = ProcessCounters
+        >>> processes = {
+        >>>     1: p("init", 0, 0, 0, 0, 0),
+        >>>     10: p("python", 1, 0, 0, 0, 0),
+        >>>     11: p("python", 10, 0, 0, 0, 0),
+        >>>     12: p("osm2pgsql", 10, 0, 0, 0, 0),
+        >>>     20: p("postgres", 1, 0, 0, 0, 0),
+        >>> }
+        >>> assert [process_group(pid, processes, 10) for pid in processes] == [
+        >>>     None, "modbna", "modbna", "osm2pgsql", "postgres"]
+    """
+    name = processes[pid].name
+    if name in POSTGRES_PROCESSES:
+        return "postgres"
+    if name in TOOLS:
+        return name
+    while pid in processes:
+        if pid == root:
+            return ANALYSIS_GROUP
+        pid = processes[pid].ppid
+    return None
+
+
+class Telemetry:
+    """
+    Record a timeline of the resources used by an analysis.
+
+    A background thread samples every `interval` seconds the CPU, the
+    resident memory and the disk IO of the PostgreSQL processes, of the
+    external tools and of the analysis itself, read from `/proc`, as well as
+    the activity and the temporary files of the database. The processes are
+    recognized by name, therefore the other PostgreSQL servers of the machine
+    are recorded too.
+
+    The timeline is annotated with the stages of the analysis.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.started_at = ""
+        self.samples: typing.List[typing.Dict[str, typing.Any]] = []
+        self.stages: typing.List[typing.Dict[str, typing.Any]] = []
+        self.temp_dir: typing.Optional[bool] = None
+        self._start = 0.0
+        self._stop = threading.Event()
+        self._thread: typing.Optional[threading.Thread] = None
+        self._processes: typing.Dict[int, ProcessCounters] = {}
+        self._database: typing.Optional[typing.Tuple[float, typing.Dict]] = None
+        self._database_error = False
+        self._time = 0.0
+
+    def elapsed(self) -> float:
+        """Return the number of seconds since the start of the telemetry."""
+        return time.time() - self._start
+
+    def start(self) -> None:
+        """Start sampling in a background thread, unless the interval is 0."""
+        if not self.interval:
+            return
+        self.started_at = datetime.now().isoformat()
+        self._start = time.time()
+        self._thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling, and close the last stage."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self.stages and self.stages[-1]["end"] is None:
+            self.stages[-1]["end"] = self.elapsed()
+
+    def stage(self, name: str) -> None:
+        """Mark the beginning of a stage, which ends the previous one."""
+        now = self.elapsed()
+        if self.stages and self.stages[-1]["end"] is None:
+            self.stages[-1]["end"] = now
+        self.stages.append({"name": name, "start": now, "end": None})
+
+    def run(self) -> None:
+        """Sample until stopped."""
+        while True:
+            self.sample()
+            if self._stop.wait(self.interval):
+                break
+
+    def sample(self) -> None:
+        """
+        Record the resources used since the previous sample.
+
+        The first sample only sets the counters up.
+        """
+        now = time.time()
+        duration = now - self._time
+        processes = read_processes()
+        database_counters = self.read_database()
+        first = not self._time
+        self._time = now
+
+        groups: typing.Dict[str, typing.Dict[str, float]] = {}
+        tick_rate = os.sysconf("SC_CLK_TCK")
+        root = os.getpid()
+        for pid, counters in processes.items():
+            group = process_group(pid, processes, root)
+            if group is None:
+                continue
+            # A process which started after the previous sample counts from 0.
+            previous = self._processes.get(pid)
+            if previous is None or previous.name != counters.name:
+                previous = ProcessCounters(counters.name, 0, 0, 0, 0, 0)
+            metrics = groups.setdefault(
+                group, {"cpu": 0, "rss": 0, "read_bytes": 0, "write_bytes": 0}
+            )
+            metrics["cpu"] += (counters.ticks - previous.ticks) / tick_rate / duration
+            metrics["rss"] += counters.rss
+            for key in ("read_bytes", "write_bytes"):
+                delta = getattr(counters, key) - getattr(previous, key)
+                metrics[key] += max(delta, 0) / duration
+        self._processes = processes
+
+        sample: typing.Dict[str, typing.Any] = {"time": now - self._start}
+        if database_counters:
+            if self._database:
+                since, previous_counters = self._database
+                sample["database"] = {
+                    c: max(database_counters[c] - previous_counters[c], 0)
+                    / (now - since)
+                    for c in DATABASE_COUNTERS
+                } | {
+                    k: v
+                    for k, v in database_counters.items()
+                    if k not in DATABASE_COUNTERS
+                }
+            self._database = (now, database_counters)
+        if not first:
+            sample["processes"] = groups
+            self.samples.append(sample)
+
+    def read_database(self) -> typing.Optional[typing.Dict[str, float]]:
+        """
+        Read the activity of the database.
+
+        A connection is opened for each sample, for the telemetry to never
+        prevent the database from being dropped.
+        """
+        try:
+            with psycopg.connect(database.conninfo(), autocommit=True) as conn:
+                row = conn.execute(DATABASE_QUERY).fetchone()
+                if not row:
+                    return None
+                counters = dict(zip(DATABASE_COUNTERS + ("active", "waiting_io"), row))
+                if self.temp_dir is not False:
+                    try:
+                        cur = conn.execute(TEMP_DIR_QUERY)
+                        (counters["temp_dir_bytes"],) = cur.fetchone()
+                        self.temp_dir = True
+                    except psycopg.Error as e:
+                        logger.debug(
+                            f"The temporary files in use are not recorded: {e}"
+                        )
+                        self.temp_dir = False
+        except psycopg.Error as e:
+            if not self._database_error:
+                logger.warning(f"The database activity is not recorded: {e}")
+                self._database_error = True
+            return None
+        return counters
+
+    def series(self, metric: str) -> typing.Dict[str, typing.List[typing.Tuple]]:
+        """Return the points of a metric, by process group or for the database."""
+        series: typing.Dict[str, typing.List[typing.Tuple]] = {}
+        for sample in self.samples:
+            for group, metrics in sample.get("processes", {}).items():
+                if metric in metrics:
+                    series.setdefault(group, []).append(
+                        (sample["time"], metrics[metric])
+                    )
+            if metric in sample.get("database", {}):
+                series.setdefault("database", []).append(
+                    (sample["time"], sample["database"][metric])
+                )
+        return series
+
+    def save(self, output_dir: os.PathLike) -> None:
+        """
+        Save the timeline as JSON and as an HTML chart in the output directory.
+
+        Nothing is saved if no stage ran, which keeps the timeline of a run
+        completed before resuming it.
+        """
+        if not self.interval or not self.stages:
+            return
+        output_dir = pathlib.Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timeline = {
+            "started_at": self.started_at,
+            "interval": self.interval,
+            "stages": self.stages,
+            "samples": self.samples,
+        }
+        with (output_dir / "telemetry.json").open("w") as f:
+            json.dump(timeline, f, indent=2)
+
+        duration = max([s["time"] for s in self.samples] + [1])
+        charts = [
+            svg_chart(title, self.series(metric), scale, self.stages, duration)
+            for metric, title, scale in CHARTS
+        ]
+        started_at = html.escape(self.started_at)
+        (output_dir / "telemetry.html").write_text(
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            f"<title>Telemetry {started_at}</title>\n"
+            '</head>\n<body style="font-family: sans-serif">\n'
+            f"<h1>Telemetry of the analysis started at {started_at}</h1>\n"
+            + "\n".join(chart for chart in charts if chart)
+            + "\n</body>\n</html>\n"
+        )
+
+
+def svg_chart(
+    title: str,
+    series: typing.Mapping[str, typing.Sequence[typing.Tuple[float, float]]],
+    scale: float,
+    stages: typing.Sequence[typing.Mapping[str, typing.Any]],
+    duration: float,
+) -> str:
+    """
+    Draw the series of a metric as an SVG line chart, with the stage boundaries.
+
+    Returns an empty string if there is nothing to draw.
+
+    Example:
+        >>> svg = svg_chart("CPU", {"postgres": [(0, 1), (1, 2)]}, 1, [], 1)
+        >>> assert "<polyline" in svg and "postgres" in svg
+        >>> assert svg_chart("CPU", {}, 1, [], 1) == ""
+    """
+    if not series:
+        return ""
+    maximum = max(value / scale for points in series.values() for _, value in points)
+    maximum = maximum or 1
+    width = CHART_WIDTH - 2 * CHART_MARGIN
+    height = CHART_HEIGHT - 2 * CHART_MARGIN
+
+    def x(t: float) -> float:
+        return CHART_MARGIN + t / duration * width
+
+    def y(value: float) -> float:
+        return CHART_MARGIN + height - value / scale / maximum * height
+
+    elements = [
+        f'<text x="{CHART_MARGIN}" y="{CHART_MARGIN / 2}">{html.escape(title)}</text>',
+        f'<text x="{CHART_MARGIN - 4}" y="{CHART_MARGIN + 4}" text-anchor="end" '
+        f'font-size="10">{maximum:.3g}</text>',
+        f'<rect x="{CHART_MARGIN}" y="{CHART_MARGIN}" width="{width}" '
+        f'height="{height}" fill="none" stroke="#ccc"/>',
+    ]
+    for stage in stages:
+        elements.append(
+            f'<line x1="{x(stage["start"]):.1f}" y1="{CHART_MARGIN}" '
+            f'x2="{x(stage["start"]):.1f}" y2="{CHART_MARGIN + height}" '
+            'stroke="#999" stroke-dasharray="4"/>'
+            f'<text x="{x(stage["start"]) + 2:.1f}" y="{CHART_MARGIN + height + 12}" '
+            f'font-size="9">{html.escape(stage["name"])}</text>'
+        )
+    for i, (name, points) in enumerate(sorted(series.items())):
+        color = COLORS[i % len(COLORS)]
+        coordinates = " ".join(f"{x(t):.1f},{y(v):.1f}" for t, v in points)
+        elements.append(
+            f'<polyline points="{coordinates}" fill="none" stroke="{color}"/>'
+            f'<text x="{CHART_WIDTH - CHART_MARGIN + 4}" '
+            f'y="{CHART_MARGIN + 12 * (i + 1)}" '
+            f'font-size="10" fill="{color}">{html.escape(name)}</text>'
+        )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{CHART_WIDTH + 80}" '
+        f'height="{CHART_HEIGHT}">' + "".join(elements) + "</svg>"
+    )
@@ -0,0 +1,134 @@
+"""Functions related to the template database the analyses start from."""
+import hashlib
+import os
+import pathlib
+import subprocess
+import typing
+
+from loguru import logger
+from psycopg import sql
+
+from modular_bna.core import (
+    cache,
+    database,
+)
+
+# Names of the template databases, of the durable and of the ephemeral
+# databases.
+TEMPLATE_DATABASE = "bna_template"
+EPHEMERAL_TEMPLATE_DATABASE = "bna_template_ephemeral"
+
+# Files setting the template database up, relative to the root of the project.
+SETUP_SCRIPT = "scripts/01-better_setup_database.sh"
+SETUP_SCRIPT_FILES = ("sql/create_unlogged_tables_trigger.sql",)
+SETUP_FILES = (
+    "sql/speed_tables.sql",
+    "sql/create_us_water_blocks_table.sql",
+)
+
+# Environment variables read by the setup files.
+SETUP_VARIABLES = ("NB_EPHEMERAL",)
+
+
+def template_key(root: pathlib.Path, env: typing.Mapping[str, str]) -> str:
+    """Compute the key identifying the content of the template database."""
+    digest = hashlib.sha256()
+    for path in (SETUP_SCRIPT, *SETUP_SCRIPT_FILES, *SETUP_FILES):
+        cache.hash_file(digest, root / path)
+    for variable in SETUP_VARIABLES:
+        digest.update(f"{variable}={env.get(variable, '')}\n".encode())
+    return digest.hexdigest()
+
+
+async def template_version(name: str) -> typing.Optional[str]:
+    """Return the key of the template database, or `None` if there is none."""
+    async with await database.connect() as conn:
+        cur = await conn.execute(
+            "SELECT shobj_description(oid, 'pg_database') "
+            "FROM pg_database WHERE datname = %s;",
+            (name,),
+        )
+        row = await cur.fetchone()
+    return row[0] if row else None
+
+
+async def drop_template(name: str) -> None:
+    """Drop a template database."""
+    async with await database.connect() as conn:
+        identifier = sql.Identifier(name)
+        exists = await conn.execute(
+            "SELECT 1 FROM pg_database WHERE datname = %s;", (name,)
+        )
+        if not await exists.fetchone():
+            return
+        await conn.execute(
+            sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE false;").format(identifier)
+        )
+        await conn.execute(sql.SQL("DROP DATABASE {} WITH (FORCE);").format(identifier))
+
+
+async def build_template(
+    root: pathlib.Path,
+    ephemeral: bool = False,
+    name: typing.Optional[str] = None,
+    rebuild: bool = False,
+) -> str:
+    """
+    Build the template database, unless an up to date one already exists.
+
+    The template contains the extensions, the schemas and the static tables
+    created by the setup files. The analysis databases are created from it,
+    which spares them the setup. The template of `ephemeral` databases
+    creates unlogged tables, therefore it has its own name.
+
+    The template is checked and built under an advisory lock, so that the
+    concurrent runs wait for the one building it.
+
+    Returns the name of the template database.
+    """
+    name = name or (EPHEMERAL_TEMPLATE_DATABASE if ephemeral else TEMPLATE_DATABASE)
+    env = os.environ | {
+        "PGDATABASE": name,
+        "PFB_DEBUG": os.environ.get("PFB_DEBUG", "0"),
+        "NB_EPHEMERAL": "1" if ephemeral else "0",
+    }
+    key = template_key(root, env)
+    async with await database.connect() as lock:
+        await lock.execute("SELECT pg_advisory_lock(hashtext(%s));", (name,))
+        if not rebuild and await template_version(name) == key:
+            logger.debug(f"Reusing the template database {name}")
+            return name
+        await create_template(root, name, key, env)
+    return name
+
+
+async def create_template(
+    root: pathlib.Path, name: str, key: str, env: typing.Mapping[str, str]
+) -> None:
+    """Create the template database from scratch, and tag it with its key."""
+    logger.info(f"Building the template database {name}")
+    await drop_template(name)
+    identifier = sql.Identifier(name)
+    async with await database.connect() as conn:
+        await conn.execute(sql.SQL("CREATE DATABASE {};").format(identifier))
+
+    subprocess.run([str((root / SETUP_SCRIPT).absolute())], env=env, check=True)
+    for path in SETUP_FILES:
+        subprocess.run(
+            ["psql", "-v", "ON_ERROR_STOP=1", "-f", str(root / path)],
+            env=env,
+            check=True,
+        )
+
+    # Prevent the connections, since a database cannot be copied while in use.
+    async with await database.connect() as conn:
+        await conn.execute(
+            sql.SQL(
+                "ALTER DATABASE {} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false;"
+            ).format(identifier)
+        )
+        await conn.execute(
+            sql.SQL("COMMENT ON DATABASE {} IS {};").format(
+                identifier, sql.Literal(key)
+            )
+        )
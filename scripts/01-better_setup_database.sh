@@ -44,8 +44,15 @@ CREATE EXTENSION "uuid-ossp";
 CREATE EXTENSION "hstore";
 CREATE EXTENSION "plpython3u";
 CREATE EXTENSION "pgrouting";
+CREATE EXTENSION IF NOT EXISTS "pg_stat_statements";
 CREATE SCHEMA IF NOT EXISTS generated AUTHORIZATION ${PGUSER};
 CREATE SCHEMA IF NOT EXISTS received AUTHORIZATION ${PGUSER};
 CREATE SCHEMA IF NOT EXISTS scratch AUTHORIZATION ${PGUSER};
 ALTER USER ${PGUSER} SET search_path TO generated,received,scratch,"\$user",public;
 EOF
+
+# Create the tables of the ephemeral databases as UNLOGGED.
+if [ "${NB_EPHEMERAL:-0}" -eq "1" ]; then
+  GIT_ROOT=$(git rev-parse --show-toplevel)
+  psql <"${GIT_ROOT}/sql/create_unlogged_tables_trigger.sql"
+fi
@@ -26,11 +26,59 @@ function import_and_transform_shapefile() {
 echo "IMPORTING: Loading neighborhood boundary: ${NB_BOUNDARY_FILE}"
 import_and_transform_shapefile "${NB_BOUNDARY_FILE}" neighborhood_boundary "${NB_INPUT_SRID}"
 
-# Import block shapefile
+# Function to import the census blocks around the boundary, reprojected and filtered while
+# reading the shapefile, instead of loading the whole state and deleting most of it
+function import_census_blocks() {
+  IMPORT_FILE="${1}"
+  IMPORT_SRID="${2:-4326}"
+
+  echo "START: Importing neighborhood_census_blocks"
+  # Extent of the boundary+buffer, expressed in the SRID of the shapefile. The edges are
+  # densified before the transformation, so that the extent covers the whole buffer.
+  read -r XMIN YMIN XMAX YMAX <<<"$(
+    psql -t -A -F ' ' <<SQL
+SELECT  ST_XMin(extent.box),
+        ST_YMin(extent.box),
+        ST_XMax(extent.box),
+        ST_YMax(extent.box)
+FROM    (
+            SELECT  Box2D(
+                        ST_Transform(
+                            ST_Segmentize(
+                                ST_Expand(ST_Envelope(ST_Collect(geom)), ${NB_BOUNDARY_BUFFER}),
+                                ${NB_BOUNDARY_BUFFER} / 10.0
+                            ),
+                            ${IMPORT_SRID}
+                        )
+                    ) AS box
+            FROM    neighborhood_boundary
+        ) extent;
+SQL
+  )"
+  echo "Keeping the blocks intersecting ${XMIN} ${YMIN} ${XMAX} ${YMAX}"
+
+  # https://gdal.org/programs/ogr2ogr.html
+  ogr2ogr -f PostgreSQL -overwrite \
+    "PG:host=${PGHOST} dbname=${PGDATABASE} user=${PGUSER}" \
+    "${IMPORT_FILE}" \
+    -nln neighborhood_census_blocks \
+    -lco SCHEMA=generated \
+    -lco GEOMETRY_NAME=geom \
+    -lco FID=gid \
+    -nlt PROMOTE_TO_MULTI \
+    -dim XY \
+    -s_srs "EPSG:${IMPORT_SRID}" \
+    -t_srs "EPSG:${NB_OUTPUT_SRID}" \
+    -spat "${XMIN}" "${YMIN}" "${XMAX}" "${YMAX}" \
+    -gt 65536
+  echo "DONE: Importing neighborhood_census_blocks"
+}
+
+# Import the census blocks around the boundary
 echo "IMPORTING: Loading census blocks"
-import_and_transform_shapefile "${NB_TEMPDIR}/population.shp" neighborhood_census_blocks "${NB_INPUT_SRID}"
+import_census_blocks "${NB_TEMPDIR}/population.shp" "${NB_INPUT_SRID}"
 
-# Only keep blocks in boundary+buffer
+# Only keep blocks in boundary+buffer. The import only filtered them by extent.
 echo "IMPORTING: Applying boundary buffer"
 echo "START: Removing blocks outside buffer with size ${NB_BOUNDARY_BUFFER}"
 psql <<SQL
@@ -29,10 +29,31 @@ CREATE TABLE ${TABLE} (
 );
 SQL
 
-  # Load data.
-  psql -c "\copy ${TABLE} FROM '${JOB_FILEPATH}' DELIMITER ',' CSV HEADER;"
+  # Load the jobs of the census blocks of interest only. The work place block ids are
+  # padded to 15 characters, just in case the trailing zeros were lost, and the rows are
+  # filtered while streaming the file into the table.
+  awk -F ',' -v OFS=',' '
+    NR == FNR { blocks[$1]; next }
+    FNR == 1 { print; next }
+    {
+      gsub(/"/, "", $1)
+      $1 = substr($1 "000000000000000", 1, 15)
+      if ($1 in blocks) print
+    }
+  ' "${BLOCKS_FILEPATH}" "${JOB_FILEPATH}" |
+    psql -c "\copy ${TABLE} FROM STDIN DELIMITER ',' CSV HEADER;"
+  echo "Imported $(psql -t -A -c "SELECT COUNT(*) FROM ${TABLE};") ${DATA_TYPE} jobs rows"
 }
 
+# Export the ids of the census blocks of interest, after a header line ensuring the
+# file is never empty.
+BLOCKS_FILEPATH=$(mktemp "${NB_TEMPDIR}/blocks.XXXXXX")
+trap 'rm -f "${BLOCKS_FILEPATH}"' EXIT
+{
+  echo "blockid10"
+  psql -t -A -c "SELECT blockid10 FROM neighborhood_census_blocks;"
+} >"${BLOCKS_FILEPATH}"
+
 echo "Importing jobs data"
 import_job_data "main"
 import_job_data "aux"
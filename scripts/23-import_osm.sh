@@ -8,6 +8,7 @@ NB_OUTPUT_SRID="${NB_OUTPUT_SRID:-2163}"
 NB_MAX_TRIP_DISTANCE="${NB_MAX_TRIP_DISTANCE:-2680}"
 NB_BOUNDARY_BUFFER="${NB_BOUNDARY_BUFFER:-$NB_MAX_TRIP_DISTANCE}"
 PFB_RESIDENTIAL_SPEED_LIMIT="${PFB_RESIDENTIAL_SPEED_LIMIT:-}"
+NB_OSM_STREAMING_IMPORT="${NB_OSM_STREAMING_IMPORT:-1}" # clip in one streaming pass and run the importers concurrently
 NB_COUNTRY=$(echo "$NB_COUNTRY" | tr '[:lower:]' '[:upper:]')
 
 # Get the neighborhood_boundary bbox as extent of trimmed census blocks
@@ -17,38 +18,110 @@ echo "CLIPPING OSM TO: ${BBOX}"
 OSM_TEMPDIR="${NB_TEMPDIR:-$(mktemp -d)}/import_osm"
 mkdir -p "${OSM_TEMPDIR}"
 
-echo "IMPORTING Clipping provided OSM file"
 OSM_DATA_FILE="${OSM_TEMPDIR}/converted.osm"
-osmconvert "${1}" --drop-broken-refs -b="${BBOX}" -o="${OSM_DATA_FILE}"
-# If the OSM file contains "\" as a segment name, osm2pgrouting chokes on those segments and drops
-# everything that happens to be in the same processing chunk. So strip them out.
-sed 's/\\/backslash/' "$OSM_DATA_FILE" >"${OSM_DATA_FILE}-cleaned"
-mv "${OSM_DATA_FILE}-cleaned" "$OSM_DATA_FILE"
-
-# import the osm with highways
-echo "IMPORTING Importing OSM data"
-osm2pgrouting \
-  -f "$OSM_DATA_FILE" \
-  -h "$PGHOST" \
-  --dbname "${PGDATABASE}" \
-  --username "${PGUSER}" \
-  --password "${PGPASSWORD}" \
-  --schema received \
-  --prefix neighborhood_ \
-  --conf "${GIT_ROOT}/scripts/mapconfig_highway.xml" \
-  --clean
-
-# import the osm with cycleways that the above misses (bug in osm2pgrouting)
-osm2pgrouting \
-  -f "$OSM_DATA_FILE" \
-  -h "$PGHOST" \
-  --dbname "${PGDATABASE}" \
-  --username "${PGUSER}" \
-  --password "${PGPASSWORD}" \
-  --schema scratch \
-  --prefix neighborhood_cycwys_ \
-  --conf "${GIT_ROOT}/scripts/mapconfig_cycleway.xml" \
-  --clean
+
+# Report the size of a file.
+file_size() {
+  wc -c <"${1}" | tr -d '[:space:]'
+}
+
+# Import the highways, with osm2pgrouting.
+import_highways() {
+  osm2pgrouting \
+    -f "$OSM_DATA_FILE" \
+    -h "$PGHOST" \
+    --dbname "${PGDATABASE}" \
+    --username "${PGUSER}" \
+    --password "${PGPASSWORD}" \
+    --schema received \
+    --prefix neighborhood_ \
+    --conf "${GIT_ROOT}/scripts/mapconfig_highway.xml" \
+    --clean
+}
+
+# Import the cycleways that the above misses (bug in osm2pgrouting).
+import_cycleways() {
+  osm2pgrouting \
+    -f "$OSM_DATA_FILE" \
+    -h "$PGHOST" \
+    --dbname "${PGDATABASE}" \
+    --username "${PGUSER}" \
+    --password "${PGPASSWORD}" \
+    --schema scratch \
+    --prefix neighborhood_cycwys_ \
+    --conf "${GIT_ROOT}/scripts/mapconfig_cycleway.xml" \
+    --clean
+}
+
+# Import the full osm to fill out additional data needs not met by
+# osm2pgrouting.
+import_full_osm() {
+  osm2pgsql \
+    --create \
+    --prefix "neighborhood_osm_full" \
+    --proj "${NB_OUTPUT_SRID}" \
+    --style "${GIT_ROOT}/scripts/pfb.style" \
+    --number-processes "${CORES}" \
+    "${OSM_DATA_FILE}"
+}
+
+# Kill the importers running in the background, which run as children of the
+# subshells of their functions.
+kill_importers() {
+  for PID in $(jobs -p); do
+    pkill -P "${PID}" 2>/dev/null || true
+    kill "${PID}" 2>/dev/null || true
+  done
+}
+
+echo "IMPORTING Clipping provided OSM file"
+echo "IMPORTING Read $(file_size "${1}") bytes from ${1}"
+if [ "${NB_OSM_STREAMING_IMPORT}" -eq "1" ]; then
+  # Clip the OSM file, which can be XML or PBF, and sanitize it in a single
+  # streaming pass. If the OSM file contains "\" as a segment name,
+  # osm2pgrouting chokes on those segments and drops everything that happens
+  # to be in the same processing chunk. So strip them out.
+  osmconvert "${1}" --drop-broken-refs -b="${BBOX}" --out-osm |
+    sed 's/\\/backslash/' >"${OSM_DATA_FILE}"
+  echo "IMPORTING Wrote $(file_size "${OSM_DATA_FILE}") bytes to ${OSM_DATA_FILE}"
+
+  # The importers write to different tables, therefore they read the clipped
+  # file concurrently. All of them are waited for before failing, and they
+  # are killed if the script is interrupted, so that none of them keeps
+  # writing to the database once the import is reported as failed.
+  echo "IMPORTING Importing OSM data"
+  trap kill_importers EXIT
+  import_highways &
+  HIGHWAYS_PID=$!
+  import_cycleways &
+  CYCLEWAYS_PID=$!
+  import_full_osm &
+  FULL_OSM_PID=$!
+  IMPORT_STATUS=0
+  for PID in "${HIGHWAYS_PID}" "${CYCLEWAYS_PID}" "${FULL_OSM_PID}"; do
+    wait "${PID}" || IMPORT_STATUS=$?
+  done
+  trap - EXIT
+  if [ "${IMPORT_STATUS}" -ne 0 ]; then
+    echo "IMPORTING Failed to import the OSM data"
+    exit "${IMPORT_STATUS}"
+  fi
+  echo "IMPORTING Read $(file_size "${OSM_DATA_FILE}") bytes from ${OSM_DATA_FILE} 3 times, concurrently"
+else
+  osmconvert "${1}" --drop-broken-refs -b="${BBOX}" -o="${OSM_DATA_FILE}"
+  echo "IMPORTING Wrote $(file_size "${OSM_DATA_FILE}") bytes to ${OSM_DATA_FILE}"
+  # If the OSM file contains "\" as a segment name, osm2pgrouting chokes on those segments and drops
+  # everything that happens to be in the same processing chunk. So strip them out.
+  sed 's/\\/backslash/' "$OSM_DATA_FILE" >"${OSM_DATA_FILE}-cleaned"
+  mv "${OSM_DATA_FILE}-cleaned" "$OSM_DATA_FILE"
+  echo "IMPORTING Rewrote $(file_size "${OSM_DATA_FILE}") bytes to ${OSM_DATA_FILE}"
+
+  echo "IMPORTING Importing OSM data"
+  import_highways
+  import_cycleways
+  import_full_osm
+  echo "IMPORTING Read $(file_size "${OSM_DATA_FILE}") bytes from ${OSM_DATA_FILE} 3 times"
+fi
 
 # rename a few tables (or drop if not needed)
 echo 'Renaming tables'
@@ -56,18 +129,6 @@ psql -c "ALTER TABLE received.neighborhood_ways_vertices_pgr RENAME TO neighborh
 psql -c "ALTER TABLE received.neighborhood_ways_intersections RENAME CONSTRAINT neighborhood_ways_vertices_pgr_osm_id_key TO neighborhood_vertex_id;"
 psql -c "ALTER TABLE scratch.neighborhood_cycwys_ways_vertices_pgr RENAME CONSTRAINT neighborhood_cycwys_ways_vertices_pgr_osm_id_key TO neighborhood_vertex_id;"
 
-# import full osm to fill out additional data needs
-# not met by osm2pgrouting
-
-# import
-osm2pgsql \
-  --create \
-  --prefix "neighborhood_osm_full" \
-  --proj "${NB_OUTPUT_SRID}" \
-  --style "${GIT_ROOT}/scripts/pfb.style" \
-  --number-processes "${CORES}" \
-  "${OSM_DATA_FILE}"
-
 # Create speed tables.
 psql <"${GIT_ROOT}/sql/speed_tables.sql"
 
@@ -15,18 +15,11 @@ echo 'Clipping OSM source data to boundary + buffer'
 psql -v nb_boundary_buffer="${NB_BOUNDARY_BUFFER}" -f "${GIT_ROOT}"/sql/clip_osm.sql
 
 echo 'Removing paths that prohibit bicycles'
-psql -c "DELETE FROM neighborhood_osm_full_line WHERE bicycle='no' and highway='path';"
+psql -f "${GIT_ROOT}"/sql/features/remove_bicycle_prohibited_paths.sql
 
 echo 'Setting values on road segments'
-psql -f "${GIT_ROOT}"/sql/features/one_way.sql
-psql -f "${GIT_ROOT}"/sql/features/width_ft.sql
-psql -f "${GIT_ROOT}"/sql/features/functional_class.sql
+psql -f "${GIT_ROOT}"/sql/features/road_features.sql
 psql -v nb_output_srid="${NB_OUTPUT_SRID}" -f "${GIT_ROOT}"/sql/features/paths.sql
-psql -f "${GIT_ROOT}"/sql/features/speed_limit.sql
-psql -f "${GIT_ROOT}"/sql/features/lanes.sql
-psql -f "${GIT_ROOT}"/sql/features/park.sql
-psql -f "${GIT_ROOT}"/sql/features/bike_infra.sql
-psql -f "${GIT_ROOT}"/sql/features/class_adjustments.sql
 
 echo 'Setting values on intersections'
 psql -f "${GIT_ROOT}"/sql/features/legs.sql
@@ -0,0 +1,25 @@
+#!/bin/bash
+set -euo pipefail
+[ "${PFB_DEBUG}" -eq "1" ] && set -x
+
+GIT_ROOT=$(git rev-parse --show-toplevel)
+
+NB_OUTPUT_SRID="${NB_OUTPUT_SRID:-2163}"
+BLOCK_ROAD_BUFFER="${BLOCK_ROAD_BUFFER:-15}"         # buffer distance to find roads associated with a block
+BLOCK_ROAD_MIN_LENGTH="${BLOCK_ROAD_MIN_LENGTH:-30}" # minimum length road must overlap with block buffer to be associated
+NETWORK_LINK_GEOM="${NETWORK_LINK_GEOM:-false}"     # compute the geometry of the network links
+
+# Limit custom output formatting for `time` command
+export TIME="\nTIMING: %C\nTIMING:\t%E elapsed %Kkb mem\n"
+
+echo "BUILDING: Building network"
+time psql -v nb_output_srid="${NB_OUTPUT_SRID}" \
+  -v link_geom="${NETWORK_LINK_GEOM}" \
+  -f "${GIT_ROOT}"/sql/connectivity/build_network.sql
+
+time psql -v nb_output_srid="${NB_OUTPUT_SRID}" \
+  -v block_road_buffer="${BLOCK_ROAD_BUFFER}" \
+  -v block_road_min_length="${BLOCK_ROAD_MIN_LENGTH}" \
+  -f "${GIT_ROOT}"/sql/connectivity/census_blocks.sql
+
+time psql -f "${GIT_ROOT}"/sql/connectivity/routing_roads.sql
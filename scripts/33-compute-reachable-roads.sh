@@ -0,0 +1,30 @@
+#!/bin/bash
+set -euo pipefail
+[ "${PFB_DEBUG}" -eq "1" ] && set -x
+
+# Fallback for `modular_bna.core.connectivity`, which runs the shards
+# concurrently.
+
+GIT_ROOT=$(git rev-parse --show-toplevel)
+
+NB_MAX_TRIP_DISTANCE="${NB_MAX_TRIP_DISTANCE:-2680}"
+NB_THREAD_NUM="${NB_THREAD_NUM:-8}"
+ROUTING_PRUNE_ROADS="${ROUTING_PRUNE_ROADS:-true}" # route only between the roads of the blocks and paths
+
+# Limit custom output formatting for `time` command
+export TIME="\nTIMING: %C\nTIMING:\t%E elapsed %Kkb mem\n"
+
+for STRESS in high low; do
+  echo "CONNECTIVITY: Reachable roads ${STRESS} stress"
+  time psql -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_"${STRESS}"_stress_prep.sql
+
+  for ((THREAD_NO = 0; THREAD_NO < NB_THREAD_NUM; THREAD_NO++)); do
+    psql -v thread_num="${NB_THREAD_NUM}" \
+      -v thread_no="${THREAD_NO}" \
+      -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" \
+      -v prune_roads="${ROUTING_PRUNE_ROADS}" \
+      -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_"${STRESS}"_stress_calc.sql
+  done
+
+  time psql -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_"${STRESS}"_stress_cleanup.sql
+done
@@ -18,8 +18,6 @@ TOLERANCE_TRANSIT="${TOLERANCE_TRANSIT:-75}"            # cluster tolerance give
 TOLERANCE_UNIVERSITIES="${TOLERANCE_UNIVERSITIES:-150}" # cluster tolerance given in units of $NB_OUTPUT_SRID
 MIN_PATH_LENGTH="${MIN_PATH_LENGTH:-4800}"              # minimum path length to be considered for recreation access
 MIN_PATH_BBOX="${MIN_PATH_BBOX:-3300}"                  # minimum corner-to-corner span of path bounding box to be considered for recreation access
-BLOCK_ROAD_BUFFER="${BLOCK_ROAD_BUFFER:-15}"            # buffer distance to find roads associated with a block
-BLOCK_ROAD_MIN_LENGTH="${BLOCK_ROAD_MIN_LENGTH:-30}"    # minimum length road must overlap with block buffer to be associated
 SCORE_TOTAL="${SCORE_TOTAL:-100}"
 SCORE_PEOPLE="${SCORE_PEOPLE:-15}"
 SCORE_OPPORTUNITY="${SCORE_OPPORTUNITY:-20}"
@@ -31,43 +29,6 @@ SCORE_TRANSIT="${SCORE_TRANSIT:-15}"
 # Limit custom output formatting for `time` command
 export TIME="\nTIMING: %C\nTIMING:\t%E elapsed %Kkb mem\n"
 
-echo "BUILDING: Building network"
-time psql -v nb_output_srid="${NB_OUTPUT_SRID}" \
-  -f "${GIT_ROOT}"/sql/connectivity/build_network.sql
-
-time psql -v nb_output_srid="${NB_OUTPUT_SRID}" \
-  -v block_road_buffer="${BLOCK_ROAD_BUFFER}" \
-  -v block_road_min_length="${BLOCK_ROAD_MIN_LENGTH}" \
-  -f "${GIT_ROOT}"/sql/connectivity/census_blocks.sql
-
-echo "CONNECTIVITY: Reachable roads high stress"
-time psql -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_high_stress_prep.sql
-
-psql -v thread_num=8 -v thread_no=0 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_high_stress_calc.sql
-psql -v thread_num=8 -v thread_no=1 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_high_stress_calc.sql
-psql -v thread_num=8 -v thread_no=2 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_high_stress_calc.sql
-psql -v thread_num=8 -v thread_no=3 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_high_stress_calc.sql
-psql -v thread_num=8 -v thread_no=4 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_high_stress_calc.sql
-psql -v thread_num=8 -v thread_no=5 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_high_stress_calc.sql
-psql -v thread_num=8 -v thread_no=6 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_high_stress_calc.sql
-psql -v thread_num=8 -v thread_no=7 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_high_stress_calc.sql
-
-time psql -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_high_stress_cleanup.sql
-
-echo "CONNECTIVITY: Reachable roads low stress"
-time psql -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_low_stress_prep.sql
-
-psql -v thread_num=8 -v thread_no=0 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_low_stress_calc.sql
-psql -v thread_num=8 -v thread_no=1 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_low_stress_calc.sql
-psql -v thread_num=8 -v thread_no=2 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_low_stress_calc.sql
-psql -v thread_num=8 -v thread_no=3 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_low_stress_calc.sql
-psql -v thread_num=8 -v thread_no=4 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_low_stress_calc.sql
-psql -v thread_num=8 -v thread_no=5 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_low_stress_calc.sql
-psql -v thread_num=8 -v thread_no=6 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_low_stress_calc.sql
-psql -v thread_num=8 -v thread_no=7 -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_low_stress_calc.sql
-
-time psql -f "${GIT_ROOT}"/sql/connectivity/reachable_roads_low_stress_cleanup.sql
-
 echo "CONNECTIVITY: Connected census blocks"
 time psql -v nb_max_trip_distance="${NB_MAX_TRIP_DISTANCE}" \
   -v nb_output_srid="${NB_OUTPUT_SRID}" \
@@ -101,6 +62,8 @@ if [ "$RUN_IMPORT_JOBS" = "1" ]; then
 fi
 
 echo "METRICS: Destinations"
+time psql -f "${GIT_ROOT}"/sql/connectivity/destination_features.sql
+
 time psql -v nb_output_srid="${NB_OUTPUT_SRID}" \
   -v cluster_tolerance="${TOLERANCE_COLLEGES}" \
   -f "${GIT_ROOT}"/sql/connectivity/destinations/colleges.sql
@@ -150,72 +113,48 @@ time psql -v nb_output_srid="${NB_OUTPUT_SRID}" \
   -v cluster_tolerance="${TOLERANCE_UNIVERSITIES}" \
   -f "${GIT_ROOT}"/sql/connectivity/destinations/universities.sql
 
-echo "METRICS: Access: colleges"
-time psql -v first=0.7 \
-  -v second=0 \
-  -v third=0 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_colleges.sql
-
-time psql -v first=0.4 \
-  -v second=0.2 \
-  -v third=0.1 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_community_centers.sql
-
-time psql -v first=0.4 \
-  -v second=0.2 \
-  -v third=0.1 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_doctors.sql
-
-time psql -v first=0.4 \
-  -v second=0.2 \
-  -v third=0.1 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_dentists.sql
-
-time psql -v first=0.7 \
-  -v second=0 \
-  -v third=0 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_hospitals.sql
-
-time psql -v first=0.4 \
-  -v second=0.2 \
-  -v third=0.1 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_pharmacies.sql
-
-time psql -v first=0.3 \
-  -v second=0.2 \
-  -v third=0.2 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_parks.sql
-
-time psql -v first=0.4 \
-  -v second=0.2 \
-  -v third=0.1 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_retail.sql
-
-time psql -v first=0.3 \
-  -v second=0.2 \
-  -v third=0.2 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_schools.sql
-
-time psql -v first=0.7 \
-  -v second=0 \
-  -v third=0 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_social_services.sql
-
-time psql -v first=0.6 \
-  -v second=0.2 \
-  -v third=0 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_supermarkets.sql
+echo "METRICS: Access: destinations"
+time psql -v max_score=1 \
+  -v colleges_first=0.7 \
+  -v colleges_second=0 \
+  -v colleges_third=0 \
+  -v community_centers_first=0.4 \
+  -v community_centers_second=0.2 \
+  -v community_centers_third=0.1 \
+  -v doctors_first=0.4 \
+  -v doctors_second=0.2 \
+  -v doctors_third=0.1 \
+  -v dentists_first=0.4 \
+  -v dentists_second=0.2 \
+  -v dentists_third=0.1 \
+  -v hospitals_first=0.7 \
+  -v hospitals_second=0 \
+  -v hospitals_third=0 \
+  -v pharmacies_first=0.4 \
+  -v pharmacies_second=0.2 \
+  -v pharmacies_third=0.1 \
+  -v parks_first=0.3 \
+  -v parks_second=0.2 \
+  -v parks_third=0.2 \
+  -v retail_first=0.4 \
+  -v retail_second=0.2 \
+  -v retail_third=0.1 \
+  -v schools_first=0.3 \
+  -v schools_second=0.2 \
+  -v schools_third=0.2 \
+  -v social_services_first=0.7 \
+  -v social_services_second=0 \
+  -v social_services_third=0 \
+  -v supermarkets_first=0.6 \
+  -v supermarkets_second=0.2 \
+  -v supermarkets_third=0 \
+  -v transit_first=0.6 \
+  -v transit_second=0 \
+  -v transit_third=0 \
+  -v universities_first=0.7 \
+  -v universities_second=0 \
+  -v universities_third=0 \
+  -f "${GIT_ROOT}"/sql/connectivity/access_destinations.sql
 
 time psql -v first=0.7 \
   -v second=0.2 \
@@ -225,18 +164,6 @@ time psql -v first=0.7 \
   -v min_bbox_length="${MIN_PATH_BBOX}" \
   -f "${GIT_ROOT}"/sql/connectivity/access_trails.sql
 
-time psql -v first=0.6 \
-  -v second=0 \
-  -v third=0 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_transit.sql
-
-time psql -v first=0.7 \
-  -v second=0 \
-  -v third=0 \
-  -v max_score=1 \
-  -f "${GIT_ROOT}"/sql/connectivity/access_universities.sql
-
 time psql -v total="${SCORE_TOTAL}" \
   -v people="${SCORE_PEOPLE}" \
   -v opportunity="${SCORE_OPPORTUNITY}" \
@@ -0,0 +1,504 @@
+----------------------------------------
+-- Access to all the destination types, computed in a single pass over the
+-- connected census blocks.
+-- Input variables:
+--      :max_score - Maximum score value
+--      :<destination>_first - Value of first available destination (if 0 then ignore--a basic ratio is used for the score)
+--      :<destination>_second - Value of second available destination (if 0 then ignore--a basic ratio is used after 1)
+--      :<destination>_third - Value of third available destination (if 0 then ignore--a basic ratio is used after 2)
+----------------------------------------
+DROP TABLE IF EXISTS tmp_destination_blocks;
+DROP TABLE IF EXISTS tmp_destination_values;
+DROP TABLE IF EXISTS tmp_block_access;
+DROP TABLE IF EXISTS tmp_destination_sheds;
+
+-- destination -> block table, built once from the blockid10 arrays
+CREATE TEMP TABLE tmp_destination_blocks AS
+SELECT  'colleges'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_colleges
+UNION ALL
+SELECT  'community_centers'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_community_centers
+UNION ALL
+SELECT  'doctors'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_doctors
+UNION ALL
+SELECT  'dentists'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_dentists
+UNION ALL
+SELECT  'hospitals'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_hospitals
+UNION ALL
+SELECT  'pharmacies'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_pharmacies
+UNION ALL
+SELECT  'parks'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_parks
+UNION ALL
+SELECT  'retail'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_retail
+UNION ALL
+SELECT  'schools'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_schools
+UNION ALL
+SELECT  'social_services'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_social_services
+UNION ALL
+SELECT  'supermarkets'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_supermarkets
+UNION ALL
+SELECT  'transit'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_transit
+UNION ALL
+SELECT  'universities'::TEXT AS destination, id, unnest(blockid10) AS blockid10
+FROM    neighborhood_universities;
+
+CREATE INDEX tidx_destination_blocks ON tmp_destination_blocks (blockid10);
+ANALYZE tmp_destination_blocks;
+
+-- values of the first, second and third destinations of each type
+CREATE TEMP TABLE tmp_destination_values (destination, first, second, third) AS
+VALUES
+    ('colleges', :colleges_first, :colleges_second, :colleges_third),
+    ('community_centers', :community_centers_first, :community_centers_second, :community_centers_third),
+    ('doctors', :doctors_first, :doctors_second, :doctors_third),
+    ('dentists', :dentists_first, :dentists_second, :dentists_third),
+    ('hospitals', :hospitals_first, :hospitals_second, :hospitals_third),
+    ('pharmacies', :pharmacies_first, :pharmacies_second, :pharmacies_third),
+    ('parks', :parks_first, :parks_second, :parks_third),
+    ('retail', :retail_first, :retail_second, :retail_third),
+    ('schools', :schools_first, :schools_second, :schools_third),
+    ('social_services', :social_services_first, :social_services_second, :social_services_third),
+    ('supermarkets', :supermarkets_first, :supermarkets_second, :supermarkets_third),
+    ('transit', :transit_first, :transit_second, :transit_third),
+    ('universities', :universities_first, :universities_second, :universities_third);
+
+-- block-based raw numbers of every destination type in a single grouped scan
+-- of the connected census blocks, scored with the values of their type
+CREATE TEMP TABLE tmp_block_access AS
+SELECT  access.blockid10,
+        access.destination,
+        access.low_stress,
+        access.high_stress,
+        CASE
+        WHEN access.high_stress IS NULL THEN NULL
+        WHEN access.high_stress = 0 THEN NULL
+        WHEN access.low_stress = 0 THEN 0
+        WHEN access.high_stress = access.low_stress THEN :max_score
+        WHEN v.first = 0 THEN access.low_stress::FLOAT / access.high_stress
+        WHEN v.second = 0
+            THEN    v.first
+                    + ((:max_score - v.first) * (access.low_stress::FLOAT - 1))
+                    / (access.high_stress - 1)
+        WHEN v.third = 0
+            THEN    CASE
+                    WHEN access.low_stress = 1 THEN v.first
+                    WHEN access.low_stress = 2 THEN v.first + v.second
+                    ELSE v.first + v.second
+                            + ((:max_score - v.first - v.second) * (access.low_stress::FLOAT - 2))
+                            / (access.high_stress - 2)
+                    END
+        ELSE        CASE
+                    WHEN access.low_stress = 1 THEN v.first
+                    WHEN access.low_stress = 2 THEN v.first + v.second
+                    WHEN access.low_stress = 3 THEN v.first + v.second + v.third
+                    ELSE v.first + v.second + v.third
+                            + ((:max_score - v.first - v.second - v.third) * (access.low_stress::FLOAT - 3))
+                            / (access.high_stress - 3)
+                    END
+        END AS score
+FROM    (
+            SELECT      cb.source_blockid10 AS blockid10,
+                        d.destination,
+                        COUNT(DISTINCT d.id) FILTER (WHERE cb.low_stress) AS low_stress,
+                        COUNT(DISTINCT d.id) AS high_stress
+            FROM        neighborhood_connected_census_blocks cb
+            JOIN        tmp_destination_blocks d ON d.blockid10 = cb.target_blockid10
+            GROUP BY    cb.source_blockid10,
+                        d.destination
+        ) access
+JOIN    tmp_destination_values v ON v.destination = access.destination;
+
+-- set block-based raw numbers and scores, the blocks reaching no destination
+-- of a type have no score for it
+UPDATE  neighborhood_census_blocks
+SET     colleges_low_stress = access.colleges_low_stress,
+        colleges_high_stress = access.colleges_high_stress,
+        colleges_score = access.colleges_score,
+        community_centers_low_stress = access.community_centers_low_stress,
+        community_centers_high_stress = access.community_centers_high_stress,
+        community_centers_score = access.community_centers_score,
+        doctors_low_stress = access.doctors_low_stress,
+        doctors_high_stress = access.doctors_high_stress,
+        doctors_score = access.doctors_score,
+        dentists_low_stress = access.dentists_low_stress,
+        dentists_high_stress = access.dentists_high_stress,
+        dentists_score = access.dentists_score,
+        hospitals_low_stress = access.hospitals_low_stress,
+        hospitals_high_stress = access.hospitals_high_stress,
+        hospitals_score = access.hospitals_score,
+        pharmacies_low_stress = access.pharmacies_low_stress,
+        pharmacies_high_stress = access.pharmacies_high_stress,
+        pharmacies_score = access.pharmacies_score,
+        parks_low_stress = access.parks_low_stress,
+        parks_high_stress = access.parks_high_stress,
+        parks_score = access.parks_score,
+        retail_low_stress = access.retail_low_stress,
+        retail_high_stress = access.retail_high_stress,
+        retail_score = access.retail_score,
+        schools_low_stress = access.schools_low_stress,
+        schools_high_stress = access.schools_high_stress,
+        schools_score = access.schools_score,
+        social_services_low_stress = access.social_services_low_stress,
+        social_services_high_stress = access.social_services_high_stress,
+        social_services_score = access.social_services_score,
+        supermarkets_low_stress = access.supermarkets_low_stress,
+        supermarkets_high_stress = access.supermarkets_high_stress,
+        supermarkets_score = access.supermarkets_score,
+        transit_low_stress = access.transit_low_stress,
+        transit_high_stress = access.transit_high_stress,
+        transit_score = access.transit_score,
+        universities_low_stress = access.universities_low_stress,
+        universities_high_stress = access.universities_high_stress,
+        universities_score = access.universities_score
+FROM    (
+            SELECT      blocks.blockid10,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'colleges'),0) AS colleges_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'colleges'),0) AS colleges_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'colleges') AS colleges_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'community_centers'),0) AS community_centers_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'community_centers'),0) AS community_centers_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'community_centers') AS community_centers_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'doctors'),0) AS doctors_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'doctors'),0) AS doctors_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'doctors') AS doctors_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'dentists'),0) AS dentists_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'dentists'),0) AS dentists_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'dentists') AS dentists_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'hospitals'),0) AS hospitals_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'hospitals'),0) AS hospitals_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'hospitals') AS hospitals_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'pharmacies'),0) AS pharmacies_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'pharmacies'),0) AS pharmacies_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'pharmacies') AS pharmacies_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'parks'),0) AS parks_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'parks'),0) AS parks_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'parks') AS parks_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'retail'),0) AS retail_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'retail'),0) AS retail_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'retail') AS retail_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'schools'),0) AS schools_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'schools'),0) AS schools_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'schools') AS schools_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'social_services'),0) AS social_services_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'social_services'),0) AS social_services_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'social_services') AS social_services_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'supermarkets'),0) AS supermarkets_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'supermarkets'),0) AS supermarkets_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'supermarkets') AS supermarkets_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'transit'),0) AS transit_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'transit'),0) AS transit_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'transit') AS transit_score,
+                        COALESCE(MAX(a.low_stress) FILTER (WHERE a.destination = 'universities'),0) AS universities_low_stress,
+                        COALESCE(MAX(a.high_stress) FILTER (WHERE a.destination = 'universities'),0) AS universities_high_stress,
+                        MAX(a.score) FILTER (WHERE a.destination = 'universities') AS universities_score
+            FROM        (SELECT DISTINCT blockid10 FROM neighborhood_census_blocks) blocks
+            LEFT JOIN   tmp_block_access a ON a.blockid10 = blocks.blockid10
+            GROUP BY    blocks.blockid10
+        ) access
+WHERE   access.blockid10 = neighborhood_census_blocks.blockid10
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary AS b
+            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
+        );
+
+-- population shed of every destination, counting each connected block once
+CREATE TEMP TABLE tmp_destination_sheds AS
+SELECT      shed.destination,
+            shed.id,
+            SUM(shed.pop) AS pop_high_stress,
+            SUM(shed.pop) FILTER (WHERE shed.low_stress) AS pop_low_stress
+FROM        (
+                SELECT      d.destination,
+                            d.id,
+                            blocks.blockid10,
+                            MAX(blocks.pop10) AS pop,
+                            BOOL_OR(cb.low_stress) AS low_stress
+                FROM        tmp_destination_blocks d
+                JOIN        neighborhood_connected_census_blocks cb ON cb.target_blockid10 = d.blockid10
+                JOIN        neighborhood_census_blocks blocks ON blocks.blockid10 = cb.source_blockid10
+                GROUP BY    d.destination,
+                            d.id,
+                            blocks.blockid10
+            ) shed
+GROUP BY    shed.destination,
+            shed.id;
+
+CREATE UNIQUE INDEX tidx_destination_sheds ON tmp_destination_sheds (destination,id);
+ANALYZE tmp_destination_sheds;
+
+-- set population shed for each colleges destination in the neighborhood
+UPDATE  neighborhood_colleges
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_colleges dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'colleges' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_colleges.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_colleges.geom_pt,b.geom)
+        );
+
+-- set population shed for each community_centers destination in the neighborhood
+UPDATE  neighborhood_community_centers
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_community_centers dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'community_centers' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_community_centers.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_community_centers.geom_pt,b.geom)
+        );
+
+-- set population shed for each doctors destination in the neighborhood
+UPDATE  neighborhood_doctors
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_doctors dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'doctors' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_doctors.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_doctors.geom_pt,b.geom)
+        );
+
+-- set population shed for each dentists destination in the neighborhood
+UPDATE  neighborhood_dentists
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_dentists dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'dentists' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_dentists.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_dentists.geom_pt,b.geom)
+        );
+
+-- set population shed for each hospitals destination in the neighborhood
+UPDATE  neighborhood_hospitals
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_hospitals dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'hospitals' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_hospitals.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_hospitals.geom_pt,b.geom)
+        );
+
+-- set population shed for each pharmacies destination in the neighborhood
+UPDATE  neighborhood_pharmacies
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_pharmacies dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'pharmacies' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_pharmacies.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_pharmacies.geom_pt,b.geom)
+        );
+
+-- set population shed for each parks destination in the neighborhood
+UPDATE  neighborhood_parks
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_parks dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'parks' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_parks.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_parks.geom_pt,b.geom)
+        );
+
+-- set population shed for each retail destination in the neighborhood
+UPDATE  neighborhood_retail
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_retail dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'retail' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_retail.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_retail.geom_poly,b.geom)
+        );
+
+-- set population shed for each schools destination in the neighborhood
+UPDATE  neighborhood_schools
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_schools dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'schools' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_schools.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_schools.geom_pt,b.geom)
+        );
+
+-- set population shed for each social_services destination in the neighborhood
+UPDATE  neighborhood_social_services
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_social_services dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'social_services' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_social_services.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_social_services.geom_pt,b.geom)
+        );
+
+-- set population shed for each supermarkets destination in the neighborhood
+UPDATE  neighborhood_supermarkets
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_supermarkets dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'supermarkets' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_supermarkets.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_supermarkets.geom_pt,b.geom)
+        );
+
+-- set population shed for each transit destination in the neighborhood
+UPDATE  neighborhood_transit
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_transit dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'transit' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_transit.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_transit.geom_pt,b.geom)
+        );
+
+-- set population shed for each universities destination in the neighborhood
+UPDATE  neighborhood_universities
+SET     pop_high_stress = shed.pop_high_stress,
+        pop_low_stress = shed.pop_low_stress,
+        pop_score = CASE    WHEN shed.pop_high_stress IS NULL THEN NULL
+                            WHEN shed.pop_high_stress = 0 THEN 0
+                            ELSE shed.pop_low_stress::FLOAT / shed.pop_high_stress
+                            END
+FROM    (
+            SELECT      dest.id, s.pop_high_stress, s.pop_low_stress
+            FROM        neighborhood_universities dest
+            LEFT JOIN   tmp_destination_sheds s ON s.destination = 'universities' AND s.id = dest.id
+        ) shed
+WHERE   shed.id = neighborhood_universities.id
+AND     EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary as b
+            WHERE   ST_Intersects(neighborhood_universities.geom_pt,b.geom)
+        );
+
+DROP TABLE tmp_destination_blocks;
+DROP TABLE tmp_destination_values;
+DROP TABLE tmp_block_access;
+DROP TABLE tmp_destination_sheds;
@@ -1,11 +1,14 @@
 ----------------------------------------
 -- INPUTS
 -- location: neighborhood
--- :nb_output_srid psql var must be set before running this script,
---      e.g. psql -v nb_output_srid=2249 -f build_network.sql
+-- :nb_output_srid and :link_geom psql vars must be set before running this script,
+--      e.g. psql -v nb_output_srid=2249 -v link_geom=false -f build_network.sql
+-- the geometry of the links is only computed if :link_geom is true, since the
+-- routing does not need it
 ----------------------------------------
 DROP TABLE IF EXISTS received.neighborhood_ways_net_vert;
 DROP TABLE IF EXISTS received.neighborhood_ways_net_link;
+DROP TABLE IF EXISTS tmp_net_road_ints;
 
 -- create new tables
 CREATE TABLE received.neighborhood_ways_net_vert (
@@ -52,176 +55,134 @@ ANALYZE received.neighborhood_ways_net_vert;
 ---------------
 -- add links --
 ---------------
--- two-way to two-way
-INSERT INTO received.neighborhood_ways_net_link (int_id, source_vert, target_vert, geom)
-SELECT  ints.int_id,
-        vert1.vert_id,
-        vert2.vert_id,
-        ST_Makeline(vert1.geom,vert2.geom)
-FROM    received.neighborhood_ways_intersections ints,
-        received.neighborhood_ways_net_vert vert1,
-        received.neighborhood_ways roads1,
-        received.neighborhood_ways_net_vert vert2,
-        received.neighborhood_ways roads2
-WHERE   vert1.road_id = roads1.road_id
-AND     vert2.road_id = roads2.road_id
-AND     ints.int_id IN (roads1.intersection_from, roads1.intersection_to)
-AND     ints.int_id IN (roads2.intersection_from, roads2.intersection_to)
-AND     roads1.one_way IS NULL
-AND     roads2.one_way IS NULL
-AND     roads1.road_id != roads2.road_id;
-
--- two-way to from-to
-INSERT INTO received.neighborhood_ways_net_link (int_id, source_vert, target_vert, geom)
-SELECT  ints.int_id,
-        vert1.vert_id,
-        vert2.vert_id,
-        ST_Makeline(vert1.geom,vert2.geom)
-FROM    received.neighborhood_ways_intersections ints,
-        received.neighborhood_ways_net_vert vert1,
-        received.neighborhood_ways roads1,
-        received.neighborhood_ways_net_vert vert2,
-        received.neighborhood_ways roads2
-WHERE   vert1.road_id = roads1.road_id
-AND     vert2.road_id = roads2.road_id
-AND     ints.int_id IN (roads1.intersection_from, roads1.intersection_to)
-AND     ints.int_id = roads2.intersection_from
-AND     roads1.one_way IS NULL
-AND     roads2.one_way = 'ft'
-AND     roads1.road_id != roads2.road_id;
-
--- two-way to to-from
-INSERT INTO received.neighborhood_ways_net_link (int_id, source_vert, target_vert, geom)
-SELECT  ints.int_id,
-        vert1.vert_id,
-        vert2.vert_id,
-        ST_Makeline(vert1.geom,vert2.geom)
-FROM    received.neighborhood_ways_intersections ints,
-        received.neighborhood_ways_net_vert vert1,
-        received.neighborhood_ways roads1,
-        received.neighborhood_ways_net_vert vert2,
-        received.neighborhood_ways roads2
-WHERE   vert1.road_id = roads1.road_id
-AND     vert2.road_id = roads2.road_id
-AND     ints.int_id IN (roads1.intersection_from, roads1.intersection_to)
-AND     ints.int_id = roads2.intersection_to
-AND     roads1.one_way IS NULL
-AND     roads2.one_way = 'tf'
-AND     roads1.road_id != roads2.road_id;
-
--- from-to to two-way
-INSERT INTO received.neighborhood_ways_net_link (int_id, source_vert, target_vert, geom)
-SELECT  ints.int_id,
-        vert1.vert_id,
-        vert2.vert_id,
-        ST_Makeline(vert1.geom,vert2.geom)
-FROM    received.neighborhood_ways_intersections ints,
-        received.neighborhood_ways_net_vert vert1,
-        received.neighborhood_ways roads1,
-        received.neighborhood_ways_net_vert vert2,
-        received.neighborhood_ways roads2
-WHERE   vert1.road_id = roads1.road_id
-AND     vert2.road_id = roads2.road_id
-AND     ints.int_id = roads1.intersection_to
-AND     ints.int_id IN (roads2.intersection_from, roads2.intersection_to)
-AND     roads1.one_way = 'ft'
-AND     roads2.one_way IS NULL
-AND     roads1.road_id != roads2.road_id;
-
--- from-to to from-to
-INSERT INTO received.neighborhood_ways_net_link (int_id, source_vert, target_vert, geom)
-SELECT  ints.int_id,
-        vert1.vert_id,
-        vert2.vert_id,
-        ST_Makeline(vert1.geom,vert2.geom)
-FROM    received.neighborhood_ways_intersections ints,
-        received.neighborhood_ways_net_vert vert1,
-        received.neighborhood_ways roads1,
-        received.neighborhood_ways_net_vert vert2,
-        received.neighborhood_ways roads2
-WHERE   vert1.road_id = roads1.road_id
-AND     vert2.road_id = roads2.road_id
-AND     ints.int_id = roads1.intersection_to
-AND     ints.int_id = roads2.intersection_from
-AND     roads1.one_way = 'ft'
-AND     roads2.one_way = 'ft'
-AND     roads1.road_id != roads2.road_id;
-
--- from-to to to-from
-INSERT INTO received.neighborhood_ways_net_link (int_id, source_vert, target_vert, geom)
-SELECT  ints.int_id,
-        vert1.vert_id,
-        vert2.vert_id,
-        ST_Makeline(vert1.geom,vert2.geom)
-FROM    received.neighborhood_ways_intersections ints,
-        received.neighborhood_ways_net_vert vert1,
-        received.neighborhood_ways roads1,
-        received.neighborhood_ways_net_vert vert2,
-        received.neighborhood_ways roads2
-WHERE   vert1.road_id = roads1.road_id
-AND     vert2.road_id = roads2.road_id
-AND     ints.int_id = roads1.intersection_to
-AND     ints.int_id = roads2.intersection_to
-AND     roads1.one_way = 'ft'
-AND     roads2.one_way = 'tf'
-AND     roads1.road_id != roads2.road_id;
-
--- to-from to two-way
-INSERT INTO received.neighborhood_ways_net_link (int_id, source_vert, target_vert, geom)
-SELECT  ints.int_id,
-        vert1.vert_id,
-        vert2.vert_id,
-        ST_Makeline(vert1.geom,vert2.geom)
-FROM    received.neighborhood_ways_intersections ints,
-        received.neighborhood_ways_net_vert vert1,
-        received.neighborhood_ways roads1,
-        received.neighborhood_ways_net_vert vert2,
-        received.neighborhood_ways roads2
-WHERE   vert1.road_id = roads1.road_id
-AND     vert2.road_id = roads2.road_id
-AND     ints.int_id = roads1.intersection_from
-AND     ints.int_id IN (roads2.intersection_from, roads2.intersection_to)
-AND     roads1.one_way = 'tf'
-AND     roads2.one_way IS NULL
-AND     roads1.road_id != roads2.road_id;
-
--- to-from to to-from
-INSERT INTO received.neighborhood_ways_net_link (int_id, source_vert, target_vert, geom)
-SELECT  ints.int_id,
-        vert1.vert_id,
-        vert2.vert_id,
-        ST_Makeline(vert1.geom,vert2.geom)
-FROM    received.neighborhood_ways_intersections ints,
-        received.neighborhood_ways_net_vert vert1,
-        received.neighborhood_ways roads1,
-        received.neighborhood_ways_net_vert vert2,
-        received.neighborhood_ways roads2
-WHERE   vert1.road_id = roads1.road_id
-AND     vert2.road_id = roads2.road_id
-AND     ints.int_id = roads1.intersection_from
-AND     ints.int_id = roads2.intersection_to
-AND     roads1.one_way = 'tf'
-AND     roads2.one_way = 'tf'
-AND     roads1.road_id != roads2.road_id;
-
--- to-from to from-to
-INSERT INTO received.neighborhood_ways_net_link (int_id, source_vert, target_vert, geom)
-SELECT  ints.int_id,
-        vert1.vert_id,
-        vert2.vert_id,
-        ST_Makeline(vert1.geom,vert2.geom)
-FROM    received.neighborhood_ways_intersections ints,
-        received.neighborhood_ways_net_vert vert1,
-        received.neighborhood_ways roads1,
-        received.neighborhood_ways_net_vert vert2,
-        received.neighborhood_ways roads2
-WHERE   vert1.road_id = roads1.road_id
-AND     vert2.road_id = roads2.road_id
-AND     ints.int_id = roads1.intersection_from
-AND     ints.int_id = roads2.intersection_from
-AND     roads1.one_way = 'tf'
-AND     roads2.one_way = 'ft'
-AND     roads1.road_id != roads2.road_id;
+-- each road at each of its intersections, with the attributes of the links
+-- leaving or entering the road there. The direction is 'ft' at the
+-- intersection_to of the road, 'tf' otherwise.
+CREATE TEMP TABLE tmp_net_road_ints AS
+SELECT  ways.road_id,
+        vert.vert_id,
+        vert.geom AS vert_geom,
+        ints.int_id,
+        road_dir.dir,
+        -- the road can be left or entered at the intersection
+        CASE    WHEN ways.one_way IS NULL THEN TRUE
+                WHEN ways.one_way = 'ft' THEN ints.int_id = ways.intersection_to
+                WHEN ways.one_way = 'tf' THEN ints.int_id = ways.intersection_from
+                ELSE FALSE
+                END AS can_exit,
+        CASE    WHEN ways.one_way IS NULL THEN TRUE
+                WHEN ways.one_way = 'ft' THEN ints.int_id = ways.intersection_from
+                WHEN ways.one_way = 'tf' THEN ints.int_id = ways.intersection_to
+                ELSE FALSE
+                END AS can_enter,
+        CASE    WHEN road_dir.dir = 'tf'
+                THEN degrees(ST_Azimuth(points.mid,points.start_point))
+                ELSE degrees(ST_Azimuth(points.mid,points.end_point))
+                END::INTEGER AS exit_azi,
+        CASE    WHEN road_dir.dir = 'tf'
+                THEN degrees(ST_Azimuth(points.start_point,points.mid))
+                ELSE degrees(ST_Azimuth(points.end_point,points.mid))
+                END::INTEGER AS enter_azi,
+        ST_Length(ways.geom)::INTEGER AS road_length,
+        CASE road_dir.dir WHEN 'ft' THEN ways.ft_seg_stress ELSE ways.tf_seg_stress END AS exit_stress,
+        CASE road_dir.dir WHEN 'ft' THEN ways.ft_int_stress ELSE ways.tf_int_stress END AS int_stress,
+        CASE road_dir.dir WHEN 'ft' THEN ways.tf_seg_stress ELSE ways.ft_seg_stress END AS enter_stress
+FROM    received.neighborhood_ways ways
+JOIN    received.neighborhood_ways_net_vert vert
+        ON vert.road_id = ways.road_id
+CROSS JOIN LATERAL (
+            SELECT ways.intersection_from AS int_id
+            UNION
+            SELECT ways.intersection_to
+        ) road_ints
+JOIN    received.neighborhood_ways_intersections ints
+        ON ints.int_id = road_ints.int_id
+CROSS JOIN LATERAL (
+            SELECT  CASE    WHEN ints.int_id = ways.intersection_to THEN 'ft'
+                            ELSE 'tf'
+                            END AS dir
+        ) road_dir
+CROSS JOIN LATERAL (
+            SELECT  ST_LineInterpolatePoint(ways.geom,0.5) AS mid,
+                    ST_StartPoint(ways.geom) AS start_point,
+                    ST_EndPoint(ways.geom) AS end_point
+        ) points;
+
+CREATE INDEX tidx_net_road_ints ON tmp_net_road_ints (int_id);
+ANALYZE tmp_net_road_ints;
+
+-- links from every road that can be left at an intersection to every other
+-- road that can be entered there, with all their attributes at once. At each
+-- intersection, the rightmost turn from a road does not cross the traffic.
+INSERT INTO received.neighborhood_ways_net_link (
+    int_id, turn_angle, int_crossing, int_stress,
+    source_vert, source_road_id, source_road_dir, source_road_azi, source_road_length, source_stress,
+    target_vert, target_road_id, target_road_dir, target_road_azi, target_road_length, target_stress,
+    link_cost, link_stress, geom
+)
+SELECT  links.int_id,
+        links.turn_angle,
+        NOT links.right_turn,
+        link_int.int_stress,
+        links.source_vert,
+        links.source_road_id,
+        links.source_road_dir,
+        links.source_road_azi,
+        links.source_road_length,
+        links.source_stress,
+        links.target_vert,
+        links.target_road_id,
+        links.target_road_dir,
+        links.target_road_azi,
+        links.target_road_length,
+        links.target_stress,
+        (links.source_road_length + links.target_road_length) / 2,
+        GREATEST(links.source_stress,link_int.int_stress,links.target_stress),
+        links.geom
+FROM    (
+            SELECT  pairs.*,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY pairs.source_road_id, pairs.int_id
+                        ORDER BY    (sin(radians(pairs.turn_angle))>0)::INT DESC,
+                                    CASE    WHEN sin(radians(pairs.turn_angle))>0
+                                            THEN cos(radians(pairs.turn_angle))
+                                            ELSE -cos(radians(pairs.turn_angle))
+                                            END ASC
+                    ) = 1 AS right_turn
+            FROM    (
+                        SELECT  source.int_id,
+                                (target.enter_azi - source.exit_azi + 360) % 360 AS turn_angle,
+                                source.int_stress,
+                                source.vert_id AS source_vert,
+                                source.road_id AS source_road_id,
+                                source.dir AS source_road_dir,
+                                source.exit_azi AS source_road_azi,
+                                source.road_length AS source_road_length,
+                                source.exit_stress AS source_stress,
+                                target.vert_id AS target_vert,
+                                target.road_id AS target_road_id,
+                                target.dir AS target_road_dir,
+                                target.enter_azi AS target_road_azi,
+                                target.road_length AS target_road_length,
+                                target.enter_stress AS target_stress,
+                                CASE    WHEN :link_geom
+                                        THEN ST_Makeline(source.vert_geom,target.vert_geom)
+                                        END AS geom
+                        FROM    tmp_net_road_ints source
+                        JOIN    tmp_net_road_ints target
+                                ON  target.int_id = source.int_id
+                                AND target.road_id != source.road_id
+                        WHERE   source.can_exit
+                        AND     target.can_enter
+                    ) pairs
+        ) links
+CROSS JOIN LATERAL (
+            SELECT  CASE    WHEN links.right_turn THEN 1
+                            ELSE links.int_stress
+                            END AS int_stress
+        ) link_int;
+
+DROP TABLE tmp_net_road_ints;
 
 -- index
 CREATE INDEX idx_neighborhood_ways_net_vert_road_id ON received.neighborhood_ways_net_vert (road_id);
@@ -230,126 +191,3 @@ CREATE INDEX idx_neighborhood_ways_net_link_src_trgt ON received.neighborhood_wa
 CREATE INDEX idx_neighborhood_ways_net_link_src_rdid ON received.neighborhood_ways_net_link (source_road_id);
 CREATE INDEX idx_neighborhood_ways_net_link_tgt_rdid ON received.neighborhood_ways_net_link (target_road_id);
 ANALYZE received.neighborhood_ways_net_link;
-
---set source and target roads
-UPDATE  received.neighborhood_ways_net_link
-SET     source_road_id = s_vert.road_id,
-        target_road_id = t_vert.road_id
-FROM    received.neighborhood_ways_net_vert s_vert,
-        received.neighborhood_ways_net_vert t_vert
-WHERE   received.neighborhood_ways_net_link.source_vert = s_vert.vert_id
-AND     received.neighborhood_ways_net_link.target_vert = t_vert.vert_id;
-
---source_road_dir
-UPDATE  received.neighborhood_ways_net_link
-SET     source_road_dir = CASE  WHEN received.neighborhood_ways_net_link.int_id = road.intersection_to
-                                    THEN 'ft'
-                                ELSE 'tf'
-                                END
-FROM    received.neighborhood_ways road
-WHERE   received.neighborhood_ways_net_link.source_road_id = road.road_id;
-
---target_road_dir
-UPDATE  received.neighborhood_ways_net_link
-SET     target_road_dir = CASE  WHEN received.neighborhood_ways_net_link.int_id = road.intersection_to
-                                    THEN 'ft'
-                                ELSE 'tf'
-                                END
-FROM    received.neighborhood_ways road
-WHERE   received.neighborhood_ways_net_link.target_road_id = road.road_id;
-
---set azimuths and turn angles
-UPDATE  received.neighborhood_ways_net_link
-SET     source_road_azi = CASE  WHEN source_road_dir = 'tf'
-                                THEN degrees(ST_Azimuth(ST_LineInterpolatePoint(roads1.geom,0.5),ST_StartPoint(roads1.geom)))
-                                ELSE degrees(ST_Azimuth(ST_LineInterpolatePoint(roads1.geom,0.5),ST_EndPoint(roads1.geom)))
-                                END,
-        target_road_azi = CASE  WHEN target_road_dir = 'tf'
-                                THEN degrees(ST_Azimuth(ST_StartPoint(roads2.geom),ST_LineInterpolatePoint(roads2.geom,0.5)))
-                                ELSE degrees(ST_Azimuth(ST_EndPoint(roads2.geom),ST_LineInterpolatePoint(roads2.geom,0.5)))
-                                END
-FROM    received.neighborhood_ways roads1,
-        received.neighborhood_ways roads2
-WHERE   source_road_id = roads1.road_id
-AND     target_road_id = roads2.road_id;
-
-UPDATE received.neighborhood_ways_net_link
-SET     turn_angle = (target_road_azi - source_road_azi + 360) % 360;
-
--------------------
--- set turn info --
--------------------
--- assume crossing is true unless proven otherwise
-UPDATE received.neighborhood_ways_net_link SET int_crossing = TRUE;
-
--- set right turns
-UPDATE  received.neighborhood_ways_net_link
-SET     int_crossing = FALSE
-WHERE   link_id = (
-            SELECT      r.link_id
-            FROM        received.neighborhood_ways_net_link r
-            WHERE       received.neighborhood_ways_net_link.source_road_id = r.source_road_id
-            AND         received.neighborhood_ways_net_link.int_id = r.int_id
-            ORDER BY    (sin(radians(r.turn_angle))>0)::INT DESC,
-                        CASE    WHEN sin(radians(r.turn_angle))>0
-                                THEN cos(radians(r.turn_angle))
-                                ELSE -cos(radians(r.turn_angle))
-                                END ASC
-            LIMIT       1
-);
-
---set lengths
-UPDATE  received.neighborhood_ways_net_link
-SET     source_road_length = ST_Length(roads1.geom),
-        target_road_length = ST_Length(roads2.geom)
-FROM    received.neighborhood_ways roads1,
-        received.neighborhood_ways roads2
-WHERE   source_road_id = roads1.road_id
-AND     target_road_id = roads2.road_id;
-
----------------------
--- set link stress --
----------------------
---source_stress
-UPDATE  received.neighborhood_ways_net_link
-SET     source_stress = CASE WHEN received.neighborhood_ways_net_link.int_id = road.intersection_to THEN road.ft_seg_stress
-                        ELSE road.tf_seg_stress
-                        END
-FROM    received.neighborhood_ways road
-WHERE   received.neighborhood_ways_net_link.source_road_id = road.road_id;
-
---int_stress
-UPDATE  received.neighborhood_ways_net_link
-SET     int_stress = roads.ft_int_stress
-FROM    received.neighborhood_ways roads
-WHERE   received.neighborhood_ways_net_link.source_road_id = roads.road_id
-AND     source_road_dir = 'ft';
-
-UPDATE  received.neighborhood_ways_net_link
-SET     int_stress = roads.tf_int_stress
-FROM    received.neighborhood_ways roads
-WHERE   received.neighborhood_ways_net_link.source_road_id = roads.road_id
-AND     source_road_dir = 'tf';
-
-UPDATE  received.neighborhood_ways_net_link
-SET     int_stress = 1
-WHERE   NOT int_crossing;;
-
---target_stress
-UPDATE  received.neighborhood_ways_net_link
-SET     target_stress = CASE    WHEN received.neighborhood_ways_net_link.int_id = road.intersection_to
-                                    THEN road.tf_seg_stress
-                                ELSE road.ft_seg_stress
-                                END
-FROM    received.neighborhood_ways road
-WHERE   received.neighborhood_ways_net_link.target_road_id = road.road_id;
-
---link_stress
-UPDATE  received.neighborhood_ways_net_link
-SET     link_stress = GREATEST(source_stress,int_stress,target_stress);
-
---------------
--- set cost --
---------------
-UPDATE  received.neighborhood_ways_net_link
-SET     link_cost = ROUND((source_road_length + target_road_length) / 2);
@@ -11,17 +11,8 @@
 --     as per http://lehd.ces.census.gov/data/lodes/LODES7/LODESTechDoc7.2.pdf
 ----------------------------------------
 
--- process imported tables
-ALTER TABLE "state_od_aux_jt00" ALTER COLUMN w_geocode TYPE VARCHAR(15);
-UPDATE "state_od_aux_jt00" SET w_geocode = rpad(w_geocode,15,'0'); --just in case we lost any trailing zeros
-ALTER TABLE "state_od_main_jt00" ALTER COLUMN w_geocode TYPE VARCHAR(15);
-UPDATE "state_od_main_jt00" SET w_geocode = rpad(w_geocode,15,'0'); --just in case we lost any trailing zeros
-
--- indexes
-CREATE INDEX IF NOT EXISTS tidx_auxjtw ON "state_od_aux_jt00" (w_geocode);
-CREATE INDEX IF NOT EXISTS tidx_mainjtw ON "state_od_main_jt00" (w_geocode);
-ANALYZE "state_od_aux_jt00" (w_geocode);
-ANALYZE "state_od_main_jt00" (w_geocode);
+-- the imported tables only hold the jobs of the blocks of interest, with
+-- their w_geocode already padded to 15 characters
 
 -- create combined table
 DROP TABLE IF EXISTS generated.neighborhood_census_block_jobs;
@@ -32,26 +23,25 @@ CREATE TABLE generated.neighborhood_census_block_jobs (
 );
 
 -- add blocks of interest
-INSERT INTO generated.neighborhood_census_block_jobs (blockid10)
-SELECT  blocks.blockid10
+INSERT INTO generated.neighborhood_census_block_jobs (blockid10, jobs)
+SELECT  blocks.blockid10,
+        0
 FROM    neighborhood_census_blocks blocks;
 
--- add main data
-UPDATE  generated.neighborhood_census_block_jobs
-SET     jobs = COALESCE((
-            SELECT  SUM(j."s000")
-            FROM    "state_od_main_jt00" j
-            WHERE   j.w_geocode = neighborhood_census_block_jobs.blockid10
-        ),0);
-
--- add aux data
+-- add main and aux data, in a single aggregation
 UPDATE  generated.neighborhood_census_block_jobs
-SET     jobs =  jobs +
-                COALESCE((
-                    SELECT  SUM(j."s000")
-                    FROM    "state_od_aux_jt00" j
-                    WHERE   j.w_geocode = neighborhood_census_block_jobs.blockid10
-        ),0);
+SET     jobs = COALESCE(j.jobs,0)
+FROM    (
+            SELECT  all_jobs.w_geocode,
+                    SUM(all_jobs."s000") AS jobs
+            FROM    (
+                        SELECT w_geocode, "s000" FROM "state_od_main_jt00"
+                        UNION ALL
+                        SELECT w_geocode, "s000" FROM "state_od_aux_jt00"
+                    ) all_jobs
+            GROUP BY all_jobs.w_geocode
+        ) j
+WHERE   j.w_geocode = neighborhood_census_block_jobs.blockid10;
 
 -- indexes
 CREATE INDEX IF NOT EXISTS idx_neighborhood_blkjobs ON neighborhood_census_block_jobs (blockid10);
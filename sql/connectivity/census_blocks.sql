@@ -120,28 +120,42 @@ ANALYZE neighborhood_census_blocks;
 ------------------------------
 -- add road_ids
 ------------------------------
-ALTER TABLE neighborhood_census_blocks DROP COLUMN IF EXISTS tmp_geom_buffer;
-ALTER TABLE neighborhood_census_blocks ADD COLUMN tmp_geom_buffer geometry(multipolygon, :nb_output_srid);
+DROP TABLE IF EXISTS tmp_block_roads;
+CREATE INDEX IF NOT EXISTS idx_neighborhood_ways_geom ON neighborhood_ways USING GIST (geom);
+ANALYZE neighborhood_ways;
 
-UPDATE  neighborhood_census_blocks
-SET     tmp_geom_buffer = ST_Multi(ST_Buffer(geom,:block_road_buffer));
-CREATE INDEX tsidx_neighborhood_cblockbuffgeoms ON neighborhood_census_blocks USING GIST (tmp_geom_buffer);
-ANALYZE neighborhood_census_blocks (tmp_geom_buffer);
+-- roads associated with each block, found in a single join of the blocks
+-- and the ways (the ways within the buffer distance of a block being the
+-- only candidates) so that it can be run in parallel
+CREATE TEMP TABLE tmp_block_roads AS
+SELECT  blocks.gid,
+        array_agg(ways.road_id ORDER BY ways.road_id) AS road_ids
+FROM    neighborhood_census_blocks blocks
+CROSS JOIN LATERAL (
+            SELECT  ST_Multi(ST_Buffer(blocks.geom,:block_road_buffer)) AS geom
+        ) buffers
+JOIN    neighborhood_ways ways
+    ON  ST_DWithin(blocks.geom,ways.geom,:block_road_buffer)
+WHERE   ST_Intersects(buffers.geom,ways.geom)
+AND     (
+            ST_Contains(buffers.geom,ways.geom)
+        OR  ST_Length(
+                ST_Intersection(buffers.geom,ways.geom)
+            ) > :block_road_min_length
+        )
+GROUP BY blocks.gid;
+CREATE INDEX tidx_tmp_block_roads_gid ON tmp_block_roads (gid);
+ANALYZE tmp_block_roads;
 
+-- write the road_ids of all the blocks at once
 UPDATE  neighborhood_census_blocks
-SET     road_ids = array((
-            SELECT  ways.road_id
-            FROM    neighborhood_ways ways
-            WHERE   ST_Intersects(neighborhood_census_blocks.tmp_geom_buffer,ways.geom)
-            AND     (
-                        ST_Contains(neighborhood_census_blocks.tmp_geom_buffer,ways.geom)
-                    OR  ST_Length(
-                            ST_Intersection(neighborhood_census_blocks.tmp_geom_buffer,ways.geom)
-                        ) > :block_road_min_length
-                    )
-        ));
+SET     road_ids = COALESCE(tmp_block_roads.road_ids,'{}')
+FROM    neighborhood_census_blocks blocks
+LEFT JOIN tmp_block_roads
+    ON  tmp_block_roads.gid = blocks.gid
+WHERE   neighborhood_census_blocks.gid = blocks.gid;
 
-ALTER TABLE neighborhood_census_blocks DROP COLUMN IF EXISTS tmp_geom_buffer;
+DROP TABLE tmp_block_roads;
 
 -- index
 CREATE INDEX aidx_neighborhood_census_blocks_road_ids ON neighborhood_census_blocks USING GIN (road_ids);
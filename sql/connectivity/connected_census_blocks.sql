@@ -5,6 +5,9 @@
 --      e.g. psql -v nb_max_trip_distance=2680 -v nb_output_srid=2163 -f connected_census_blocks.sql
 ----------------------------------------
 DROP TABLE IF EXISTS generated.neighborhood_connected_census_blocks;
+DROP TABLE IF EXISTS tmp_source_road_blocks;
+DROP TABLE IF EXISTS tmp_target_road_blocks;
+DROP TABLE IF EXISTS tmp_block_costs;
 
 CREATE TABLE generated.neighborhood_connected_census_blocks (
     id SERIAL PRIMARY KEY,
@@ -16,49 +19,77 @@ CREATE TABLE generated.neighborhood_connected_census_blocks (
     high_stress_cost INT
 );
 
+-- road -> block inverted indexes, built once from the road_ids arrays
+CREATE TEMP TABLE tmp_source_road_blocks AS
+SELECT  blocks.blockid10,
+        unnest(blocks.road_ids) AS road_id
+FROM    neighborhood_census_blocks blocks,
+        neighborhood_boundary
+WHERE   ST_Intersects(blocks.geom,neighborhood_boundary.geom);
+
+CREATE TEMP TABLE tmp_target_road_blocks AS
+SELECT  blocks.blockid10,
+        unnest(blocks.road_ids) AS road_id
+FROM    neighborhood_census_blocks blocks;
+
+ANALYZE tmp_source_road_blocks;
+ANALYZE tmp_target_road_blocks;
+
+-- cheapest cost between each pair of blocks, in a single grouped scan of the
+-- reachable roads
+CREATE TEMP TABLE tmp_block_costs AS
+SELECT      source.blockid10 AS source_blockid10,
+            target.blockid10 AS target_blockid10,
+            MIN(ls.total_cost) AS total_cost
+FROM        neighborhood_reachable_roads_low_stress ls
+JOIN        tmp_source_road_blocks source ON source.road_id = ls.base_road
+JOIN        tmp_target_road_blocks target ON target.road_id = ls.target_road
+GROUP BY    source.blockid10,
+            target.blockid10;
+
+CREATE UNIQUE INDEX tidx_block_costs ON tmp_block_costs (source_blockid10,target_blockid10);
+ANALYZE tmp_block_costs;
+
+-- Both costs are read from the low stress reachable roads, like the previous
+-- correlated subqueries were.
 INSERT INTO generated.neighborhood_connected_census_blocks (
     source_blockid10, target_blockid10,
     low_stress, low_stress_cost, high_stress, high_stress_cost
 )
-SELECT  source.blockid10,
-        target.blockid10,
-        FALSE,
-        (
-            SELECT  MIN(ls.total_cost)
-            FROM    neighborhood_reachable_roads_low_stress ls
-            WHERE   ls.base_road = ANY(source.road_ids)
-            AND     ls.target_road = ANY(target.road_ids)
+SELECT  pairs.source_blockid10,
+        pairs.target_blockid10,
+        COALESCE(
+            pairs.shared_road
+            OR  (
+                    pairs.low_stress_cost IS NOT NULL
+                AND CASE    WHEN COALESCE(pairs.high_stress_cost,0) = 0 THEN TRUE
+                            ELSE pairs.low_stress_cost::FLOAT / pairs.high_stress_cost <= 1.25
+                            END
+                ),
+            FALSE
         ),
+        pairs.low_stress_cost,
         TRUE,
-        (
-            SELECT  MIN(hs.total_cost)
-            FROM    neighborhood_reachable_roads_low_stress hs
-            WHERE   hs.base_road = ANY(source.road_ids)
-            AND     hs.target_road = ANY(target.road_ids)
-        )
-FROM    neighborhood_census_blocks source,
-        neighborhood_census_blocks target,
-        neighborhood_boundary
-WHERE   ST_Intersects(source.geom,neighborhood_boundary.geom)
-AND     ST_DWithin(source.geom,target.geom,:nb_max_trip_distance);
+        pairs.high_stress_cost
+FROM    (
+            SELECT  source.blockid10 AS source_blockid10,
+                    target.blockid10 AS target_blockid10,
+                    COALESCE(source.road_ids && target.road_ids, FALSE) AS shared_road,
+                    costs.total_cost::INT AS low_stress_cost,
+                    costs.total_cost::INT AS high_stress_cost
+            FROM    neighborhood_census_blocks source
+            JOIN    neighborhood_boundary
+                    ON ST_Intersects(source.geom,neighborhood_boundary.geom)
+            JOIN    neighborhood_census_blocks target
+                    ON ST_DWithin(source.geom,target.geom,:nb_max_trip_distance)
+            LEFT JOIN tmp_block_costs costs
+                    ON  costs.source_blockid10 = source.blockid10
+                    AND costs.target_blockid10 = target.blockid10
+        ) pairs;
 
--- set low_stress
-UPDATE  generated.neighborhood_connected_census_blocks
-SET     low_stress = TRUE
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_census_blocks source,
-                    neighborhood_census_blocks target
-            WHERE   neighborhood_connected_census_blocks.source_blockid10 = source.blockid10
-            AND     neighborhood_connected_census_blocks.target_blockid10 = target.blockid10
-            AND     source.road_ids && target.road_ids
-        )
-OR      (
-            low_stress_cost IS NOT NULL
-        AND CASE    WHEN COALESCE(high_stress_cost,0) = 0 THEN TRUE
-                    ELSE low_stress_cost::FLOAT / high_stress_cost <= 1.25
-                    END
-        );
+DROP TABLE tmp_source_road_blocks;
+DROP TABLE tmp_target_road_blocks;
+DROP TABLE tmp_block_costs;
 
 -- indexes
 CREATE UNIQUE INDEX idx_neighborhood_blockpairs ON neighborhood_connected_census_blocks (source_blockid10,target_blockid10);
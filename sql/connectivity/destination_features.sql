@@ -0,0 +1,82 @@
+----------------------------------------
+-- INPUTS
+-- location: neighborhood
+-- the OSM features of all the destinations, tagged with the destinations
+-- they belong to, in a single scan of the polygons and of the points.
+-- A feature can belong to several destinations.
+----------------------------------------
+DROP TABLE IF EXISTS generated.neighborhood_destination_polygons;
+DROP TABLE IF EXISTS generated.neighborhood_destination_points;
+
+CREATE TABLE generated.neighborhood_destination_polygons AS
+SELECT  d.destination,
+        p.osm_id,
+        p.name,
+        p.way
+FROM    neighborhood_osm_full_polygon p
+CROSS JOIN LATERAL unnest(ARRAY[
+            CASE WHEN p.amenity = 'college' THEN 'colleges' END,
+            CASE WHEN p.amenity IN ('community_centre','community_center') THEN 'community_centers' END,
+            CASE WHEN p.amenity = 'dentist' THEN 'dentists' END,
+            CASE WHEN p.amenity IN ('clinic','doctors') THEN 'doctors' END,
+            CASE WHEN p.amenity IN ('hospitals','hospital') THEN 'hospitals' END,
+            CASE    WHEN p.amenity = 'park'
+                    OR p.leisure = 'park'
+                    OR p.leisure = 'nature_reserve'
+                    OR p.leisure = 'playground'
+                    THEN 'parks'
+                    END,
+            CASE WHEN p.amenity = 'pharmacy' THEN 'pharmacies' END,
+            CASE WHEN p.landuse = 'retail' THEN 'retail' END,
+            CASE WHEN p.amenity = 'school' THEN 'schools' END,
+            CASE WHEN p.amenity = 'social_facility' THEN 'social_services' END,
+            CASE WHEN p.shop = 'supermarket' THEN 'supermarkets' END,
+            CASE    WHEN p.amenity = 'bus_station'
+                    OR p.railway = 'station'
+                    OR p.public_transport = 'station'
+                    THEN 'transit'
+                    END,
+            CASE WHEN p.amenity = 'university' THEN 'universities' END
+        ]) AS d(destination)
+WHERE   d.destination IS NOT NULL
+AND     p.way IS NOT NULL;
+
+CREATE TABLE generated.neighborhood_destination_points AS
+SELECT  d.destination,
+        p.osm_id,
+        p.name,
+        p.way
+FROM    neighborhood_osm_full_point p
+CROSS JOIN LATERAL unnest(ARRAY[
+            CASE WHEN p.amenity = 'college' THEN 'colleges' END,
+            CASE WHEN p.amenity IN ('community_centre','community_center') THEN 'community_centers' END,
+            CASE WHEN p.amenity = 'dentist' THEN 'dentists' END,
+            CASE WHEN p.amenity IN ('clinic','doctors') THEN 'doctors' END,
+            CASE WHEN p.amenity IN ('hospitals','hospital') THEN 'hospitals' END,
+            CASE    WHEN p.amenity = 'park'
+                    OR p.leisure = 'park'
+                    OR p.leisure = 'nature_reserve'
+                    OR p.leisure = 'playground'
+                    THEN 'parks'
+                    END,
+            CASE WHEN p.amenity = 'pharmacy' THEN 'pharmacies' END,
+            CASE WHEN p.amenity = 'school' THEN 'schools' END,
+            CASE WHEN p.amenity = 'social_facility' THEN 'social_services' END,
+            CASE WHEN p.shop = 'supermarket' THEN 'supermarkets' END,
+            CASE    WHEN p.amenity = 'bus_station'
+                    OR p.railway = 'station'
+                    OR p.public_transport = 'station'
+                    THEN 'transit'
+                    END,
+            CASE WHEN p.amenity = 'university' THEN 'universities' END
+        ]) AS d(destination)
+WHERE   d.destination IS NOT NULL
+AND     p.way IS NOT NULL;
+
+-- indexes
+CREATE INDEX idx_neighborhood_destination_polygons ON neighborhood_destination_polygons (destination);
+CREATE INDEX sidx_neighborhood_destination_polygons ON neighborhood_destination_polygons USING GIST (way);
+CREATE INDEX idx_neighborhood_destination_points ON neighborhood_destination_points (destination);
+CREATE INDEX sidx_neighborhood_destination_points ON neighborhood_destination_points USING GIST (way);
+ANALYZE neighborhood_destination_polygons;
+ANALYZE neighborhood_destination_points;
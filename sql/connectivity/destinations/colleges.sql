@@ -23,9 +23,14 @@ CREATE TABLE generated.neighborhood_colleges (
 INSERT INTO generated.neighborhood_colleges (
     geom_poly
 )
-SELECT  ST_Multi(ST_Buffer(ST_CollectionExtract(unnest(ST_ClusterWithin(way,:cluster_tolerance)),3),0))
-FROM    neighborhood_osm_full_polygon
-WHERE   amenity = 'college';
+SELECT  ST_Multi(ST_Buffer(ST_CollectionExtract(ST_Collect(clusters.way),3),0))
+FROM    (
+            SELECT  way,
+                    ST_ClusterDBSCAN(way,:cluster_tolerance,1) OVER () AS cluster_id
+            FROM    neighborhood_destination_polygons
+            WHERE   destination = 'colleges'
+        ) clusters
+GROUP BY clusters.cluster_id;
 
 -- set points on polygons
 UPDATE  generated.neighborhood_colleges
@@ -42,12 +47,12 @@ INSERT INTO generated.neighborhood_colleges (
 SELECT  osm_id,
         name,
         way
-FROM    neighborhood_osm_full_point
-WHERE   amenity = 'college'
+FROM    neighborhood_destination_points
+WHERE   destination = 'colleges'
 AND     NOT EXISTS (
             SELECT  1
             FROM    neighborhood_colleges s
-            WHERE   ST_Intersects(s.geom_poly,neighborhood_osm_full_point.way)
+            WHERE   ST_Intersects(s.geom_poly,neighborhood_destination_points.way)
         );
 
 -- index
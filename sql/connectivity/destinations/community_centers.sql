@@ -23,9 +23,14 @@ CREATE TABLE generated.neighborhood_community_centers (
 INSERT INTO generated.neighborhood_community_centers (
     geom_poly
 )
-SELECT  ST_Multi(ST_Buffer(ST_CollectionExtract(unnest(ST_ClusterWithin(way,:cluster_tolerance)),3),0))
-FROM    neighborhood_osm_full_polygon
-WHERE   amenity IN ('community_centre','community_center');
+SELECT  ST_Multi(ST_Buffer(ST_CollectionExtract(ST_Collect(clusters.way),3),0))
+FROM    (
+            SELECT  way,
+                    ST_ClusterDBSCAN(way,:cluster_tolerance,1) OVER () AS cluster_id
+            FROM    neighborhood_destination_polygons
+            WHERE   destination = 'community_centers'
+        ) clusters
+GROUP BY clusters.cluster_id;
 
 -- set points on polygons
 UPDATE  generated.neighborhood_community_centers
@@ -42,12 +47,12 @@ INSERT INTO generated.neighborhood_community_centers (
 SELECT  osm_id,
         name,
         way
-FROM    neighborhood_osm_full_point
-WHERE   amenity IN ('community_centre','community_center')
+FROM    neighborhood_destination_points
+WHERE   destination = 'community_centers'
 AND     NOT EXISTS (
             SELECT  1
             FROM    neighborhood_community_centers s
-            WHERE   ST_Intersects(s.geom_poly,neighborhood_osm_full_point.way)
+            WHERE   ST_Intersects(s.geom_poly,neighborhood_destination_points.way)
         );
 
 -- index
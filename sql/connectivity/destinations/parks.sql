@@ -23,12 +23,14 @@ CREATE TABLE generated.neighborhood_parks (
 INSERT INTO generated.neighborhood_parks (
     geom_poly
 )
-SELECT  ST_Multi(ST_Buffer(ST_CollectionExtract(unnest(ST_ClusterWithin(way,:cluster_tolerance)),3),0))
-FROM    neighborhood_osm_full_polygon
-WHERE   amenity = 'park'
-        OR leisure = 'park'
-        OR leisure = 'nature_reserve'
-        OR leisure = 'playground';
+SELECT  ST_Multi(ST_Buffer(ST_CollectionExtract(ST_Collect(clusters.way),3),0))
+FROM    (
+            SELECT  way,
+                    ST_ClusterDBSCAN(way,:cluster_tolerance,1) OVER () AS cluster_id
+            FROM    neighborhood_destination_polygons
+            WHERE   destination = 'parks'
+        ) clusters
+GROUP BY clusters.cluster_id;
 
 -- set points on polygons
 UPDATE  generated.neighborhood_parks
@@ -45,17 +47,12 @@ INSERT INTO generated.neighborhood_parks (
 SELECT  osm_id,
         name,
         way
-FROM    neighborhood_osm_full_point
-WHERE   (
-            amenity = 'park'
-        OR  leisure = 'park'
-        OR  leisure = 'nature_reserve'
-        OR  leisure = 'playground'
-        )
+FROM    neighborhood_destination_points
+WHERE   destination = 'parks'
 AND     NOT EXISTS (
             SELECT  1
             FROM    neighborhood_parks s
-            WHERE   ST_Intersects(s.geom_poly,neighborhood_osm_full_point.way)
+            WHERE   ST_Intersects(s.geom_poly,neighborhood_destination_points.way)
         );
 
 -- index
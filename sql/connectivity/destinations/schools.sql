@@ -26,8 +26,8 @@ SELECT  osm_id,
         name,
         ST_Centroid(way),
         way
-FROM    neighborhood_osm_full_polygon
-WHERE   amenity = 'school';
+FROM    neighborhood_destination_polygons
+WHERE   destination = 'schools';
 
 -- remove subareas that are mistakenly designated as amenity=school
 DELETE FROM generated.neighborhood_schools
@@ -49,12 +49,12 @@ INSERT INTO generated.neighborhood_schools (
 SELECT  osm_id,
         name,
         way
-FROM    neighborhood_osm_full_point
-WHERE   amenity = 'school'
+FROM    neighborhood_destination_points
+WHERE   destination = 'schools'
 AND     NOT EXISTS (
             SELECT  1
             FROM    neighborhood_schools s
-            WHERE   ST_Intersects(s.geom_poly,neighborhood_osm_full_point.way)
+            WHERE   ST_Intersects(s.geom_poly,neighborhood_destination_points.way)
         );
 
 -- index
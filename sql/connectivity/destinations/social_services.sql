@@ -26,8 +26,8 @@ SELECT  osm_id,
         name,
         ST_Centroid(way),
         way
-FROM    neighborhood_osm_full_polygon
-WHERE   amenity = 'social_facility';
+FROM    neighborhood_destination_polygons
+WHERE   destination = 'social_services';
 
 -- remove subareas that are already covered
 DELETE FROM generated.neighborhood_social_services
@@ -49,12 +49,12 @@ INSERT INTO generated.neighborhood_social_services (
 SELECT  osm_id,
         name,
         way
-FROM    neighborhood_osm_full_point
-WHERE   amenity = 'social_facility'
+FROM    neighborhood_destination_points
+WHERE   destination = 'social_services'
 AND     NOT EXISTS (
             SELECT  1
             FROM    neighborhood_social_services s
-            WHERE   ST_Intersects(s.geom_poly,neighborhood_osm_full_point.way)
+            WHERE   ST_Intersects(s.geom_poly,neighborhood_destination_points.way)
         );
 
 -- index
@@ -26,8 +26,8 @@ SELECT  osm_id,
         name,
         ST_Centroid(way),
         way
-FROM    neighborhood_osm_full_polygon
-WHERE   shop = 'supermarket';
+FROM    neighborhood_destination_polygons
+WHERE   destination = 'supermarkets';
 
 -- remove subareas that are already covered
 DELETE FROM generated.neighborhood_supermarkets
@@ -49,12 +49,12 @@ INSERT INTO generated.neighborhood_supermarkets (
 SELECT  osm_id,
         name,
         way
-FROM    neighborhood_osm_full_point
-WHERE   shop = 'supermarket'
+FROM    neighborhood_destination_points
+WHERE   destination = 'supermarkets'
 AND     NOT EXISTS (
             SELECT  1
             FROM    neighborhood_supermarkets s
-            WHERE   ST_Intersects(s.geom_poly,neighborhood_osm_full_point.way)
+            WHERE   ST_Intersects(s.geom_poly,neighborhood_destination_points.way)
         );
 
 -- index
@@ -26,10 +26,8 @@ SELECT  osm_id,
         name,
         ST_Centroid(way),
         way
-FROM    neighborhood_osm_full_polygon
-WHERE   amenity = 'bus_station'
-OR      railway = 'station'
-OR      public_transport = 'station';
+FROM    neighborhood_destination_polygons
+WHERE   destination = 'transit';
 
 -- remove subareas
 DELETE FROM generated.neighborhood_transit
@@ -48,18 +46,19 @@ ANALYZE generated.neighborhood_transit (geom_poly);
 INSERT INTO generated.neighborhood_transit (
     geom_pt
 )
-SELECT  ST_Centroid(ST_CollectionExtract(unnest(ST_ClusterWithin(way,:cluster_tolerance)),1))
-FROM    neighborhood_osm_full_point
-WHERE   (
-            amenity = 'bus_station'
-        OR  railway = 'station'
-        OR  public_transport = 'station'
-        )
-AND     NOT EXISTS (
-            SELECT  1
-            FROM    neighborhood_transit s
-            WHERE   ST_DWithin(s.geom_poly,neighborhood_osm_full_point.way,:cluster_tolerance)
-        );
+SELECT  ST_Centroid(ST_CollectionExtract(ST_Collect(clusters.way),1))
+FROM    (
+            SELECT  way,
+                    ST_ClusterDBSCAN(way,:cluster_tolerance,1) OVER () AS cluster_id
+            FROM    neighborhood_destination_points
+            WHERE   destination = 'transit'
+            AND     NOT EXISTS (
+                        SELECT  1
+                        FROM    neighborhood_transit s
+                        WHERE   ST_DWithin(s.geom_poly,neighborhood_destination_points.way,:cluster_tolerance)
+                    )
+        ) clusters
+GROUP BY clusters.cluster_id;
 
 -- index
 CREATE INDEX sidx_neighborhood_transit_geompt ON neighborhood_transit USING GIST (geom_pt);
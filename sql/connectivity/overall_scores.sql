@@ -7,7 +7,8 @@
 --   subcategory scores into an overall category
 --   score. Finally, combines category scores into
 --   a single master score for the entire
---   neighborhood.
+--   neighborhood. The scores are computed in
+--   a temporary table and written at once.
 --
 -- variables:
 --   :total=100
@@ -28,376 +29,188 @@ CREATE TABLE generated.neighborhood_overall_scores (
     human_explanation TEXT
 );
 
--- population
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'people',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_pop;
+DROP TABLE IF EXISTS tmp_reached;
+DROP TABLE IF EXISTS tmp_scores;
 
--- employment
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'opportunity_employment',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_emp;
-
--- k12 education
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'opportunity_k12_education',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_k12;
+-- destination types reached from at least one census block,
+-- in a single scan
+CREATE TEMP TABLE tmp_reached AS
+SELECT  COALESCE(BOOL_OR(emp_high_stress > 0),FALSE) AS emp,
+        COALESCE(BOOL_OR(schools_high_stress > 0),FALSE) AS schools,
+        COALESCE(BOOL_OR(colleges_high_stress > 0),FALSE) AS colleges,
+        COALESCE(BOOL_OR(universities_high_stress > 0),FALSE) AS universities,
+        COALESCE(BOOL_OR(doctors_high_stress > 0),FALSE) AS doctors,
+        COALESCE(BOOL_OR(dentists_high_stress > 0),FALSE) AS dentists,
+        COALESCE(BOOL_OR(hospitals_high_stress > 0),FALSE) AS hospitals,
+        COALESCE(BOOL_OR(pharmacies_high_stress > 0),FALSE) AS pharmacies,
+        COALESCE(BOOL_OR(supermarkets_high_stress > 0),FALSE) AS supermarkets,
+        COALESCE(BOOL_OR(social_services_high_stress > 0),FALSE) AS social_services,
+        COALESCE(BOOL_OR(retail_high_stress > 0),FALSE) AS retail,
+        COALESCE(BOOL_OR(parks_high_stress > 0),FALSE) AS parks,
+        COALESCE(BOOL_OR(trails_high_stress > 0),FALSE) AS trails,
+        COALESCE(BOOL_OR(community_centers_high_stress > 0),FALSE) AS community_centers,
+        COALESCE(BOOL_OR(transit_high_stress > 0),FALSE) AS transit
+FROM    neighborhood_census_blocks;
 
--- tech school
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'opportunity_technical_vocational_college',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_tech;
+-- scores, with their position in the output
+CREATE TEMP TABLE tmp_scores (
+    position INTEGER,
+    score_id TEXT,
+    score NUMERIC(16,4),
+    human_explanation TEXT
+);
 
--- higher ed
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
+-- subcategories, read from the score inputs in a single scan
+INSERT INTO tmp_scores (
+    position, score_id, score, human_explanation
 )
-SELECT  'opportunity_higher_education',
+SELECT  subcategories.position,
+        subcategories.score_id,
         COALESCE(neighborhood_score_inputs.score,0),
         neighborhood_score_inputs.human_explanation
 FROM    neighborhood_score_inputs
-WHERE   use_univ;
+CROSS JOIN LATERAL (
+    VALUES
+        (1, 'people', use_pop),
+        (2, 'opportunity_employment', use_emp),
+        (3, 'opportunity_k12_education', use_k12),
+        (4, 'opportunity_technical_vocational_college', use_tech),
+        (5, 'opportunity_higher_education', use_univ),
+        (7, 'core_services_doctors', use_doctor),
+        (8, 'core_services_dentists', use_dentist),
+        (9, 'core_services_hospitals', use_hospital),
+        (10, 'core_services_pharmacies', use_pharmacy),
+        (11, 'core_services_grocery', use_grocery),
+        (12, 'core_services_social_services', use_social_svcs),
+        (14, 'retail', use_retail),
+        (15, 'recreation_parks', use_parks),
+        (16, 'recreation_trails', use_trails),
+        (17, 'recreation_community_centers', use_comm_ctrs),
+        (19, 'transit', use_transit)
+) AS subcategories (position, score_id, used)
+WHERE   subcategories.used;
 
--- opportunity
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
+-- opportunity, core services and recreation
+INSERT INTO tmp_scores (
+    position, score_id, score
 )
-SELECT  'opportunity',
+SELECT  6,
+        'opportunity',
         CASE
-        WHEN EXISTS (
-            SELECT  1
-            FROM    neighborhood_census_blocks
-            WHERE   emp_high_stress > 0
-            OR      schools_high_stress > 0
-            OR      colleges_high_stress > 0
-            OR      universities_high_stress > 0
-        )
+        WHEN r.emp OR r.schools OR r.colleges OR r.universities
             THEN
         (
-            0.35 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'opportunity_employment')
-            + 0.35 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'opportunity_k12_education')
-            + 0.1 * (select score_original from neighborhood_overall_scores where score_id = 'opportunity_technical_vocational_college')
-            + 0.2 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'opportunity_higher_education')
+            0.35 * (SELECT score FROM tmp_scores WHERE score_id = 'opportunity_employment')
+            + 0.35 * (SELECT score FROM tmp_scores WHERE score_id = 'opportunity_k12_education')
+            + 0.1 * (SELECT score FROM tmp_scores WHERE score_id = 'opportunity_technical_vocational_college')
+            + 0.2 * (SELECT score FROM tmp_scores WHERE score_id = 'opportunity_higher_education')
         ) /
         (
-            CASE
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE emp_high_stress > 0)
-                    THEN 0.35
-                ELSE 0
-                END
-            +   CASE
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE schools_high_stress > 0)
-                    THEN 0.35
-                ELSE 0
-                END
-            +   CASE
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE colleges_high_stress > 0)
-                    THEN 0.1
-                ELSE 0
-                END
-            +   CASE
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE universities_high_stress > 0)
-                    THEN 0.2
-                ELSE 0
-                END
+            CASE WHEN r.emp THEN 0.35 ELSE 0 END
+            +   CASE WHEN r.schools THEN 0.35 ELSE 0 END
+            +   CASE WHEN r.colleges THEN 0.1 ELSE 0 END
+            +   CASE WHEN r.universities THEN 0.2 ELSE 0 END
         )
         ELSE NULL
-        END,
-        NULL;
-
--- doctors
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'core_services_doctors',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_doctor;
-
--- dentists
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'core_services_dentists',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_dentist;
-
--- hospitals
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'core_services_hospitals',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_hospital;
-
--- pharmacies
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'core_services_pharmacies',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_pharmacy;
-
--- grocery
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'core_services_grocery',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_grocery;
-
--- social services
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'core_services_social_services',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_social_svcs;
-
--- core services
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'core_services',
+        END
+FROM    tmp_reached r
+UNION ALL
+SELECT  13,
+        'core_services',
         CASE
-        WHEN EXISTS (
-            SELECT  1
-            FROM    neighborhood_census_blocks
-            WHERE   doctors_high_stress > 0
-            OR      dentists_high_stress > 0
-            OR      hospitals_high_stress > 0
-            OR      pharmacies_high_stress > 0
-            OR      supermarkets_high_stress > 0
-            OR      social_services_high_stress > 0
-        )
+        WHEN r.doctors OR r.dentists OR r.hospitals OR r.pharmacies OR r.supermarkets OR r.social_services
             THEN    (
-                        0.2 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'core_services_doctors')
-                        + 0.1 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'core_services_dentists')
-                        + 0.2 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'core_services_hospitals')
-                        + 0.1 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'core_services_pharmacies')
-                        + 0.25 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'core_services_grocery')
-                        + 0.15 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'core_services_social_services')
+                        0.2 * (SELECT score FROM tmp_scores WHERE score_id = 'core_services_doctors')
+                        + 0.1 * (SELECT score FROM tmp_scores WHERE score_id = 'core_services_dentists')
+                        + 0.2 * (SELECT score FROM tmp_scores WHERE score_id = 'core_services_hospitals')
+                        + 0.1 * (SELECT score FROM tmp_scores WHERE score_id = 'core_services_pharmacies')
+                        + 0.25 * (SELECT score FROM tmp_scores WHERE score_id = 'core_services_grocery')
+                        + 0.15 * (SELECT score FROM tmp_scores WHERE score_id = 'core_services_social_services')
                     ) /
                     (
-                        CASE
-                        WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE doctors_high_stress > 0)
-                            THEN 0.2
-                        ELSE 0
-                        END
-                        +   CASE
-                            WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE dentists_high_stress > 0)
-                                THEN 0.1
-                            ELSE 0
-                            END
-                        +   CASE
-                            WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE hospitals_high_stress > 0)
-                                THEN 0.2
-                            ELSE 0
-                            END
-                        +   CASE
-                            WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE pharmacies_high_stress > 0)
-                                THEN 0.1
-                            ELSE 0
-                            END
-                        +   CASE
-                            WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE supermarkets_high_stress > 0)
-                                THEN 0.25
-                            ELSE 0
-                            END
-                        +   CASE
-                            WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE social_services_high_stress > 0)
-                                THEN 0.15
-                            ELSE 0
-                            END
+                        CASE WHEN r.doctors THEN 0.2 ELSE 0 END
+                        +   CASE WHEN r.dentists THEN 0.1 ELSE 0 END
+                        +   CASE WHEN r.hospitals THEN 0.2 ELSE 0 END
+                        +   CASE WHEN r.pharmacies THEN 0.1 ELSE 0 END
+                        +   CASE WHEN r.supermarkets THEN 0.25 ELSE 0 END
+                        +   CASE WHEN r.social_services THEN 0.15 ELSE 0 END
                     )
         ELSE NULL
-        END,
-        NULL;
-
--- retail
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'retail',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_retail;
-
--- parks
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'recreation_parks',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_parks;
-
--- trails
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'recreation_trails',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_trails;
-
--- community_centers
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'recreation_community_centers',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_comm_ctrs;
-
--- recreation
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'recreation',
+        END
+FROM    tmp_reached r
+UNION ALL
+SELECT  18,
+        'recreation',
         CASE
-        WHEN EXISTS (
-            SELECT  1
-            FROM    neighborhood_census_blocks
-            WHERE   parks_high_stress > 0
-            OR      trails_high_stress > 0
-            OR      community_centers_high_stress > 0
-        )
+        WHEN r.parks OR r.trails OR r.community_centers
             THEN    (
-                        0.4 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'recreation_parks')
-                        + 0.35 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'recreation_trails')
-                        + 0.25 * (SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'recreation_community_centers')
+                        0.4 * (SELECT score FROM tmp_scores WHERE score_id = 'recreation_parks')
+                        + 0.35 * (SELECT score FROM tmp_scores WHERE score_id = 'recreation_trails')
+                        + 0.25 * (SELECT score FROM tmp_scores WHERE score_id = 'recreation_community_centers')
                     ) /
                     (
-                        CASE
-                        WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE parks_high_stress > 0)
-                            THEN 0.4
-                        ELSE 0
-                        END
-                        +   CASE
-                            WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE trails_high_stress > 0)
-                                THEN 0.35
-                            ELSE 0
-                            END
-                        +   CASE
-                            WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE community_centers_high_stress > 0)
-                                THEN 0.25
-                            ELSE 0
-                            END
+                        CASE WHEN r.parks THEN 0.4 ELSE 0 END
+                        +   CASE WHEN r.trails THEN 0.35 ELSE 0 END
+                        +   CASE WHEN r.community_centers THEN 0.25 ELSE 0 END
                     )
         ELSE NULL
-        END,
-        NULL;
-
--- transit
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT  'transit',
-        COALESCE(neighborhood_score_inputs.score,0),
-        neighborhood_score_inputs.human_explanation
-FROM    neighborhood_score_inputs
-WHERE   use_transit;
+        END
+FROM    tmp_reached r;
 
 -- calculate overall neighborhood score
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
+INSERT INTO tmp_scores (
+    position, score_id, score
 )
-SELECT  'overall_score',
+SELECT  20,
+        'overall_score',
         (
-            :people * COALESCE((SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'people'),0)
-            + :opportunity * COALESCE((SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'opportunity'),0)
-            + :core_services * COALESCE((SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'core_services'),0)
-            + :retail * COALESCE((SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'retail'),0)
-            + :recreation * COALESCE((SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'recreation'),0)
-            + :transit * COALESCE((SELECT score_original FROM neighborhood_overall_scores WHERE score_id = 'transit'),0)
+            :people * COALESCE((SELECT score FROM tmp_scores WHERE score_id = 'people'),0)
+            + :opportunity * COALESCE((SELECT score FROM tmp_scores WHERE score_id = 'opportunity'),0)
+            + :core_services * COALESCE((SELECT score FROM tmp_scores WHERE score_id = 'core_services'),0)
+            + :retail * COALESCE((SELECT score FROM tmp_scores WHERE score_id = 'retail'),0)
+            + :recreation * COALESCE((SELECT score FROM tmp_scores WHERE score_id = 'recreation'),0)
+            + :transit * COALESCE((SELECT score FROM tmp_scores WHERE score_id = 'transit'),0)
         ) /
         (
             :people
             +   CASE
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks
-                    WHERE emp_high_stress > 0
-                    OR    schools_high_stress > 0
-                    OR    colleges_high_stress > 0
-                    OR    universities_high_stress > 0
-                ) THEN :opportunity
+                WHEN r.emp OR r.schools OR r.colleges OR r.universities
+                    THEN :opportunity
                 ELSE 0
                 END
             +   CASE
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE doctors_high_stress > 0)
-                    THEN :core_services
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE dentists_high_stress > 0)
-                    THEN :core_services
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE hospitals_high_stress > 0)
-                    THEN :core_services
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE pharmacies_high_stress > 0)
-                    THEN :core_services
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE supermarkets_high_stress > 0)
-                    THEN :core_services
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE social_services_high_stress > 0)
+                WHEN r.doctors OR r.dentists OR r.hospitals OR r.pharmacies OR r.supermarkets OR r.social_services
                     THEN :core_services
                 ELSE 0
                 END
             +   CASE
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE retail_high_stress > 0)
+                WHEN r.retail
                     THEN :retail
                 ELSE 0
                 END
             +   CASE
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE parks_high_stress > 0)
-                    THEN :recreation
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE trails_high_stress > 0)
-                    THEN :recreation
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE community_centers_high_stress > 0)
+                WHEN r.parks OR r.trails OR r.community_centers
                     THEN :recreation
                 ELSE 0
                 END
             +   CASE
-                WHEN EXISTS (SELECT 1 FROM neighborhood_census_blocks WHERE transit_high_stress > 0)
+                WHEN r.transit
                     THEN :transit
                 ELSE 0
                 END
-        ),
-        NULL;
+        )
+FROM    tmp_reached r;
 
--- normalize
-UPDATE  generated.neighborhood_overall_scores
-SET     score_normalized = score_original * :total;
+-- write the scores at once, normalized
+INSERT INTO generated.neighborhood_overall_scores (
+    score_id, score_original, score_normalized, human_explanation
+)
+SELECT  score_id,
+        score,
+        score * :total,
+        human_explanation
+FROM    tmp_scores
+ORDER BY position;
 
 -- population
 INSERT INTO generated.neighborhood_overall_scores (
@@ -415,41 +228,41 @@ SELECT  'population_total',
         'Total population of boundary';
 
 
--- high and low stress total mileage
+-- high and low stress total mileage, in a single scan of the ways
 INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
-)
-SELECT 'total_miles_low_stress',
-    (
-        SELECT
-            ( 1 / 1609.34 ) * (
-                SUM(ST_Length(ST_Intersection(w.geom, b.geom)) *
-                    CASE ft_seg_stress WHEN 1 THEN 1 ELSE 0 END) +
-                SUM(ST_Length(ST_Intersection(w.geom, b.geom)) *
-                    CASE tf_seg_stress WHEN 1 THEN 1 ELSE 0 END)
-            ) as dist
-        FROM neighborhood_ways as w, neighborhood_boundary as b
-        WHERE ST_Intersects(w.geom, b.geom)
-    ),
-    'Total low-stress miles';
-
-INSERT INTO generated.neighborhood_overall_scores (
-    score_id, score_original, human_explanation
+    score_id, score_original, score_normalized, human_explanation
 )
-SELECT 'total_miles_high_stress',
-    (
-        SELECT
-            ( 1 / 1609.34 ) * (
-                SUM(ST_Length(ST_Intersection(w.geom, b.geom)) *
-                    CASE ft_seg_stress WHEN 3 THEN 1 ELSE 0 END) +
-                SUM(ST_Length(ST_Intersection(w.geom, b.geom)) *
-                    CASE tf_seg_stress WHEN 3 THEN 1 ELSE 0 END)
-            ) as dist
-        FROM neighborhood_ways as w, neighborhood_boundary as b
-        WHERE ST_Intersects(w.geom, b.geom)
-    ),
-    'Total high-stress miles';
+SELECT  miles.score_id,
+        miles.dist,
+        ROUND(miles.dist::NUMERIC(16,4), 1),
+        miles.human_explanation
+FROM    (
+            SELECT
+                ( 1 / 1609.34 ) * (
+                    SUM(ways.length *
+                        CASE ways.ft_seg_stress WHEN 1 THEN 1 ELSE 0 END) +
+                    SUM(ways.length *
+                        CASE ways.tf_seg_stress WHEN 1 THEN 1 ELSE 0 END)
+                ) AS low_stress,
+                ( 1 / 1609.34 ) * (
+                    SUM(ways.length *
+                        CASE ways.ft_seg_stress WHEN 3 THEN 1 ELSE 0 END) +
+                    SUM(ways.length *
+                        CASE ways.tf_seg_stress WHEN 3 THEN 1 ELSE 0 END)
+                ) AS high_stress
+            FROM (
+                SELECT  ST_Length(ST_Intersection(w.geom, b.geom)) AS length,
+                        w.ft_seg_stress,
+                        w.tf_seg_stress
+                FROM    neighborhood_ways as w, neighborhood_boundary as b
+                WHERE   ST_Intersects(w.geom, b.geom)
+            ) ways
+        ) total
+CROSS JOIN LATERAL (
+    VALUES
+        ('total_miles_low_stress', total.low_stress, 'Total low-stress miles'),
+        ('total_miles_high_stress', total.high_stress, 'Total high-stress miles')
+) AS miles (score_id, dist, human_explanation);
 
-UPDATE generated.neighborhood_overall_scores
-SET    score_normalized = ROUND(score_original, 1)
-WHERE  score_id in ('total_miles_low_stress', 'total_miles_high_stress');
+DROP TABLE tmp_reached;
+DROP TABLE tmp_scores;
@@ -2,11 +2,21 @@
 -- INPUTS
 -- location: neighborhood
 ----------------------------------------
-DROP TABLE IF EXISTS generated.neighborhood_reachable_roads_high_stress;
+DROP VIEW IF EXISTS generated.neighborhood_reachable_roads_high_stress;
+DROP TABLE IF EXISTS generated.neighborhood_reachable_roads_high_stress_compact;
 
-CREATE TABLE generated.neighborhood_reachable_roads_high_stress (
-    id SERIAL PRIMARY KEY,
+-- one row per base road, with its target roads sorted and their costs
+CREATE TABLE generated.neighborhood_reachable_roads_high_stress_compact (
     base_road INT,
-    target_road INT,
-    total_cost FLOAT
+    target_roads INT[],
+    total_costs FLOAT[]
 );
+
+-- one row per (base road, target road), read by the connectivity scripts
+CREATE VIEW generated.neighborhood_reachable_roads_high_stress AS
+SELECT  compact.base_road,
+        reached.target_road,
+        reached.total_cost
+FROM    generated.neighborhood_reachable_roads_high_stress_compact compact
+CROSS JOIN LATERAL unnest(compact.target_roads, compact.total_costs)
+        AS reached (target_road, total_cost);
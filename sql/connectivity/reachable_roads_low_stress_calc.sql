@@ -1,17 +1,18 @@
 ----------------------------------------
 -- INPUTS
 -- location: neighborhood
--- :nb_max_trip_distance psql var must be set before running this script,
---      e.g. psql -v nb_max_trip_distance=2680 -f reachable_roads_low_stress_calc.sql
+-- :nb_max_trip_distance and :prune_roads psql vars must be set before running this script,
+--      e.g. psql -v nb_max_trip_distance=2680 -v prune_roads=true -f reachable_roads_low_stress_calc.sql
+-- if :prune_roads is true, only the routing roads are routed from and kept
 ----------------------------------------
-INSERT INTO generated.neighborhood_reachable_roads_low_stress (
+INSERT INTO generated.neighborhood_reachable_roads_low_stress_compact (
     base_road,
-    target_road,
-    total_cost
+    target_roads,
+    total_costs
 )
 SELECT  r1.road_id,
-        v2.road_id,
-        sheds.agg_cost
+        array_agg(v2.road_id ORDER BY v2.road_id),
+        array_agg(sheds.agg_cost ORDER BY v2.road_id)
 FROM    neighborhood_ways r1,
         neighborhood_ways_net_vert v1,
         neighborhood_ways_net_vert v2,
@@ -34,4 +35,13 @@ EXISTS (
             WHERE   ST_Intersects(b.geom,r1.geom)
 )
 AND     r1.road_id = v1.road_id
-AND     v2.vert_id = sheds.node;
+AND     v2.vert_id = sheds.node
+AND     (
+            NOT :prune_roads
+        OR  r1.road_id IN (SELECT road_id FROM neighborhood_routing_roads WHERE origin)
+        )
+AND     (
+            NOT :prune_roads
+        OR  v2.road_id IN (SELECT road_id FROM neighborhood_routing_roads)
+        )
+GROUP BY r1.road_id;
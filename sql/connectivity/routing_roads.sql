@@ -0,0 +1,34 @@
+----------------------------------------
+-- INPUTS
+-- location: neighborhood
+-- the roads the connectivity looks up in the reachable roads: the roads of
+-- the census blocks, from the blocks in the boundary, and the roads of the
+-- paths, for the trails. The reachable roads can be pruned to these roads.
+----------------------------------------
+DROP TABLE IF EXISTS generated.neighborhood_routing_roads;
+
+CREATE TABLE generated.neighborhood_routing_roads (
+    road_id INTEGER PRIMARY KEY,
+    origin BOOLEAN
+);
+
+INSERT INTO generated.neighborhood_routing_roads (road_id, origin)
+SELECT      roads.road_id,
+            BOOL_OR(roads.origin)
+FROM        (
+                SELECT  unnest(blocks.road_ids) AS road_id,
+                        EXISTS (
+                            SELECT  1
+                            FROM    neighborhood_boundary AS b
+                            WHERE   ST_Intersects(blocks.geom,b.geom)
+                        ) AS origin
+                FROM    neighborhood_census_blocks blocks
+                UNION ALL
+                SELECT  unnest(paths.road_ids),
+                        FALSE
+                FROM    neighborhood_paths paths
+            ) roads
+WHERE       roads.road_id IS NOT NULL
+GROUP BY    roads.road_id;
+
+ANALYZE generated.neighborhood_routing_roads;
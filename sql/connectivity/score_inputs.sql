@@ -1,6 +1,9 @@
 ----------------------------------------
 -- INPUTS
 -- location: neighborhood
+-- The in-boundary census blocks and destinations are read once, all their
+-- statistics are computed in a single aggregation pass and the score inputs
+-- are written at once.
 ----------------------------------------
 DROP TABLE IF EXISTS generated.neighborhood_score_inputs;
 
@@ -29,11 +32,75 @@ CREATE TABLE generated.neighborhood_score_inputs (
     use_transit BOOLEAN
 );
 
+DROP TABLE IF EXISTS tmp_blocks;
+DROP TABLE IF EXISTS tmp_pop;
+DROP TABLE IF EXISTS tmp_block_stats;
+DROP TABLE IF EXISTS tmp_shed_stats;
+
+-------------------------------------
+-- census blocks in the neighborhood
+-------------------------------------
+CREATE TEMP TABLE tmp_blocks AS
+SELECT  pop10,
+        pop_low_stress,
+        pop_high_stress,
+        pop_score,
+        emp_low_stress,
+        emp_high_stress,
+        emp_score,
+        schools_low_stress,
+        schools_high_stress,
+        schools_score,
+        colleges_low_stress,
+        colleges_high_stress,
+        colleges_score,
+        universities_low_stress,
+        universities_high_stress,
+        universities_score,
+        doctors_low_stress,
+        doctors_high_stress,
+        doctors_score,
+        dentists_low_stress,
+        dentists_high_stress,
+        dentists_score,
+        hospitals_low_stress,
+        hospitals_high_stress,
+        hospitals_score,
+        pharmacies_low_stress,
+        pharmacies_high_stress,
+        pharmacies_score,
+        retail_low_stress,
+        retail_high_stress,
+        retail_score,
+        supermarkets_low_stress,
+        supermarkets_high_stress,
+        supermarkets_score,
+        social_services_low_stress,
+        social_services_high_stress,
+        social_services_score,
+        parks_low_stress,
+        parks_high_stress,
+        parks_score,
+        trails_low_stress,
+        trails_high_stress,
+        trails_score,
+        community_centers_low_stress,
+        community_centers_high_stress,
+        community_centers_score,
+        transit_low_stress,
+        transit_high_stress,
+        transit_score
+FROM    neighborhood_census_blocks
+WHERE   EXISTS (
+            SELECT  1
+            FROM    neighborhood_boundary AS b
+            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
+        );
+
 -------------------------------------
 -- temporary table of total population
 -- for weighting purposes
 -------------------------------------
-DROP TABLE IF EXISTS tmp_pop;
 CREATE TEMP TABLE tmp_pop (
     overall INTEGER,
     k12 INTEGER,
@@ -71,567 +138,620 @@ SELECT  SUM(pop10),
         SUM(CASE WHEN COALESCE(trails_high_stress,0) = 0 THEN 0 ELSE pop10 END),
         SUM(CASE WHEN COALESCE(community_centers_high_stress,0) = 0 THEN 0 ELSE pop10 END),
         SUM(CASE WHEN COALESCE(transit_high_stress,0) = 0 THEN 0 ELSE pop10 END)
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
+FROM    tmp_blocks;
 
 -------------------------------------
--- population
+-- statistics of the census blocks,
+-- in a single aggregation pass
+-------------------------------------
+CREATE TEMP TABLE tmp_block_stats AS
+SELECT  PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) AS pop_percentiles,
+        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
+                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
+                END AS pop_average,
+        SUM(CASE WHEN tmp_pop.overall = 0 THEN 0 ELSE pop10 * pop_score / tmp_pop.overall END) AS pop_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY emp_low_stress::FLOAT/NULLIF(emp_high_stress,0)) AS emp_percentiles,
+        CASE    WHEN SUM(emp_high_stress) = 0 THEN 0
+                ELSE SUM(emp_low_stress)::FLOAT / SUM(emp_high_stress)
+                END AS emp_average,
+        SUM(CASE WHEN tmp_pop.overall = 0 THEN 0 ELSE pop10 * emp_score / tmp_pop.overall END) AS emp_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY schools_low_stress::FLOAT/NULLIF(schools_high_stress,0)) AS schools_percentiles,
+        CASE    WHEN SUM(schools_high_stress) = 0 THEN 0
+                ELSE SUM(schools_low_stress) / SUM(schools_high_stress)
+                END AS schools_average,
+        SUM(CASE WHEN tmp_pop.k12 = 0 THEN 0 ELSE pop10 * schools_score / tmp_pop.k12 END) AS schools_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY colleges_low_stress::FLOAT/NULLIF(colleges_high_stress,0)) AS colleges_percentiles,
+        CASE    WHEN SUM(colleges_high_stress) = 0 THEN 0
+                ELSE SUM(colleges_low_stress) / SUM(colleges_high_stress)
+                END AS colleges_average,
+        SUM(CASE WHEN tmp_pop.tech = 0 THEN 0 ELSE pop10 * colleges_score / tmp_pop.tech END) AS colleges_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY universities_low_stress::FLOAT/NULLIF(universities_high_stress,0)) AS universities_percentiles,
+        CASE    WHEN SUM(universities_high_stress) = 0 THEN 0
+                ELSE SUM(universities_low_stress) / SUM(universities_high_stress)
+                END AS universities_average,
+        SUM(CASE WHEN tmp_pop.univ = 0 THEN 0 ELSE pop10 * universities_score / tmp_pop.univ END) AS universities_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY doctors_low_stress::FLOAT/NULLIF(doctors_high_stress,0)) AS doctors_percentiles,
+        CASE    WHEN SUM(doctors_high_stress) = 0 THEN 0
+                ELSE SUM(doctors_low_stress) / SUM(doctors_high_stress)
+                END AS doctors_average,
+        SUM(CASE WHEN tmp_pop.doctor = 0 THEN 0 ELSE pop10 * doctors_score / tmp_pop.doctor END) AS doctors_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY dentists_low_stress::FLOAT/NULLIF(dentists_high_stress,0)) AS dentists_percentiles,
+        CASE    WHEN SUM(dentists_high_stress) = 0 THEN 0
+                ELSE SUM(dentists_low_stress) / SUM(dentists_high_stress)
+                END AS dentists_average,
+        SUM(CASE WHEN tmp_pop.dentist = 0 THEN 0 ELSE pop10 * dentists_score / tmp_pop.dentist END) AS dentists_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY hospitals_low_stress::FLOAT/NULLIF(hospitals_high_stress,0)) AS hospitals_percentiles,
+        CASE    WHEN SUM(hospitals_high_stress) = 0 THEN 0
+                ELSE SUM(hospitals_low_stress) / SUM(hospitals_high_stress)
+                END AS hospitals_average,
+        SUM(CASE WHEN tmp_pop.hospital = 0 THEN 0 ELSE pop10 * hospitals_score / tmp_pop.hospital END) AS hospitals_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY pharmacies_low_stress::FLOAT/NULLIF(pharmacies_high_stress,0)) AS pharmacies_percentiles,
+        CASE    WHEN SUM(pharmacies_high_stress) = 0 THEN 0
+                ELSE SUM(pharmacies_low_stress) / SUM(pharmacies_high_stress)
+                END AS pharmacies_average,
+        SUM(CASE WHEN tmp_pop.pharmacy = 0 THEN 0 ELSE pop10 * pharmacies_score / tmp_pop.pharmacy END) AS pharmacies_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY retail_low_stress::FLOAT/NULLIF(retail_high_stress,0)) AS retail_percentiles,
+        CASE    WHEN SUM(retail_high_stress) = 0 THEN 0
+                ELSE SUM(retail_low_stress) / SUM(retail_high_stress)
+                END AS retail_average,
+        SUM(CASE WHEN tmp_pop.retail = 0 THEN 0 ELSE pop10 * retail_score / tmp_pop.retail END) AS retail_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY supermarkets_low_stress::FLOAT/NULLIF(supermarkets_high_stress,0)) AS supermarkets_percentiles,
+        CASE    WHEN SUM(supermarkets_high_stress) = 0 THEN 0
+                ELSE SUM(supermarkets_low_stress) / SUM(supermarkets_high_stress)
+                END AS supermarkets_average,
+        SUM(CASE WHEN tmp_pop.grocery = 0 THEN 0 ELSE pop10 * supermarkets_score / tmp_pop.grocery END) AS supermarkets_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY social_services_low_stress::FLOAT/NULLIF(social_services_high_stress,0)) AS social_services_percentiles,
+        CASE    WHEN SUM(social_services_high_stress) = 0 THEN 0
+                ELSE SUM(social_services_low_stress) / SUM(social_services_high_stress)
+                END AS social_services_average,
+        SUM(CASE WHEN tmp_pop.social_svcs = 0 THEN 0 ELSE pop10 * social_services_score / tmp_pop.social_svcs END) AS social_services_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY parks_low_stress::FLOAT/NULLIF(parks_high_stress,0)) AS parks_percentiles,
+        CASE    WHEN SUM(parks_high_stress) = 0 THEN 0
+                ELSE SUM(parks_low_stress) / SUM(parks_high_stress)
+                END AS parks_average,
+        SUM(CASE WHEN tmp_pop.parks = 0 THEN 0 ELSE pop10 * parks_score / tmp_pop.parks END) AS parks_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY trails_low_stress::FLOAT/NULLIF(trails_high_stress,0)) AS trails_percentiles,
+        CASE    WHEN SUM(trails_high_stress) = 0 THEN 0
+                ELSE SUM(trails_low_stress) / SUM(trails_high_stress)
+                END AS trails_average,
+        SUM(CASE WHEN tmp_pop.trails = 0 THEN 0 ELSE pop10 * trails_score / tmp_pop.trails END) AS trails_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY community_centers_low_stress::FLOAT/NULLIF(community_centers_high_stress,0)) AS community_centers_percentiles,
+        CASE    WHEN SUM(community_centers_high_stress) = 0 THEN 0
+                ELSE SUM(community_centers_low_stress) / SUM(community_centers_high_stress)
+                END AS community_centers_average,
+        SUM(CASE WHEN tmp_pop.comm_ctrs = 0 THEN 0 ELSE pop10 * community_centers_score / tmp_pop.comm_ctrs END) AS community_centers_weighted,
+        PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY transit_low_stress::FLOAT/NULLIF(transit_high_stress,0)) AS transit_percentiles,
+        CASE    WHEN SUM(transit_high_stress) = 0 THEN 0
+                ELSE SUM(transit_low_stress) / SUM(transit_high_stress)
+                END AS transit_average,
+        SUM(CASE WHEN tmp_pop.transit = 0 THEN 0 ELSE pop10 * transit_score / tmp_pop.transit END) AS transit_weighted
+FROM    tmp_blocks,
+        tmp_pop;
+
+-------------------------------------
+-- statistics of the population shed
+-- of the destinations
+-------------------------------------
+CREATE TEMP TABLE tmp_shed_stats AS
+SELECT      destination,
+            PERCENTILE_CONT(ARRAY[0.5,0.7,0.3]) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) AS percentiles,
+            CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
+                    ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
+                    END AS average
+FROM        (
+                SELECT  'schools'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_schools
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_schools.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'colleges'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_colleges
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_colleges.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'universities'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_universities
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_universities.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'doctors'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_doctors
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_doctors.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'dentists'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_dentists
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_dentists.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'hospitals'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_hospitals
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_hospitals.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'pharmacies'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_pharmacies
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_pharmacies.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'retail'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_retail
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_retail.geom_poly,b.geom)
+                )
+                UNION ALL
+                SELECT  'supermarkets'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_supermarkets
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_supermarkets.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'social_services'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_social_services
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_social_services.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'parks'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_parks
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_parks.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'community_centers'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_community_centers
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_community_centers.geom_pt,b.geom)
+                )
+                UNION ALL
+                SELECT  'transit'::TEXT AS destination, pop_low_stress, pop_high_stress
+                FROM    neighborhood_transit
+                WHERE   EXISTS (
+                    SELECT  1
+                    FROM    neighborhood_boundary AS b
+                    WHERE   ST_Intersects(neighborhood_transit.geom_pt,b.geom)
+                )
+            ) destinations
+GROUP BY    destination;
+
+-------------------------------------
+-- score inputs
 -------------------------------------
--- median pop access score
 INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'People',
+    category, score_name, score, notes, human_explanation,
+    use_pop, use_emp, use_k12, use_tech, use_univ, use_doctor, use_dentist, use_hospital, use_pharmacy, use_retail, use_grocery, use_social_svcs, use_parks, use_trails, use_comm_ctrs, use_transit
+)
+SELECT  inputs.category,
+        inputs.score_name,
+        inputs.score,
+        inputs.notes,
+        inputs.human_explanation,
+        CASE WHEN inputs.use_flag = 'pop' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'emp' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'k12' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'tech' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'univ' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'doctor' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'dentist' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'hospital' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'pharmacy' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'retail' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'grocery' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'social_svcs' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'parks' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'trails' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'comm_ctrs' THEN TRUE END,
+        CASE WHEN inputs.use_flag = 'transit' THEN TRUE END
+FROM    tmp_block_stats blocks
+LEFT JOIN tmp_shed_stats schools_shed ON schools_shed.destination = 'schools'
+LEFT JOIN tmp_shed_stats colleges_shed ON colleges_shed.destination = 'colleges'
+LEFT JOIN tmp_shed_stats universities_shed ON universities_shed.destination = 'universities'
+LEFT JOIN tmp_shed_stats doctors_shed ON doctors_shed.destination = 'doctors'
+LEFT JOIN tmp_shed_stats dentists_shed ON dentists_shed.destination = 'dentists'
+LEFT JOIN tmp_shed_stats hospitals_shed ON hospitals_shed.destination = 'hospitals'
+LEFT JOIN tmp_shed_stats pharmacies_shed ON pharmacies_shed.destination = 'pharmacies'
+LEFT JOIN tmp_shed_stats retail_shed ON retail_shed.destination = 'retail'
+LEFT JOIN tmp_shed_stats supermarkets_shed ON supermarkets_shed.destination = 'supermarkets'
+LEFT JOIN tmp_shed_stats social_services_shed ON social_services_shed.destination = 'social_services'
+LEFT JOIN tmp_shed_stats parks_shed ON parks_shed.destination = 'parks'
+LEFT JOIN tmp_shed_stats community_centers_shed ON community_centers_shed.destination = 'community_centers'
+LEFT JOIN tmp_shed_stats transit_shed ON transit_shed.destination = 'transit'
+CROSS JOIN LATERAL (
+    VALUES
+    -- median pop access score
+    (
+        1,
+        'People',
         'Median score of access to population',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.pop_percentiles[1],
         regexp_replace('Score of population accessible by low stress
             to population accessible overall, expressed as
             the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of all census blocks in the neighborhood have
             a ratio of low stress to high stress access above this number,
-            half have a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile pop access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'People',
+            half have a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile pop access score
+    (
+        2,
+        'People',
         '70th percentile score of access to population',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.pop_percentiles[2],
         regexp_replace('Score of population accessible by low stress
             to population accessible overall, expressed as
             the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of all census blocks in the neighborhood have
             a ratio of low stress to high stress access above this number,
-            70% have a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile pop access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'People',
+            70% have a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile pop access score
+    (
+        3,
+        'People',
         '30th percentile score of access to population',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.pop_percentiles[3],
         regexp_replace('Score of population accessible by low stress
             to population accessible overall, expressed as
             the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of all census blocks in the neighborhood have
             a ratio of low stress to high stress access above this number,
-            30% have a lower ratio.','\n\s+',' ','g');
-
--- avg pop access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'People',
+            30% have a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- avg pop access score
+    (
+        4,
+        'People',
         'Average score of access to population',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        blocks.pop_average,
         regexp_replace('Score of population accessible by low stress
             to population accessible overall, expressed as
             the average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            this ratio of low stress to high stress access.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_pop
-)
-SELECT  'People',
+            this ratio of low stress to high stress access.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        5,
+        'People',
         'Average score of access to population',
-        SUM(CASE WHEN tmp_pop.overall = 0 THEN 0 ELSE pop10 * pop_score / tmp_pop.overall END),
+        blocks.pop_weighted,
         regexp_replace('Average population score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this population score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
-
--------------------------------------
--- employment
--------------------------------------
--- median jobs access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+        'pop'
+    ),
+    -- median jobs access score
+    (
+        6,
+        'Opportunity',
         'Median score of access to employment',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY emp_low_stress::FLOAT/NULLIF(emp_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.emp_percentiles[1],
         regexp_replace('Score of employment accessible by low stress
             to employment accessible overall, expressed as
             the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of all census blocks in the neighborhood have
             a ratio of low stress to high stress access above this number,
-            half have a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile jobs access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            half have a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile jobs access score
+    (
+        7,
+        'Opportunity',
         '70th percentile score of access to employment',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY emp_low_stress::FLOAT/NULLIF(emp_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.emp_percentiles[2],
         regexp_replace('Score of employment accessible by low stress
             to employment accessible overall, expressed as
             the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of all census blocks in the neighborhood have
             a ratio of low stress to high stress access above this number,
-            70% have a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile jobs access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            70% have a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile jobs access score
+    (
+        8,
+        'Opportunity',
         '30th percentile score of access to employment',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY emp_low_stress::FLOAT/NULLIF(emp_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.emp_percentiles[3],
         regexp_replace('Score of employment accessible by low stress
             to employment accessible overall, expressed as
             the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of all census blocks in the neighborhood have
             a ratio of low stress to high stress access above this number,
-            30% have a lower ratio.','\n\s+',' ','g');
-
--- avg jobs access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            30% have a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- avg jobs access score
+    (
+        9,
+        'Opportunity',
         'Average score of access to employment',
-        CASE    WHEN SUM(emp_high_stress) = 0 THEN 0
-                ELSE SUM(emp_low_stress)::FLOAT / SUM(emp_high_stress)
-                END,
+        blocks.emp_average,
         regexp_replace('Score of employment accessible by low stress
             to employment accessible overall, expressed as
             the average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            this ratio of low stress to high stress access.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_emp
-)
-SELECT  'Opportunity',
+            this ratio of low stress to high stress access.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        10,
+        'Opportunity',
         'Average score of access to jobs',
-        SUM(CASE WHEN tmp_pop.overall = 0 THEN 0 ELSE pop10 * emp_score / tmp_pop.overall END),
+        blocks.emp_weighted,
         regexp_replace('Average employment score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this employment score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--------------------------------------
--- schools
--------------------------------------
--- average school access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+        'emp'
+    ),
+    -- average school access score
+    (
+        11,
+        'Opportunity',
         'Average score of low stress access to schools',
-        CASE    WHEN SUM(schools_high_stress) = 0 THEN 0
-                ELSE SUM(schools_low_stress) / SUM(schools_high_stress)
-                END,
+        blocks.schools_average,
         regexp_replace('Number of schools accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many schools.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median schools access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            low stress access to this many schools.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median schools access score
+    (
+        12,
+        'Opportunity',
         'Median score of school access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY schools_low_stress::FLOAT/NULLIF(schools_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.schools_percentiles[1],
         regexp_replace('Score of schools accessible by low stress
             compared to schools accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of schools within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile schools access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile schools access score
+    (
+        13,
+        'Opportunity',
         '70th percentile score of school access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY schools_low_stress::FLOAT/NULLIF(schools_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.schools_percentiles[2],
         regexp_replace('Score of schools accessible by low stress
             compared to schools accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of schools within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile schools access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile schools access score
+    (
+        14,
+        'Opportunity',
         '30th percentile score of school access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY schools_low_stress::FLOAT/NULLIF(schools_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.schools_percentiles[3],
         regexp_replace('Score of schools accessible by low stress
             compared to schools accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of schools within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_k12
-)
-SELECT  'Opportunity',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        15,
+        'Opportunity',
         'Average score of access to K12 schools',
-        SUM(CASE WHEN tmp_pop.k12 = 0 THEN 0 ELSE pop10 * schools_score / tmp_pop.k12 END),
+        blocks.schools_weighted,
         regexp_replace('Average K12 schools score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this K12 schools score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- school pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+        'k12'
+    ),
+    -- school pop shed average low stress access score
+    (
+        16,
+        'Opportunity',
         'Average school bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        schools_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of schools in the neighborhood expressed as an average of
             all schools in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, schools in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_schools
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_schools.geom_pt,b.geom)
-        );
-
--- school pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- school pop shed median low stress access score
+    (
+        17,
+        'Opportunity',
         'Median school population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) 
-        FROM    neighborhood_schools
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_schools.geom_pt,b.geom)
-        )),
+        schools_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to schools
             in the neighborhood to total population within the bike shed
             of each school expressed as a median of all
             schools in the neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of schools in the neighborhood have low stress
             connections to a higher percentage of people within biking
-            distance, half are connected to a lower percentage.','\n\s+',' ','g');
-
--- school pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            distance, half are connected to a lower percentage.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- school pop shed 70th percentile low stress access score
+    (
+        18,
+        'Opportunity',
         '70th percentile school population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) 
-        FROM    neighborhood_schools
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_schools.geom_pt,b.geom)
-        )),
+        schools_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to schools
             in the neighborhood to total population within the bike shed
             of each school expressed as the 70th percentile of all
             schools in the neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of schools in the neighborhood have low stress
             connections to a higher percentage of people within biking
-            distance, 70% are connected to a lower percentage.','\n\s+',' ','g');
-
--- school pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            distance, 70% are connected to a lower percentage.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- school pop shed 30th percentile low stress access score
+    (
+        19,
+        'Opportunity',
         '30th percentile school population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) 
-        FROM    neighborhood_schools
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_schools.geom_pt,b.geom)
-        )),
+        schools_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to schools
             in the neighborhood to total population within the bike shed
             of each school expressed as the 30th percentile of all
             schools in the neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of schools in the neighborhood have low stress
             connections to a higher percentage of people within biking
-            distance, 30% are connected to a lower percentage.','\n\s+',' ','g');
-
-
--------------------------------------
--- technical/vocational colleges
--------------------------------------
--- average technical/vocational college access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            distance, 30% are connected to a lower percentage.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average technical/vocational college access score
+    (
+        20,
+        'Opportunity',
         'Average score of low stress access to tech/vocational colleges',
-        CASE    WHEN SUM(colleges_high_stress) = 0 THEN 0
-                ELSE SUM(colleges_low_stress) / SUM(colleges_high_stress)
-                END,
+        blocks.colleges_average,
         regexp_replace('Number of tech/vocational colleges accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many tech/vocational colleges.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median colleges access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            low stress access to this many tech/vocational colleges.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median colleges access score
+    (
+        21,
+        'Opportunity',
         'Median score of tech/vocational college access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY colleges_low_stress::FLOAT/NULLIF(colleges_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.colleges_percentiles[1],
         regexp_replace('Score of tech/vocational colleges accessible by low stress
             compared to tech/vocational colleges accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of tech/vocational colleges within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile colleges access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile colleges access score
+    (
+        22,
+        'Opportunity',
         '70th percentile score of tech/vocational college access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY colleges_low_stress::FLOAT/NULLIF(colleges_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.colleges_percentiles[2],
         regexp_replace('Score of tech/vocational colleges accessible by low stress
             compared to tech/vocational colleges accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of tech/vocational colleges within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile colleges access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile colleges access score
+    (
+        23,
+        'Opportunity',
         '30th percentile score of tech/vocational college access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY colleges_low_stress::FLOAT/NULLIF(colleges_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.colleges_percentiles[3],
         regexp_replace('Score of tech/vocational colleges accessible by low stress
             compared to tech/vocational colleges accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of tech/vocational colleges within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_tech
-)
-SELECT  'Opportunity',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        24,
+        'Opportunity',
         'Average score of access to tech/vocational colleges',
-        SUM(CASE WHEN tmp_pop.tech = 0 THEN 0 ELSE pop10 * colleges_score / tmp_pop.tech END),
+        blocks.colleges_weighted,
         regexp_replace('Average tech/vocational colleges score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this tech/vocational colleges score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- college pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+        'tech'
+    ),
+    -- college pop shed average low stress access score
+    (
+        25,
+        'Opportunity',
         'Average college bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        colleges_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of tech/vocational colleges in the neighborhood expressed as an average of
             all colleges in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, colleges in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_colleges
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_colleges.geom_pt,b.geom)
-        );
-
--- college pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- college pop shed median low stress access score
+    (
+        26,
+        'Opportunity',
         'Median tech/vocational college population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) 
-        FROM    neighborhood_colleges
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_colleges.geom_pt,b.geom)
-        )),
+        colleges_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to tech/vocational colleges
             in the neighborhood to total population within the bike shed
             of each college expressed as a median of all
@@ -640,21 +760,15 @@ SELECT  'Opportunity',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one tech/vocational college exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- college pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- college pop shed 70th percentile low stress access score
+    (
+        27,
+        'Opportunity',
         '70th percentile tech/vocational college population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) 
-        FROM    neighborhood_colleges
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_colleges.geom_pt,b.geom)
-        )),
+        colleges_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to tech/vocational colleges
             in the neighborhood to total population within the bike shed
             of each college expressed as the 70th percentile of all
@@ -663,21 +777,15 @@ SELECT  'Opportunity',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one tech/vocational college exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- college pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- college pop shed 30th percentile low stress access score
+    (
+        28,
+        'Opportunity',
         '30th percentile tech/vocational college population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0)) 
-        FROM    neighborhood_colleges
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_colleges.geom_pt,b.geom)
-        )),
+        colleges_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to tech/vocational colleges
             in the neighborhood to total population within the bike shed
             of each college expressed as the 30th percentile of all
@@ -686,152 +794,100 @@ SELECT  'Opportunity',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one tech/vocational college exists this is the score for that one
-            location)','\n\s+',' ','g');
-
-
--------------------------------------
--- universities
--------------------------------------
--- average university access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average university access score
+    (
+        29,
+        'Opportunity',
         'Average score of low stress access to universities',
-        CASE    WHEN SUM(universities_high_stress) = 0 THEN 0
-                ELSE SUM(universities_low_stress) / SUM(universities_high_stress)
-                END,
+        blocks.universities_average,
         regexp_replace('Number of universities accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many universities.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median universities access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            low stress access to this many universities.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median universities access score
+    (
+        30,
+        'Opportunity',
         'Median score of university access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY universities_low_stress::FLOAT/NULLIF(universities_high_stress,0)) 
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.universities_percentiles[1],
         regexp_replace('Score of universities accessible by low stress
             compared to universities accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of universities within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile universities access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile universities access score
+    (
+        31,
+        'Opportunity',
         '70th percentile score of university access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY universities_low_stress::FLOAT/NULLIF(universities_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.universities_percentiles[2],
         regexp_replace('Score of universities accessible by low stress
             compared to universities accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of universities within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile universities access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile universities access score
+    (
+        32,
+        'Opportunity',
         '30th percentile score of university access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY universities_low_stress::FLOAT/NULLIF(universities_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.universities_percentiles[3],
         regexp_replace('Score of universities accessible by low stress
             compared to universities accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of universities within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_univ
-)
-SELECT  'Opportunity',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        33,
+        'Opportunity',
         'Average score of access to universities',
-        SUM(CASE WHEN tmp_pop.univ = 0 THEN 0 ELSE pop10 * universities_score / tmp_pop.univ END),
+        blocks.universities_weighted,
         regexp_replace('Average universities score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this universities score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- university pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+        'univ'
+    ),
+    -- university pop shed average low stress access score
+    (
+        34,
+        'Opportunity',
         'Average university bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        universities_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of universities in the neighborhood expressed as an average of
             all universities in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, universities in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_universities
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_universities.geom_pt,b.geom)
-        );
-
--- university pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- university pop shed median low stress access score
+    (
+        35,
+        'Opportunity',
         'Median university population shed score',
-       (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_universities
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_universities.geom_pt,b.geom)
-        )),
+        universities_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to universities
             in the neighborhood to total population within the bike shed
             of each university expressed as a median of all
@@ -840,21 +896,15 @@ SELECT  'Opportunity',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one university exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- university pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- university pop shed 70th percentile low stress access score
+    (
+        36,
+        'Opportunity',
         '70th percentile university population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_universities
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_universities.geom_pt,b.geom)
-        )),
+        universities_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to universities
             in the neighborhood to total population within the bike shed
             of each university expressed as the 70th percentile of all
@@ -863,21 +913,15 @@ SELECT  'Opportunity',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one university exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- university pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Opportunity',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- university pop shed 30th percentile low stress access score
+    (
+        37,
+        'Opportunity',
         '30th percentile university population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_universities
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_universities.geom_pt,b.geom)
-        )),
+        universities_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to universities
             in the neighborhood to total population within the bike shed
             of each university expressed as the 30th percentile of all
@@ -886,152 +930,100 @@ SELECT  'Opportunity',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one university exists this is the score for that one
-            location)','\n\s+',' ','g');
-
-
--------------------------------------
--- doctors
--------------------------------------
--- average doctors access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average doctors access score
+    (
+        38,
+        'Core Services',
         'Average score of low stress access to doctors',
-        CASE    WHEN SUM(doctors_high_stress) = 0 THEN 0
-                ELSE SUM(doctors_low_stress) / SUM(doctors_high_stress)
-                END,
+        blocks.doctors_average,
         regexp_replace('Number of doctors accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many doctors.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median doctors access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            low stress access to this many doctors.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median doctors access score
+    (
+        39,
+        'Core Services',
         'Median score of doctors access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY doctors_low_stress::FLOAT/NULLIF(doctors_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.doctors_percentiles[1],
         regexp_replace('Score of doctors accessible by low stress
             compared to doctors accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of doctors within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile doctors access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile doctors access score
+    (
+        40,
+        'Core Services',
         '70th percentile score of doctors access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY doctors_low_stress::FLOAT/NULLIF(doctors_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.doctors_percentiles[2],
         regexp_replace('Score of doctors accessible by low stress
             compared to doctors accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of doctors within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile doctors access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile doctors access score
+    (
+        41,
+        'Core Services',
         '30th percentile score of doctors access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY doctors_low_stress::FLOAT/NULLIF(doctors_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.doctors_percentiles[3],
         regexp_replace('Score of doctors accessible by low stress
             compared to doctors accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of doctors within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_doctor
-)
-SELECT  'Core Services',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        42,
+        'Core Services',
         'Average score of access to doctors',
-        SUM(CASE WHEN tmp_pop.doctor = 0 THEN 0 ELSE pop10 * doctors_score / tmp_pop.doctor END),
+        blocks.doctors_weighted,
         regexp_replace('Average doctors score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this doctors score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- doctors pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+        'doctor'
+    ),
+    -- doctors pop shed average low stress access score
+    (
+        43,
+        'Core Services',
         'Average doctors bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        doctors_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of doctors in the neighborhood expressed as an average of
             all doctors in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, doctors in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_doctors
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_doctors.geom_pt,b.geom)
-        );
-
--- doctors pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- doctors pop shed median low stress access score
+    (
+        44,
+        'Core Services',
         'Median doctors population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_doctors
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_doctors.geom_pt,b.geom)
-        )),
+        doctors_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to doctors
             in the neighborhood to total population within the bike shed
             of each doctors office expressed as a median of all
@@ -1040,21 +1032,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one doctors office exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- doctors pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- doctors pop shed 70th percentile low stress access score
+    (
+        45,
+        'Core Services',
         '70th percentile doctors population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_doctors
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_doctors.geom_pt,b.geom)
-        )),
+        doctors_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to doctors
             in the neighborhood to total population within the bike shed
             of each doctors office expressed as the 70th percentile of all
@@ -1063,21 +1049,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one doctors exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- doctors pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- doctors pop shed 30th percentile low stress access score
+    (
+        46,
+        'Core Services',
         '30th percentile doctors population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_doctors
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_doctors.geom_pt,b.geom)
-        )),
+        doctors_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to doctors
             in the neighborhood to total population within the bike shed
             of each doctors office expressed as the 30th percentile of all
@@ -1086,151 +1066,100 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one doctors exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--------------------------------------
--- dentists
--------------------------------------
--- average dentists access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average dentists access score
+    (
+        47,
+        'Core Services',
         'Average score of low stress access to dentists',
-        CASE    WHEN SUM(dentists_high_stress) = 0 THEN 0
-                ELSE SUM(dentists_low_stress) / SUM(dentists_high_stress)
-                END,
+        blocks.dentists_average,
         regexp_replace('Number of dentists accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many dentists.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median dentists access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            low stress access to this many dentists.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median dentists access score
+    (
+        48,
+        'Core Services',
         'Median score of dentists access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY dentists_low_stress::FLOAT/NULLIF(dentists_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.dentists_percentiles[1],
         regexp_replace('Score of dentists accessible by low stress
             compared to dentists accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of dentists within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile dentists access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile dentists access score
+    (
+        49,
+        'Core Services',
         '70th percentile score of dentists access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY dentists_low_stress::FLOAT/NULLIF(dentists_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.dentists_percentiles[2],
         regexp_replace('Score of dentists accessible by low stress
             compared to dentists accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of dentists within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile dentists access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile dentists access score
+    (
+        50,
+        'Core Services',
         '30th percentile score of dentists access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY dentists_low_stress::FLOAT/NULLIF(dentists_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.dentists_percentiles[3],
         regexp_replace('Score of dentists accessible by low stress
             compared to dentists accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of dentists within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_dentist
-)
-SELECT  'Core Services',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        51,
+        'Core Services',
         'Average score of access to dentists',
-        SUM(CASE WHEN tmp_pop.dentist = 0 THEN 0 ELSE pop10 * dentists_score / tmp_pop.dentist END),
+        blocks.dentists_weighted,
         regexp_replace('Average dentists score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this dentists score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- dentists pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+        'dentist'
+    ),
+    -- dentists pop shed average low stress access score
+    (
+        52,
+        'Core Services',
         'Average dentists bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        dentists_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of dentists in the neighborhood expressed as an average of
             all dentists in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, dentists in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_dentists
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_dentists.geom_pt,b.geom)
-        );
-
--- dentists pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- dentists pop shed median low stress access score
+    (
+        53,
+        'Core Services',
         'Median dentists population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_dentists
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_dentists.geom_pt,b.geom)
-        )),
+        dentists_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to dentists
             in the neighborhood to total population within the bike shed
             of each dentists office expressed as a median of all
@@ -1239,21 +1168,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one dentists office exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- dentists pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- dentists pop shed 70th percentile low stress access score
+    (
+        54,
+        'Core Services',
         '70th percentile dentists population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_dentists
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_dentists.geom_pt,b.geom)
-        )),
+        dentists_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to dentists
             in the neighborhood to total population within the bike shed
             of each dentists office expressed as the 70th percentile of all
@@ -1262,21 +1185,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one dentists office exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- dentists pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- dentists pop shed 30th percentile low stress access score
+    (
+        55,
+        'Core Services',
         '30th percentile dentists population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_dentists
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_dentists.geom_pt,b.geom)
-        )),
+        dentists_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to dentists
             in the neighborhood to total population within the bike shed
             of each dentists office expressed as the 30th percentile of all
@@ -1285,151 +1202,100 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one dentists office exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--------------------------------------
--- hospitals
--------------------------------------
--- average hospitals access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average hospitals access score
+    (
+        56,
+        'Core Services',
         'Average score of low stress access to hospitals',
-        CASE    WHEN SUM(hospitals_high_stress) = 0 THEN 0
-                ELSE SUM(hospitals_low_stress) / SUM(hospitals_high_stress)
-                END,
+        blocks.hospitals_average,
         regexp_replace('Number of hospitals accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many hospitals.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median hospitals access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            low stress access to this many hospitals.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median hospitals access score
+    (
+        57,
+        'Core Services',
         'Median score of hospitals access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY hospitals_low_stress::FLOAT/NULLIF(hospitals_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.hospitals_percentiles[1],
         regexp_replace('Score of hospitals accessible by low stress
             compared to hospitals accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of hospitals within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile hospitals access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile hospitals access score
+    (
+        58,
+        'Core Services',
         '70th percentile score of hospitals access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY hospitals_low_stress::FLOAT/NULLIF(hospitals_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.hospitals_percentiles[2],
         regexp_replace('Score of hospitals accessible by low stress
             compared to hospitals accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of hospitals within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile hospitals access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
-        '30th percentile score of hospitals access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY hospitals_low_stress::FLOAT/NULLIF(hospitals_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile hospitals access score
+    (
+        59,
+        'Core Services',
+        '30th percentile score of hospitals access',
+        blocks.hospitals_percentiles[3],
         regexp_replace('Score of hospitals accessible by low stress
             compared to hospitals accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of hospitals within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_hospital
-)
-SELECT  'Core Services',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        60,
+        'Core Services',
         'Average score of access to hospitals',
-        SUM(CASE WHEN tmp_pop.hospital = 0 THEN 0 ELSE pop10 * hospitals_score / tmp_pop.hospital END),
+        blocks.hospitals_weighted,
         regexp_replace('Average hospital score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this hospital score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- hospitals pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+        'hospital'
+    ),
+    -- hospitals pop shed average low stress access score
+    (
+        61,
+        'Core Services',
         'Average hospitals bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        hospitals_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of hospitals in the neighborhood expressed as an average of
             all hospitals in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, hospitals in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_hospitals
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_hospitals.geom_pt,b.geom)
-        );
-
--- hospitals pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- hospitals pop shed median low stress access score
+    (
+        62,
+        'Core Services',
         'Median hospitals population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_hospitals
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_hospitals.geom_pt,b.geom)
-        )),
+        hospitals_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to hospitals
             in the neighborhood to total population within the bike shed
             of each hospital expressed as a median of all
@@ -1438,21 +1304,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one hospital exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- hospitals pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- hospitals pop shed 70th percentile low stress access score
+    (
+        63,
+        'Core Services',
         '70th percentile hospitals population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_hospitals
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_hospitals.geom_pt,b.geom)
-        )),
+        hospitals_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to hospitals
             in the neighborhood to total population within the bike shed
             of each hospital expressed as the 70th percentile of all
@@ -1461,21 +1321,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one hospital exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- hospitals pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- hospitals pop shed 30th percentile low stress access score
+    (
+        64,
+        'Core Services',
         '30th percentile hospitals population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_hospitals
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_hospitals.geom_pt,b.geom)
-        )),
+        hospitals_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to hospitals
             in the neighborhood to total population within the bike shed
             of each hospital expressed as the 30th percentile of all
@@ -1484,151 +1338,100 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one hospital exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--------------------------------------
--- pharmacies
--------------------------------------
--- average pharmacies access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average pharmacies access score
+    (
+        65,
+        'Core Services',
         'Average score of low stress access to pharmacies',
-        CASE    WHEN SUM(pharmacies_high_stress) = 0 THEN 0
-                ELSE SUM(pharmacies_low_stress) / SUM(pharmacies_high_stress)
-                END,
+        blocks.pharmacies_average,
         regexp_replace('Number of pharmacies accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many pharmacies.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median pharmacies access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            low stress access to this many pharmacies.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median pharmacies access score
+    (
+        66,
+        'Core Services',
         'Median score of pharmacies access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pharmacies_low_stress::FLOAT/NULLIF(pharmacies_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.pharmacies_percentiles[1],
         regexp_replace('Score of pharmacies accessible by low stress
             compared to pharmacies accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of pharmacies within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile pharmacies access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile pharmacies access score
+    (
+        67,
+        'Core Services',
         '70th percentile score of pharmacies access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pharmacies_low_stress::FLOAT/NULLIF(pharmacies_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.pharmacies_percentiles[2],
         regexp_replace('Score of pharmacies accessible by low stress
             compared to pharmacies accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of pharmacies within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile pharmacies access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile pharmacies access score
+    (
+        68,
+        'Core Services',
         '30th percentile score of pharmacies access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pharmacies_low_stress::FLOAT/NULLIF(pharmacies_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.pharmacies_percentiles[3],
         regexp_replace('Score of pharmacies accessible by low stress
             compared to pharmacies accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of pharmacies within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_pharmacy
-)
-SELECT  'Core Services',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        69,
+        'Core Services',
         'Average score of access to pharmacies',
-        SUM(CASE WHEN tmp_pop.pharmacy = 0 THEN 0 ELSE pop10 * pharmacies_score / tmp_pop.pharmacy END),
+        blocks.pharmacies_weighted,
         regexp_replace('Average pharmacies score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this pharmacies score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- pharmacies pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+        'pharmacy'
+    ),
+    -- pharmacies pop shed average low stress access score
+    (
+        70,
+        'Core Services',
         'Average pharmacies bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        pharmacies_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of pharmacies in the neighborhood expressed as an average of
             all pharmacies in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, pharmacies in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_pharmacies
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_pharmacies.geom_pt,b.geom)
-        );
-
--- pharmacies pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- pharmacies pop shed median low stress access score
+    (
+        71,
+        'Core Services',
         'Median pharmacies population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_pharmacies
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_pharmacies.geom_pt,b.geom)
-        )),
+        pharmacies_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to pharmacies
             in the neighborhood to total population within the bike shed
             of each pharmacy expressed as a median of all
@@ -1637,21 +1440,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one pharmacy exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- pharmacies pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- pharmacies pop shed 70th percentile low stress access score
+    (
+        72,
+        'Core Services',
         '70th percentile pharmacies population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_pharmacies
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_pharmacies.geom_pt,b.geom)
-        )),
+        pharmacies_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to pharmacies
             in the neighborhood to total population within the bike shed
             of each pharmacy expressed as the 70th percentile of all
@@ -1660,21 +1457,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one pharmacy exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- pharmacies pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- pharmacies pop shed 30th percentile low stress access score
+    (
+        73,
+        'Core Services',
         '30th percentile pharmacies population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_pharmacies
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_pharmacies.geom_pt,b.geom)
-        )),
+        pharmacies_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to pharmacies
             in the neighborhood to total population within the bike shed
             of each pharmacy expressed as the 30th percentile of all
@@ -1683,151 +1474,100 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one pharmacy exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--------------------------------------
--- retail
--------------------------------------
--- average retail access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Retail',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average retail access score
+    (
+        74,
+        'Retail',
         'Average score of low stress access to retail',
-        CASE    WHEN SUM(retail_high_stress) = 0 THEN 0
-                ELSE SUM(retail_low_stress) / SUM(retail_high_stress)
-                END,
+        blocks.retail_average,
         regexp_replace('Number of retail accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many retail.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median retail access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Retail',
+            low stress access to this many retail.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median retail access score
+    (
+        75,
+        'Retail',
         'Median score of retail access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY retail_low_stress::FLOAT/NULLIF(retail_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.retail_percentiles[1],
         regexp_replace('Score of retail accessible by low stress
             compared to retail accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of retail within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile retail access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Retail',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile retail access score
+    (
+        76,
+        'Retail',
         '70th percentile score of retail access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY retail_low_stress::FLOAT/NULLIF(retail_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.retail_percentiles[2],
         regexp_replace('Score of retail accessible by low stress
             compared to retail accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of retail within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile retail access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Retail',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile retail access score
+    (
+        77,
+        'Retail',
         '30th percentile score of retail access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY retail_low_stress::FLOAT/NULLIF(retail_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.retail_percentiles[3],
         regexp_replace('Score of retail accessible by low stress
             compared to retail accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of retail within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_retail
-)
-SELECT  'Retail',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        78,
+        'Retail',
         'Average score of access to retail',
-        SUM(CASE WHEN tmp_pop.retail = 0 THEN 0 ELSE pop10 * retail_score / tmp_pop.retail END),
+        blocks.retail_weighted,
         regexp_replace('Average retail score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this retail score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- retail pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Retail',
+        'retail'
+    ),
+    -- retail pop shed average low stress access score
+    (
+        79,
+        'Retail',
         'Average retail bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        retail_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of retail clusters in the neighborhood expressed as an average of
             all retail clusters in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, retail clusters in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_retail
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_retail.geom_poly,b.geom)
-        );
-
--- retail pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Retail',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- retail pop shed median low stress access score
+    (
+        80,
+        'Retail',
         'Median retail population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_retail
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_retail.geom_poly,b.geom)
-        )),
+        retail_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to retail
             in the neighborhood to total population within the bike shed
             of each retail cluster expressed as a median of all
@@ -1836,21 +1576,15 @@ SELECT  'Retail',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one retail exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- retail pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Retail',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- retail pop shed 70th percentile low stress access score
+    (
+        81,
+        'Retail',
         '70th percentile retail population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_retail
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_retail.geom_poly,b.geom)
-        )),
+        retail_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to retail
             in the neighborhood to total population within the bike shed
             of each retail cluster expressed as the 70th percentile of all
@@ -1859,21 +1593,15 @@ SELECT  'Retail',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one retail exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- retail pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Retail',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- retail pop shed 30th percentile low stress access score
+    (
+        82,
+        'Retail',
         '30th percentile retail population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_retail
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_retail.geom_poly,b.geom)
-        )),
+        retail_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to retail
             in the neighborhood to total population within the bike shed
             of each retail cluster expressed as the 30th percentile of all
@@ -1882,151 +1610,100 @@ SELECT  'Retail',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one retail exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--------------------------------------
--- supermarkets
--------------------------------------
--- average supermarkets access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average supermarkets access score
+    (
+        83,
+        'Core Services',
         'Average score of low stress access to supermarkets',
-        CASE    WHEN SUM(supermarkets_high_stress) = 0 THEN 0
-                ELSE SUM(supermarkets_low_stress) / SUM(supermarkets_high_stress)
-                END,
+        blocks.supermarkets_average,
         regexp_replace('Number of supermarkets accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many supermarkets.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median supermarkets access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            low stress access to this many supermarkets.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median supermarkets access score
+    (
+        84,
+        'Core Services',
         'Median score of supermarkets access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY supermarkets_low_stress::FLOAT/NULLIF(supermarkets_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.supermarkets_percentiles[1],
         regexp_replace('Score of supermarkets accessible by low stress
             compared to supermarkets accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of supermarkets within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile supermarkets access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile supermarkets access score
+    (
+        85,
+        'Core Services',
         '70th percentile score of supermarkets access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY supermarkets_low_stress::FLOAT/NULLIF(supermarkets_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.supermarkets_percentiles[2],
         regexp_replace('Score of supermarkets accessible by low stress
             compared to supermarkets accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of supermarkets within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile supermarkets access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile supermarkets access score
+    (
+        86,
+        'Core Services',
         '30th percentile score of supermarkets access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY supermarkets_low_stress::FLOAT/NULLIF(supermarkets_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.supermarkets_percentiles[3],
         regexp_replace('Score of supermarkets accessible by low stress
             compared to supermarkets accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of supermarkets within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_grocery
-)
-SELECT  'Core Services',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        87,
+        'Core Services',
         'Average score of access to grocery stores',
-        SUM(CASE WHEN tmp_pop.grocery = 0 THEN 0 ELSE pop10 * supermarkets_score / tmp_pop.grocery END),
+        blocks.supermarkets_weighted,
         regexp_replace('Average grocery score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this grocery score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- supermarkets pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+        'grocery'
+    ),
+    -- supermarkets pop shed average low stress access score
+    (
+        88,
+        'Core Services',
         'Average supermarkets bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        supermarkets_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of supermarkets in the neighborhood expressed as an average of
             all supermarkets in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, supermarkets in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_supermarkets
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_supermarkets.geom_pt,b.geom)
-        );
-
--- supermarkets pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- supermarkets pop shed median low stress access score
+    (
+        89,
+        'Core Services',
         'Median supermarkets population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_supermarkets
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_supermarkets.geom_pt,b.geom)
-        )),
+        supermarkets_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to supermarkets
             in the neighborhood to total population within the bike shed
             of each supermarket expressed as a median of all
@@ -2035,21 +1712,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one supermarkets exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- supermarkets pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- supermarkets pop shed 70th percentile low stress access score
+    (
+        90,
+        'Core Services',
         '70th percentile supermarkets population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_supermarkets
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_supermarkets.geom_pt,b.geom)
-        )),
+        supermarkets_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to supermarkets
             in the neighborhood to total population within the bike shed
             of each supermarket expressed as the 70th percentile of all
@@ -2058,21 +1729,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one supermarkets exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- supermarkets pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- supermarkets pop shed 30th percentile low stress access score
+    (
+        91,
+        'Core Services',
         '30th percentile supermarkets population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_supermarkets
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_supermarkets.geom_pt,b.geom)
-        )),
+        supermarkets_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to supermarkets
             in the neighborhood to total population within the bike shed
             of each supermarket expressed as the 30th percentile of all
@@ -2081,151 +1746,100 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one supermarkets exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--------------------------------------
--- social_services
--------------------------------------
--- average social_services access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average social_services access score
+    (
+        92,
+        'Core Services',
         'Average score of low stress access to social services',
-        CASE    WHEN SUM(social_services_high_stress) = 0 THEN 0
-                ELSE SUM(social_services_low_stress) / SUM(social_services_high_stress)
-                END,
+        blocks.social_services_average,
         regexp_replace('Number of social services accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many social services.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median social_services access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            low stress access to this many social services.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median social_services access score
+    (
+        93,
+        'Core Services',
         'Median score of social services access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY social_services_low_stress::FLOAT/NULLIF(social_services_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.social_services_percentiles[1],
         regexp_replace('Score of social services accessible by low stress
             compared to social services accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of social services within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile social_services access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile social_services access score
+    (
+        94,
+        'Core Services',
         '70th percentile score of social services access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY social_services_low_stress::FLOAT/NULLIF(social_services_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.social_services_percentiles[2],
         regexp_replace('Score of social services accessible by low stress
             compared to social services accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of social services within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile social_services access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile social_services access score
+    (
+        95,
+        'Core Services',
         '30th percentile score of social services access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY social_services_low_stress::FLOAT/NULLIF(social_services_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.social_services_percentiles[3],
         regexp_replace('Score of social services accessible by low stress
             compared to social services accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of social services within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_social_svcs
-)
-SELECT  'Core Services',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        96,
+        'Core Services',
         'Average score of access to social services',
-        SUM(CASE WHEN tmp_pop.social_svcs = 0 THEN 0 ELSE pop10 * social_services_score / tmp_pop.social_svcs END),
+        blocks.social_services_weighted,
         regexp_replace('Average social services score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this social services score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- social_services pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+        'social_svcs'
+    ),
+    -- social_services pop shed average low stress access score
+    (
+        97,
+        'Core Services',
         'Average social_services bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        social_services_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of social services in the neighborhood expressed as an average of
             all social services in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, social_services in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_social_services
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_social_services.geom_pt,b.geom)
-        );
-
--- social_services pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- social_services pop shed median low stress access score
+    (
+        98,
+        'Core Services',
         'Median social_services population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_social_services
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_social_services.geom_pt,b.geom)
-        )),
+        social_services_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to social services
             in the neighborhood to total population within the bike shed
             of each social service location expressed as a median of all
@@ -2234,21 +1848,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one social_services exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- social_services pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- social_services pop shed 70th percentile low stress access score
+    (
+        99,
+        'Core Services',
         '70th percentile social_services population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_social_services
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_social_services.geom_pt,b.geom)
-        )),
+        social_services_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to social services
             in the neighborhood to total population within the bike shed
             of each social service location expressed as the 70th percentile of all
@@ -2257,21 +1865,15 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one social_services exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- social_services pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Core Services',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- social_services pop shed 30th percentile low stress access score
+    (
+        100,
+        'Core Services',
         '30th percentile social_services population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_social_services
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_social_services.geom_pt,b.geom)
-        )),
+        social_services_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to social services
             in the neighborhood to total population within the bike shed
             of each social service location expressed as the 30th percentile of all
@@ -2280,151 +1882,100 @@ SELECT  'Core Services',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one social_services exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--------------------------------------
--- parks
--------------------------------------
--- average parks access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average parks access score
+    (
+        101,
+        'Recreation',
         'Average score of low stress access to parks',
-        CASE    WHEN SUM(parks_high_stress) = 0 THEN 0
-                ELSE SUM(parks_low_stress) / SUM(parks_high_stress)
-                END,
+        blocks.parks_average,
         regexp_replace('Number of parks accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many parks.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median parks access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            low stress access to this many parks.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median parks access score
+    (
+        102,
+        'Recreation',
         'Median score of parks access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY parks_low_stress::FLOAT/NULLIF(parks_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.parks_percentiles[1],
         regexp_replace('Score of parks accessible by low stress
             compared to parks accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of parks within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile parks access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile parks access score
+    (
+        103,
+        'Recreation',
         '70th percentile score of parks access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY parks_low_stress::FLOAT/NULLIF(parks_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.parks_percentiles[2],
         regexp_replace('Score of parks accessible by low stress
             compared to parks accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of parks within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile parks access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile parks access score
+    (
+        104,
+        'Recreation',
         '30th percentile score of parks access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY parks_low_stress::FLOAT/NULLIF(parks_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.parks_percentiles[3],
         regexp_replace('Score of parks accessible by low stress
             compared to parks accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of parks within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_parks
-)
-SELECT  'Recreation',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        105,
+        'Recreation',
         'Average score of access to parks',
-        SUM(CASE WHEN tmp_pop.parks = 0 THEN 0 ELSE pop10 * parks_score / tmp_pop.parks END),
+        blocks.parks_weighted,
         regexp_replace('Average parks score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this parks score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- parks pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+        'parks'
+    ),
+    -- parks pop shed average low stress access score
+    (
+        106,
+        'Recreation',
         'Average parks bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        parks_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of parks in the neighborhood expressed as an average of
             all parks in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, parks in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_parks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_parks.geom_pt,b.geom)
-        );
-
--- parks pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- parks pop shed median low stress access score
+    (
+        107,
+        'Recreation',
         'Median parks population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_parks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_parks.geom_pt,b.geom)
-        )),
+        parks_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to parks
             in the neighborhood to total population within the bike shed
             of each parks expressed as a median of all
@@ -2433,21 +1984,15 @@ SELECT  'Recreation',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one parks exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- parks pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- parks pop shed 70th percentile low stress access score
+    (
+        108,
+        'Recreation',
         '70th percentile parks population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_parks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_parks.geom_pt,b.geom)
-        )),
+        parks_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to parks
             in the neighborhood to total population within the bike shed
             of each parks expressed as the 70th percentile of all
@@ -2456,21 +2001,15 @@ SELECT  'Recreation',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one parks exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- parks pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- parks pop shed 30th percentile low stress access score
+    (
+        109,
+        'Recreation',
         '30th percentile parks population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_parks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_parks.geom_pt,b.geom)
-        )),
+        parks_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to parks
             in the neighborhood to total population within the bike shed
             of each parks expressed as the 30th percentile of all
@@ -2479,257 +2018,170 @@ SELECT  'Recreation',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one parks exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--------------------------------------
--- trails
--------------------------------------
--- average trails access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average trails access score
+    (
+        110,
+        'Recreation',
         'Average score of low stress access to trails',
-        CASE    WHEN SUM(trails_high_stress) = 0 THEN 0
-                ELSE SUM(trails_low_stress) / SUM(trails_high_stress)
-                END,
+        blocks.trails_average,
         regexp_replace('Number of trails accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many trails.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median trails access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            low stress access to this many trails.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median trails access score
+    (
+        111,
+        'Recreation',
         'Median score of trails access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY trails_low_stress::FLOAT/NULLIF(trails_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.trails_percentiles[1],
         regexp_replace('Score of trails accessible by low stress
             compared to trails accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of trails within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile trails access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile trails access score
+    (
+        112,
+        'Recreation',
         '70th percentile score of trails access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY trails_low_stress::FLOAT/NULLIF(trails_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.trails_percentiles[2],
         regexp_replace('Score of trails accessible by low stress
             compared to trails accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of trails within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile trails access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile trails access score
+    (
+        113,
+        'Recreation',
         '30th percentile score of trails access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY trails_low_stress::FLOAT/NULLIF(trails_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.trails_percentiles[3],
         regexp_replace('Score of trails accessible by low stress
             compared to trails accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of trails within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_trails
-)
-SELECT  'Recreation',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        114,
+        'Recreation',
         'Average score of access to trails',
-        SUM(CASE WHEN tmp_pop.trails = 0 THEN 0 ELSE pop10 * trails_score / tmp_pop.trails END),
+        blocks.trails_weighted,
         regexp_replace('Average trails score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this trails score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
--------------------------------------
--- community_centers
--------------------------------------
--- average community_centers access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+        'trails'
+    ),
+    -- average community_centers access score
+    (
+        115,
+        'Recreation',
         'Average score of low stress access to community centers',
-        CASE    WHEN SUM(community_centers_high_stress) = 0 THEN 0
-                ELSE SUM(community_centers_low_stress) / SUM(community_centers_high_stress)
-                END,
+        blocks.community_centers_average,
         regexp_replace('Number of community centers accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many community centers.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median community centers access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            low stress access to this many community centers.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median community centers access score
+    (
+        116,
+        'Recreation',
         'Median score of community centers access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY community_centers_low_stress::FLOAT/NULLIF(community_centers_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.community_centers_percentiles[1],
         regexp_replace('Score of community centers accessible by low stress
             compared to community centers accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of community centers within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile community centers access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile community centers access score
+    (
+        117,
+        'Recreation',
         '70th percentile score of community centers access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY community_centers_low_stress::FLOAT/NULLIF(community_centers_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.community_centers_percentiles[2],
         regexp_replace('Score of community centers accessible by low stress
             compared to community centers accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of community centers within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile community centers access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile community centers access score
+    (
+        118,
+        'Recreation',
         '30th percentile score of community centers access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY community_centers_low_stress::FLOAT/NULLIF(community_centers_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.community_centers_percentiles[3],
         regexp_replace('Score of community centers accessible by low stress
             compared to community centers accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of community centers within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_comm_ctrs
-)
-SELECT  'Recreation',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        119,
+        'Recreation',
         'Average score of access to community centers',
-        SUM(CASE WHEN tmp_pop.comm_ctrs = 0 THEN 0 ELSE pop10 * community_centers_score / tmp_pop.comm_ctrs END),
+        blocks.community_centers_weighted,
         regexp_replace('Average community centers score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this community centers score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- community centers pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+        'comm_ctrs'
+    ),
+    -- community centers pop shed average low stress access score
+    (
+        120,
+        'Recreation',
         'Average community centers bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        community_centers_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of community centers in the neighborhood expressed as an average of
             all community centers in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, community centers in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_community_centers
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_community_centers.geom_pt,b.geom)
-        );
-
--- community centers pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- community centers pop shed median low stress access score
+    (
+        121,
+        'Recreation',
         'Median community centers population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_community_centers
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_community_centers.geom_pt,b.geom)
-        )),
+        community_centers_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to community centers
             in the neighborhood to total population within the bike shed
             of each community centers expressed as a median of all
@@ -2738,21 +2190,15 @@ SELECT  'Recreation',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one community centers exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- community centers pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- community centers pop shed 70th percentile low stress access score
+    (
+        122,
+        'Recreation',
         '70th percentile community centers population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_community_centers
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_community_centers.geom_pt,b.geom)
-        )),
+        community_centers_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to community centers
             in the neighborhood to total population within the bike shed
             of each community centers expressed as the 70th percentile of all
@@ -2761,21 +2207,15 @@ SELECT  'Recreation',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one community centers exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- community centers pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Recreation',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- community centers pop shed 30th percentile low stress access score
+    (
+        123,
+        'Recreation',
         '30th percentile community centers population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_community_centers
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_community_centers.geom_pt,b.geom)
-        )),
+        community_centers_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to community centers
             in the neighborhood to total population within the bike shed
             of each community centers expressed as the 30th percentile of all
@@ -2784,151 +2224,100 @@ SELECT  'Recreation',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one community centers exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--------------------------------------
--- transit
--------------------------------------
--- average transit access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Transit',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- average transit access score
+    (
+        124,
+        'Transit',
         'Average score of low stress access to transit',
-        CASE    WHEN SUM(transit_high_stress) = 0 THEN 0
-                ELSE SUM(transit_low_stress) / SUM(transit_high_stress)
-                END,
+        blocks.transit_average,
         regexp_replace('Number of transit stations accessible by low stress
             expressed as an average of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood have
-            low stress access to this many transit stations.','\n\s+',' ','g')
-FROM    neighborhood_census_blocks
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- median transit access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Transit',
+            low stress access to this many transit stations.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- median transit access score
+    (
+        125,
+        'Transit',
         'Median score of transit access',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY transit_low_stress::FLOAT/NULLIF(transit_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.transit_percentiles[1],
         regexp_replace('Score of transit stations accessible by low stress
             compared to transit stations accessible by high stress
             expressed as the median of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('Half of census blocks in this neighborhood
             have low stress access to a higher ratio of transit stations within
-            biking distance, half have access to a lower ratio.','\n\s+',' ','g');
-
--- 70th percentile transit access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Transit',
+            biking distance, half have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 70th percentile transit access score
+    (
+        126,
+        'Transit',
         '70th percentile score of transit access',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY transit_low_stress::FLOAT/NULLIF(transit_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.transit_percentiles[2],
         regexp_replace('Score of transit stations accessible by low stress
             compared to transit stations accessible by high stress
             expressed as the 70th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('30% of census blocks in this neighborhood
             have low stress access to a higher ratio of transit stations within
-            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g');
-
--- 30th percentile transit access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Transit',
+            biking distance, 70% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- 30th percentile transit access score
+    (
+        127,
+        'Transit',
         '30th percentile score of transit access',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY transit_low_stress::FLOAT/NULLIF(transit_high_stress,0))
-        FROM    neighborhood_census_blocks
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        )),
+        blocks.transit_percentiles[3],
         regexp_replace('Score of transit stations accessible by low stress
             compared to transit stations accessible by high stress
             expressed as the 30th percentile of all census blocks in the
             neighborhood','\n\s+',' ','g'),
         regexp_replace('70% of census blocks in this neighborhood
             have low stress access to a higher ratio of transit stations within
-            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g');
-
--- population weighted census block score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation, use_transit
-)
-SELECT  'Transit',
+            biking distance, 30% have access to a lower ratio.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- population weighted census block score
+    (
+        128,
+        'Transit',
         'Average score of access to transit',
-        SUM(CASE WHEN tmp_pop.transit = 0 THEN 0 ELSE pop10 * transit_score / tmp_pop.transit END),
+        blocks.transit_weighted,
         regexp_replace('Average transit score for census blocks
             weighted by population.','\n\s+',' ','g'),
         regexp_replace('On average, census blocks in the neighborhood received
             this transit score.','\n\s+',' ','g'),
-        True
-FROM    neighborhood_census_blocks,
-        tmp_pop
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_census_blocks.geom,b.geom)
-        );
-
--- transit pop shed average low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Transit',
+        'transit'
+    ),
+    -- transit pop shed average low stress access score
+    (
+        129,
+        'Transit',
         'Average transit bike shed access score',
-        CASE    WHEN SUM(pop_high_stress) = 0 THEN 0
-                ELSE SUM(pop_low_stress)::FLOAT / SUM(pop_high_stress)
-                END,
+        transit_shed.average,
         regexp_replace('Score of population with low stress access
             compared to total population within the bike shed distance
             of transit stations in the neighborhood expressed as an average of
             all transit stations in the neighborhood','\n\s+',' ','g'),
         regexp_replace('On average, transit stations in the neighborhood are
             connected by the low stress access to this percentage people
-            within biking distance.','\n\s+',' ','g')
-FROM    neighborhood_transit
-WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_transit.geom_pt,b.geom)
-        );
-
--- transit pop shed median low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Transit',
+            within biking distance.','\n\s+',' ','g'),
+        NULL
+    ),
+    -- transit pop shed median low stress access score
+    (
+        130,
+        'Transit',
         'Median transit population shed score',
-        (SELECT  PERCENTILE_CONT(0.5) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_transit
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_transit.geom_pt,b.geom)
-        )),
+        transit_shed.percentiles[1],
         regexp_replace('Score of population with low stress access to transit stations
             in the neighborhood to total population within the bike shed
             of each transit stations expressed as a median of all
@@ -2937,21 +2326,15 @@ SELECT  'Transit',
             connections to a higher percentage of people within biking
             distance, half are connected to a lower percentage.
             (if only one transit station exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- transit pop shed 70th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Transit',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- transit pop shed 70th percentile low stress access score
+    (
+        131,
+        'Transit',
         '70th percentile transit population shed score',
-        (SELECT  PERCENTILE_CONT(0.7) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_transit
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_transit.geom_pt,b.geom)
-        )),
+        transit_shed.percentiles[2],
         regexp_replace('Score of population with low stress access to transit stations
             in the neighborhood to total population within the bike shed
             of each transit stations expressed as the 70th percentile of all
@@ -2960,21 +2343,15 @@ SELECT  'Transit',
             connections to a higher percentage of people within biking
             distance, 70% are connected to a lower percentage.
             (if only one transit station exists this is the score for that one
-            location)','\n\s+',' ','g');
-
--- transit pop shed 30th percentile low stress access score
-INSERT INTO generated.neighborhood_score_inputs (
-    category, score_name, score, notes, human_explanation
-)
-SELECT  'Transit',
+            location)','\n\s+',' ','g'),
+        NULL
+    ),
+    -- transit pop shed 30th percentile low stress access score
+    (
+        132,
+        'Transit',
         '30th percentile transit population shed score',
-        (SELECT  PERCENTILE_CONT(0.3) WITHIN GROUP(ORDER BY pop_low_stress::FLOAT/NULLIF(pop_high_stress,0))
-        FROM    neighborhood_transit
-        WHERE   EXISTS (
-            SELECT  1
-            FROM    neighborhood_boundary AS b
-            WHERE   ST_Intersects(neighborhood_transit.geom_pt,b.geom)
-        )),
+        transit_shed.percentiles[3],
         regexp_replace('Score of population with low stress access to transit stations
             in the neighborhood to total population within the bike shed
             of each transit stations expressed as the 30th percentile of all
@@ -2983,4 +2360,13 @@ SELECT  'Transit',
             connections to a higher percentage of people within biking
             distance, 30% are connected to a lower percentage.
             (if only one transit station exists this is the score for that one
-            location)','\n\s+',' ','g');
+            location)','\n\s+',' ','g'),
+        NULL
+    )
+) AS inputs (position, category, score_name, score, notes, human_explanation, use_flag)
+ORDER BY inputs.position;
+
+DROP TABLE tmp_blocks;
+DROP TABLE tmp_pop;
+DROP TABLE tmp_block_stats;
+DROP TABLE tmp_shed_stats;
@@ -0,0 +1,34 @@
+----------------------------------------
+-- Create the tables of the analysis as UNLOGGED, for the databases thrown
+-- away at the end of the run: they skip the WAL, but their content is lost
+-- if the server crashes.
+--
+-- The tables created by the SQL files, the import tools and pg_restore are
+-- converted right after their creation, while they are still empty (except
+-- for CREATE TABLE AS).
+----------------------------------------
+CREATE OR REPLACE FUNCTION public.set_tables_unlogged()
+RETURNS event_trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    created RECORD;
+BEGIN
+    FOR created IN
+        SELECT  commands.objid::REGCLASS AS table_name
+        FROM    pg_event_trigger_ddl_commands() commands
+        JOIN    pg_class ON pg_class.oid = commands.objid
+        WHERE   commands.object_type = 'table'
+        AND     commands.schema_name IN ('generated','received','scratch')
+        AND     pg_class.relpersistence = 'p'
+    LOOP
+        EXECUTE format('ALTER TABLE %s SET UNLOGGED;', created.table_name);
+    END LOOP;
+END;
+$$;
+
+DROP EVENT TRIGGER IF EXISTS unlogged_tables;
+CREATE EVENT TRIGGER unlogged_tables
+ON ddl_command_end
+WHEN TAG IN ('CREATE TABLE', 'CREATE TABLE AS', 'SELECT INTO')
+EXECUTE FUNCTION public.set_tables_unlogged();
@@ -0,0 +1,5 @@
+----------------------------------------
+-- INPUTS
+-- location: neighborhood
+----------------------------------------
+DELETE FROM neighborhood_osm_full_line WHERE bicycle='no' and highway='path';
@@ -0,0 +1,581 @@
+----------------------------------------
+-- INPUTS
+-- location: neighborhood
+-- Features of the road segments derived from their OSM tags: one way,
+-- width, functional class, speed limit, lanes, parking and bike
+-- infrastructure. The tags of each way are read once, all the features
+-- are computed together, then written in a single update.
+----------------------------------------
+DROP TABLE IF EXISTS tmp_road_features;
+
+CREATE TEMP TABLE tmp_road_features AS
+SELECT  w.road_id,
+        base.one_way_car,
+        base.width_ft,
+        -- adjust functional class on residential and unclassified with bike
+        -- facilities or multiple travel lanes to be tertiary
+        CASE
+        WHEN class.functional_class IN ('residential','unclassified')
+        AND  (
+                segment.ft_bike_infra IN ('track','buffered_lane','lane')
+            OR  segment.tf_bike_infra IN ('track','buffered_lane','lane')
+            OR  segment.ft_lanes > 1
+            OR  segment.tf_lanes > 1
+            OR  segment.speed_limit >= 30
+            )
+            THEN 'tertiary'
+        ELSE class.functional_class
+        END AS functional_class,
+        class.xwalk,
+        segment.speed_limit,
+        segment.ft_lanes,
+        segment.tf_lanes,
+        segment.ft_cross_lanes,
+        segment.tf_cross_lanes,
+        segment.twltl_cross_lanes,
+        segment.ft_park,
+        segment.tf_park,
+        segment.ft_bike_infra,
+        segment.tf_bike_infra,
+        bike.one_way,
+        bike.ft_bike_infra_width,
+        bike.tf_bike_infra_width
+FROM    neighborhood_ways w
+LEFT JOIN neighborhood_osm_full_line osm
+    ON  osm.osm_id = w.osm_id
+CROSS JOIN LATERAL (
+            SELECT  CASE
+                    WHEN trim(osm.oneway) IN ('1','yes') THEN 'ft'
+                    WHEN trim(osm.oneway) = '-1' THEN 'tf'
+                    END AS one_way_car,
+                    -- no units (default=meters) take precedence when under 20,
+                    -- anything more being likely either bogus or not in meters
+                    CASE
+                    WHEN substring(osm.width from '\d+\.?\d?\d?')::FLOAT < 20
+                        THEN 3.28084 * substring(osm.width from '\d+\.?\d?\d?')::FLOAT
+                    WHEN osm.width LIKE '% m'
+                        THEN 3.28084 * substring(osm.width from '\d+\.?\d?\d?')::FLOAT
+                    WHEN osm.width LIKE '% ft'
+                        THEN substring(osm.width from '\d+\.?\d?\d?')::FLOAT
+                    END::INT AS width_ft
+        ) base
+CROSS JOIN LATERAL (
+            SELECT  CASE
+                    WHEN osm.highway IN (
+                            'motorway',
+                            'tertiary',
+                            'trunk',
+                            'tertiary_link',
+                            'motorway_link',
+                            'secondary_link',
+                            'primary_link',
+                            'trunk_link',
+                            'unclassified',
+                            'residential',
+                            'secondary',
+                            'primary',
+                            'living_street'
+                        )
+                        THEN osm.highway
+                    WHEN osm.highway = 'track' AND osm.tracktype = 'grade1'
+                        THEN 'track'
+                    WHEN osm.highway IN ('cycleway','path')
+                        THEN 'path'
+                    WHEN osm.highway = 'footway' AND osm.footway = 'crossing'
+                        THEN 'path'
+                    WHEN osm.highway = 'footway'
+                    AND  osm.bicycle IN ('yes','permissive', 'designated')
+                    AND  (osm.access IS NULL OR osm.access NOT IN ('no','private'))
+                    AND  COALESCE(base.width_ft,0) >= 8
+                        THEN 'path'
+                    WHEN osm.highway = 'service'
+                    AND  osm.bicycle IN ('yes','permissive', 'designated')
+                        THEN 'path'
+                    WHEN osm.highway = 'pedestrian'
+                    AND  osm.bicycle IN ('yes','permissive', 'designated')
+                    AND  (osm.access IS NULL OR osm.access NOT IN ('no','private'))
+                        THEN 'living_street'
+                    END AS functional_class,
+                    CASE
+                    WHEN osm.highway = 'footway' AND osm.footway = 'crossing' THEN 1
+                    ELSE w.xwalk
+                    END AS xwalk
+        ) class
+CROSS JOIN LATERAL (
+            SELECT  CASE
+                    WHEN osm.maxspeed LIKE '% mph'
+                        THEN substring(osm.maxspeed from '\d+')::INT
+                    -- convert kmph to mph and round to nearest 5
+                    WHEN osm.maxspeed LIKE '% kmph' OR osm.maxspeed ~ '^\d+(\.\d+)?$'
+                        THEN ROUND(substring(osm.maxspeed from '\d+')::INT / 1.609 / 5)*5
+                    END AS speed_limit,
+                    CASE    WHEN osm."turn:lanes:forward" IS NOT NULL
+                                THEN    array_length(
+                                            regexp_split_to_array(
+                                                osm."turn:lanes:forward",
+                                                '\|'
+                                            ),
+                                            1       -- only one dimension
+                                        )
+                            WHEN osm."turn:lanes" IS NOT NULL AND osm."oneway" IN ('1', 'yes')
+                                THEN    array_length(
+                                            regexp_split_to_array(
+                                                osm."turn:lanes",
+                                                '\|'
+                                            ),
+                                            1       -- only one dimension
+                                        )
+                            WHEN osm."lanes:forward" IS NOT NULL
+                                THEN    substring(osm."lanes:forward" FROM '\d+')::INT
+                            WHEN osm."lanes" IS NOT NULL AND osm."oneway" IN ('1', 'yes')
+                                THEN    substring(osm."lanes" FROM '\d+')::INT
+                            WHEN osm."lanes" IS NOT NULL AND (osm."oneway" IS NULL OR osm."oneway" = 'no')
+                                THEN    ceil(substring(osm."lanes" FROM '\d+')::FLOAT / 2)
+                            END AS ft_lanes,
+                    CASE    WHEN osm."turn:lanes:backward" IS NOT NULL
+                                THEN    array_length(
+                                            regexp_split_to_array(
+                                                osm."turn:lanes:backward",
+                                                '\|'
+                                            ),
+                                            1       -- only one dimension
+                                        )
+                            WHEN osm."turn:lanes" IS NOT NULL AND osm."oneway" = '-1'
+                                THEN    array_length(
+                                            regexp_split_to_array(
+                                                osm."turn:lanes",
+                                                '\|'
+                                            ),
+                                            1       -- only one dimension
+                                        )
+                            WHEN osm."lanes:backward" IS NOT NULL
+                                THEN    substring(osm."lanes:backward" FROM '\d+')::INT
+                            WHEN osm."lanes" IS NOT NULL AND osm."oneway" = '-1'
+                                THEN    substring(osm."lanes" FROM '\d+')::INT
+                            WHEN osm."lanes" IS NOT NULL AND (osm."oneway" IS NULL OR osm."oneway" = 'no')
+                                THEN    ceil(substring(osm."lanes" FROM '\d+')::FLOAT / 2)
+                            END AS tf_lanes,
+                    CASE    WHEN osm."turn:lanes:forward" IS NOT NULL
+                                THEN    array_length(
+                                            array_remove(
+                                                regexp_split_to_array(
+                                                    osm."turn:lanes:forward",
+                                                    '\|'
+                                                ),
+                                                'right'     -- don't consider right-only lanes for crossing stress
+                                            ),
+                                            1               -- only one dimension
+                                        )
+                            WHEN osm."turn:lanes" IS NOT NULL AND osm."oneway" IN ('1', 'yes')
+                                THEN    array_length(
+                                            array_remove(
+                                                regexp_split_to_array(
+                                                    osm."turn:lanes",
+                                                    '\|'
+                                                ),
+                                                'right'     -- don't consider right-only lanes for crossing stress
+                                            ),
+                                            1               -- only one dimension
+                                        )
+                            WHEN osm."lanes:forward" IS NOT NULL
+                                THEN    substring(osm."lanes:forward" FROM '\d+')::INT
+                            WHEN osm."lanes" IS NOT NULL AND osm."oneway" IN ('1', 'yes')
+                                THEN    substring(osm."lanes" FROM '\d+')::INT
+                            WHEN osm."lanes" IS NOT NULL AND (osm."oneway" IS NULL OR osm."oneway" = 'no')
+                                THEN    ceil(substring(osm."lanes" FROM '\d+')::FLOAT / 2)
+                            END AS ft_cross_lanes,
+                    CASE    WHEN osm."turn:lanes:backward" IS NOT NULL
+                                THEN    array_length(
+                                            array_remove(
+                                                regexp_split_to_array(
+                                                    osm."turn:lanes:backward",
+                                                    '\|'
+                                                ),
+                                                'right'     -- don't consider right-only lanes for crossing stress
+                                            ),
+                                            1               -- only one dimension
+                                        )
+                            WHEN osm."turn:lanes" IS NOT NULL AND osm."oneway" = '-1'
+                                THEN    array_length(
+                                            array_remove(
+                                                regexp_split_to_array(
+                                                    osm."turn:lanes",
+                                                    '\|'
+                                                ),
+                                                'right'     -- don't consider right-only lanes for crossing stress
+                                            ),
+                                            1               -- only one dimension
+                                        )
+                            WHEN osm."lanes:backward" IS NOT NULL
+                                THEN    substring(osm."lanes:backward" FROM '\d+')::INT
+                            WHEN osm."lanes" IS NOT NULL AND osm."oneway" = '-1'
+                                THEN    substring(osm."lanes" FROM '\d+')::INT
+                            WHEN osm."lanes" IS NOT NULL AND (osm."oneway" IS NULL OR osm."oneway" = 'no')
+                                THEN    ceil(substring(osm."lanes" FROM '\d+')::FLOAT / 2)
+                            END AS tf_cross_lanes,
+                    CASE
+                    WHEN osm.osm_id IS NULL THEN w.twltl_cross_lanes
+                    WHEN osm."lanes:both_ways" IS NOT NULL THEN 1
+                    WHEN osm."turn:lanes:both_ways" IS NOT NULL THEN 1
+                    END AS twltl_cross_lanes,
+                    -- the parking of each side overrides the one of both sides
+                    CASE  WHEN osm."parking:lane:right" = 'parallel' THEN 1
+                          WHEN osm."parking:lane:right" = 'paralell' THEN 1
+                          WHEN osm."parking:lane:right" = 'diagonal' THEN 1
+                          WHEN osm."parking:lane:right" = 'perpendicular' THEN 1
+                          WHEN osm."parking:lane:right" = 'no_parking' THEN 0
+                          WHEN osm."parking:lane:right" = 'no_stopping' THEN 0
+                          END AS ft_park,
+                    CASE  WHEN osm."parking:lane:left" = 'parallel' THEN 1
+                          WHEN osm."parking:lane:left" = 'paralell' THEN 1
+                          WHEN osm."parking:lane:left" = 'diagonal' THEN 1
+                          WHEN osm."parking:lane:left" = 'perpendicular' THEN 1
+                          WHEN osm."parking:lane:left" = 'no_parking' THEN 0
+                          WHEN osm."parking:lane:left" = 'no_stopping' THEN 0
+                          END AS tf_park,
+                    CASE
+
+                    -- :both
+                    WHEN osm."cycleway:both" = 'shared_lane'
+                        THEN 'sharrow'
+                    WHEN osm."cycleway:both" = 'buffered_lane'
+                        THEN 'buffered_lane'
+                    WHEN osm."cycleway:both" = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                        THEN 'buffered_lane'
+                    WHEN osm."cycleway:both" = 'lane' AND osm."cycleway:both:buffer" IN ('yes','both','right','left')
+                        THEN 'buffered_lane'
+                    WHEN osm."cycleway:both" = 'lane'
+                        THEN 'lane'
+                    WHEN osm."cycleway:both" = 'track'
+                        THEN 'track'
+                    WHEN (osm."cycleway:right" = 'track' AND osm."oneway:bicycle" = 'no')
+                        THEN 'track'
+                    WHEN (osm."cycleway:left" = 'track' AND osm."oneway:bicycle" = 'no')
+                        THEN 'track'
+                    WHEN (osm.cycleway = 'track' AND osm."oneway:bicycle" = 'no')
+                        THEN 'track'
+
+                    -- one-way=ft
+                    WHEN base.one_way_car = 'ft'
+                        THEN CASE   WHEN osm."cycleway:left" = 'shared_lane'
+                                        THEN 'sharrow'
+                                    WHEN osm."cycleway:left" = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:left" = 'lane' AND osm."cycleway:left:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:left" = 'lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway:left" = 'track'
+                                        THEN 'track'
+
+                                    -- stuff from two-way that also applies to one-way=ft
+                                    WHEN osm.cycleway = 'shared_lane'
+                                        THEN 'sharrow'
+                                    WHEN osm."cycleway:right" = 'shared_lane'
+                                        THEN 'sharrow'
+                                    WHEN osm.cycleway = 'buffered_lane'
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'buffered_lane'
+                                        THEN 'buffered_lane'
+                                    WHEN osm.cycleway = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'lane' AND osm."cycleway:right:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm.cycleway = 'lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway:right" = 'lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway" = 'track'
+                                        THEN 'track'
+                                    WHEN osm."cycleway:right" = 'track'
+                                        THEN 'track'
+                                    END
+
+                    -- one-way=tf
+                    WHEN base.one_way_car = 'tf'
+                        THEN CASE   WHEN osm.cycleway = 'opposite_lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'opposite_lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'opposite_lane' AND osm."cycleway:right:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm.cycleway = 'opposite_lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway:right" = 'opposite_lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway" = 'opposite_track'
+                                        THEN 'track'
+                                    WHEN (base.one_way_car = 'tf' AND osm."cycleway:left" = 'opposite_track')
+                                        THEN 'track'
+                                    WHEN (base.one_way_car = 'tf' AND osm."cycleway:right" = 'opposite_track')
+                                        THEN 'track'
+                                    END
+
+                    -- two-way
+                    WHEN base.one_way_car IS NULL
+                        THEN CASE   WHEN osm.cycleway = 'shared_lane'
+                                        THEN 'sharrow'
+                                    WHEN osm."cycleway:right" = 'shared_lane'
+                                        THEN 'sharrow'
+                                    WHEN osm.cycleway = 'buffered_lane'
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'buffered_lane'
+                                        THEN 'buffered_lane'
+                                    WHEN osm.cycleway = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'lane' AND osm."cycleway:right:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm.cycleway = 'lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway:right" = 'lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway" = 'track'
+                                        THEN 'track'
+                                    WHEN osm."cycleway:right" = 'track'
+                                        THEN 'track'
+                                    END
+                    END AS ft_bike_infra,
+                    CASE
+
+                    -- :both
+                    WHEN osm."cycleway:both" = 'shared_lane'
+                        THEN 'sharrow'
+                    WHEN osm."cycleway:both" = 'buffered_lane'
+                        THEN 'buffered_lane'
+                    WHEN osm."cycleway:both" = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                        THEN 'buffered_lane'
+                    WHEN osm."cycleway:both" = 'lane' AND osm."cycleway:both:buffer" IN ('yes','both','right','left')
+                        THEN 'buffered_lane'
+                    WHEN osm."cycleway:both" = 'lane'
+                        THEN 'lane'
+                    WHEN osm."cycleway:both" = 'track'
+                        THEN 'track'
+                    WHEN (osm."cycleway:right" = 'track' AND osm."oneway:bicycle" = 'no')
+                        THEN 'track'
+                    WHEN (osm."cycleway:left" = 'track' AND osm."oneway:bicycle" = 'no')
+                        THEN 'track'
+                    WHEN (osm.cycleway = 'track' AND osm."oneway:bicycle" = 'no')
+                        THEN 'track'
+
+                    -- one-way=tf
+                    WHEN base.one_way_car = 'tf'
+                        THEN CASE   WHEN osm."cycleway:right" = 'shared_lane'
+                                        THEN 'sharrow'
+                                    WHEN osm."cycleway:right" = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'lane' AND osm."cycleway:right:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway:right" = 'track'
+                                        THEN 'track'
+
+                                    -- stuff from two-way that also applies to one-way=tf
+                                    WHEN osm.cycleway = 'shared_lane'
+                                        THEN 'sharrow'
+                                    WHEN osm."cycleway:left" = 'shared_lane'
+                                        THEN 'sharrow'
+                                    WHEN osm.cycleway = 'buffered_lane'
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:left" = 'buffered_lane'
+                                        THEN 'buffered_lane'
+                                    WHEN osm.cycleway = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:left" = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:left" = 'lane' AND osm."cycleway:left:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm.cycleway = 'lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway:left" = 'lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway" = 'track'
+                                        THEN 'track'
+                                    WHEN osm."cycleway:left" = 'track'
+                                        THEN 'track'
+                                    END
+
+                    -- one-way=ft
+                    WHEN base.one_way_car = 'ft'
+                        THEN CASE   WHEN osm.cycleway = 'opposite_lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'opposite_lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:right" = 'opposite_lane' AND osm."cycleway:right:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm.cycleway = 'opposite_lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway:right" = 'opposite_lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway" = 'opposite_track'
+                                        THEN 'track'
+                                    WHEN (base.one_way_car = 'tf' AND osm."cycleway:left" = 'opposite_track')
+                                        THEN 'track'
+                                    WHEN (base.one_way_car = 'tf' AND osm."cycleway:right" = 'opposite_track')
+                                        THEN 'track'
+                                    END
+
+                    -- two-way
+                    WHEN base.one_way_car IS NULL
+                        THEN CASE   WHEN osm.cycleway = 'shared_lane'
+                                        THEN 'sharrow'
+                                    WHEN osm."cycleway:left" = 'shared_lane'
+                                        THEN 'sharrow'
+                                    WHEN osm.cycleway = 'buffered_lane'
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:left" = 'buffered_lane'
+                                        THEN 'buffered_lane'
+                                    WHEN osm.cycleway = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:left" = 'lane' AND osm."cycleway:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm."cycleway:left" = 'lane' AND osm."cycleway:left:buffer" IN ('yes','both','right','left')
+                                        THEN 'buffered_lane'
+                                    WHEN osm.cycleway = 'lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway:left" = 'lane'
+                                        THEN 'lane'
+                                    WHEN osm."cycleway" = 'track'
+                                        THEN 'track'
+                                    WHEN osm."cycleway:left" = 'track'
+                                        THEN 'track'
+                                    END
+                    END AS tf_bike_infra
+        ) segment
+CROSS JOIN LATERAL (
+            -- update one_way based on bike infra
+            SELECT  CASE
+                    WHEN base.one_way_car = 'ft'
+                    AND  NOT (segment.tf_bike_infra IS NOT NULL OR COALESCE(osm."oneway:bicycle",'yes') = 'no')
+                        THEN base.one_way_car
+                    WHEN base.one_way_car = 'tf'
+                    AND  NOT (segment.ft_bike_infra IS NOT NULL OR COALESCE(osm."oneway:bicycle",'yes') = 'no')
+                        THEN base.one_way_car
+                    END AS one_way,
+                    -- get facility widths
+                    CASE
+                    WHEN segment.ft_bike_infra IS NULL THEN w.ft_bike_infra_width
+                    ELSE
+                        CASE
+
+                        -- feet
+                        WHEN osm."cycleway:right:width" LIKE '% ft'
+                            THEN substring(osm."cycleway:right:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN base.one_way_car = 'ft' AND osm."cycleway:left:width" LIKE '% ft'
+                            THEN substring(osm."cycleway:left:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:both:width" LIKE '% ft'
+                            THEN substring(osm."cycleway:both:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:width" LIKE '% ft'
+                            THEN substring(osm."cycleway:width" from '\d+\.?\d?\d?')::FLOAT
+
+                        -- meters
+                        WHEN osm."cycleway:right:width" LIKE '% m'
+                            THEN 3.28084 * substring(osm."cycleway:right:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN base.one_way_car = 'ft' AND osm."cycleway:left:width" LIKE '% m'
+                            THEN 3.28084 * substring(osm."cycleway:left:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:both:width" LIKE '% m'
+                            THEN 3.28084 * substring(osm."cycleway:both:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:width" LIKE '% m'
+                            THEN 3.28084 * substring(osm."cycleway:width" from '\d+\.?\d?\d?')::FLOAT
+
+                        -- no units (default=meters)
+                        WHEN osm."cycleway:right:width" IS NOT NULL
+                            THEN 3.28084 * substring(osm."cycleway:right:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN base.one_way_car = 'ft' AND osm."cycleway:left:width" IS NOT NULL
+                            THEN 3.28084 * substring(osm."cycleway:left:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:both:width" IS NOT NULL
+                            THEN 3.28084 * substring(osm."cycleway:both:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:width" IS NOT NULL
+                            THEN 3.28084 * substring(osm."cycleway:width" from '\d+\.?\d?\d?')::FLOAT
+                        END
+                    END AS ft_bike_infra_width,
+                    CASE
+                    WHEN segment.tf_bike_infra IS NULL THEN w.tf_bike_infra_width
+                    ELSE
+                        CASE
+
+                        -- feet
+                        WHEN osm."cycleway:left:width" LIKE '% ft'
+                            THEN substring(osm."cycleway:left:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN base.one_way_car = 'tf' AND osm."cycleway:right:width" LIKE '% ft'
+                            THEN substring(osm."cycleway:right:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:both:width" LIKE '% ft'
+                            THEN substring(osm."cycleway:both:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:width" LIKE '% ft'
+                            THEN substring(osm."cycleway:width" from '\d+\.?\d?\d?')::FLOAT
+
+                        -- meters
+                        WHEN osm."cycleway:left:width" LIKE '% m'
+                            THEN 3.28084 * substring(osm."cycleway:left:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN base.one_way_car = 'tf' AND osm."cycleway:right:width" LIKE '% m'
+                            THEN 3.28084 * substring(osm."cycleway:right:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:both:width" LIKE '% m'
+                            THEN 3.28084 * substring(osm."cycleway:both:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:width" LIKE '% m'
+                            THEN 3.28084 * substring(osm."cycleway:width" from '\d+\.?\d?\d?')::FLOAT
+
+                        -- no units (default=meters)
+                        WHEN osm."cycleway:left:width" IS NOT NULL
+                            THEN 3.28084 * substring(osm."cycleway:left:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN base.one_way_car = 'tf' AND osm."cycleway:right:width" IS NOT NULL
+                            THEN 3.28084 * substring(osm."cycleway:right:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:both:width" IS NOT NULL
+                            THEN 3.28084 * substring(osm."cycleway:both:width" from '\d+\.?\d?\d?')::FLOAT
+                        WHEN osm."cycleway:width" IS NOT NULL
+                            THEN 3.28084 * substring(osm."cycleway:width" from '\d+\.?\d?\d?')::FLOAT
+                        END
+                    END AS tf_bike_infra_width
+        ) bike;
+
+UPDATE  neighborhood_ways
+SET     one_way_car = f.one_way_car,
+        width_ft = f.width_ft,
+        functional_class = f.functional_class,
+        xwalk = f.xwalk,
+        speed_limit = f.speed_limit,
+        ft_lanes = f.ft_lanes,
+        tf_lanes = f.tf_lanes,
+        ft_cross_lanes = f.ft_cross_lanes,
+        tf_cross_lanes = f.tf_cross_lanes,
+        twltl_cross_lanes = f.twltl_cross_lanes,
+        ft_park = f.ft_park,
+        tf_park = f.tf_park,
+        ft_bike_infra = f.ft_bike_infra,
+        tf_bike_infra = f.tf_bike_infra,
+        one_way = f.one_way,
+        ft_bike_infra_width = f.ft_bike_infra_width,
+        tf_bike_infra_width = f.tf_bike_infra_width
+FROM    tmp_road_features f
+WHERE   neighborhood_ways.road_id = f.road_id;
+
+DROP TABLE tmp_road_features;
+
+-- remove stuff that we don't want to route over
+DELETE FROM neighborhood_ways WHERE functional_class IS NULL;
+
+-- remove orphans
+DELETE FROM neighborhood_ways
+WHERE   NOT EXISTS (
+            SELECT  1
+            FROM    neighborhood_ways w
+            WHERE   neighborhood_ways.intersection_to IN (w.intersection_to,w.intersection_from)
+            AND     w.road_id != neighborhood_ways.road_id
+)
+AND     NOT EXISTS (
+            SELECT  1
+            FROM    neighborhood_ways w
+            WHERE   neighborhood_ways.intersection_from IN (w.intersection_to,w.intersection_from)
+            AND     w.road_id != neighborhood_ways.road_id
+);
+
+-- remove obsolete intersections
+DELETE FROM neighborhood_ways_intersections
+WHERE NOT EXISTS (
+    SELECT  1
+    FROM    neighborhood_ways w
+    WHERE   int_id IN (w.intersection_to,w.intersection_from)
+);
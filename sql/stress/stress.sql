@@ -0,0 +1,621 @@
+----------------------------------------
+-- Stress ratings of the road segments and of the intersections,
+-- computed in a single pass over the ways and written back at once.
+-- Equivalent to running the stress_*.sql files in the order of
+-- 31-compute-stress.sh.
+-- Input variables:
+--      :primary_speed -> assumed speed limit for primary roads
+--      :secondary_speed -> assumed speed limit for secondary roads
+--      :tertiary_speed -> assumed speed limit for tertiary roads
+--      :unclassified_speed -> assumed speed limit for unclassified roads
+--      :primary_lanes -> assumed number of lanes for primary roads (only 1/2 the road)
+--      :secondary_lanes -> assumed number of lanes for secondary roads (only 1/2 the road)
+--      :tertiary_lanes -> assumed number of lanes for tertiary roads (only 1/2 the road)
+--      :default_parking -> assumed parking 1/0
+--      :default_parking_width -> assumed parking lane width
+--      :default_facility_width -> assumed width of bike facility
+--      :default_roadway_width -> assumed width of residential and unclassified roadways
+--      :state_default -> state default residential speed
+--      :city_default -> city default residential speed
+----------------------------------------
+DROP TABLE IF EXISTS tmp_crossings;
+DROP TABLE IF EXISTS tmp_stress;
+
+-- roads crossed at the uncontrolled intersections, kept when crossing them
+-- is stressful for a lesser road (tertiary roads are only stressful to
+-- cross for a lesser road, not for another tertiary road)
+CREATE TEMP TABLE tmp_crossings AS
+SELECT  i.int_id,
+        w.functional_class,
+        COALESCE(w.name,'b') AS name
+FROM    neighborhood_ways w
+CROSS JOIN LATERAL (
+            VALUES (w.intersection_to), (w.intersection_from)
+        ) AS ends (int_id)
+JOIN    neighborhood_ways_intersections i
+    ON  i.int_id = ends.int_id
+WHERE   NOT i.signalized
+AND     NOT i.stops
+AND     CASE
+        WHEN w.functional_class IN ('motorway','trunk') THEN TRUE
+
+        -- two way primary
+        WHEN w.functional_class = 'primary' AND w.one_way IS NULL
+            THEN    CASE
+                    WHEN COALESCE(w.ft_lanes,:primary_lanes) + COALESCE(w.tf_lanes,:primary_lanes) > 4 THEN TRUE
+
+                    -- with rrfb
+                    WHEN i.rrfb
+                        THEN    CASE
+                                WHEN COALESCE(w.ft_lanes,:primary_lanes) + COALESCE(w.tf_lanes,:primary_lanes) = 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:primary_speed) > 40 THEN TRUE
+                                            WHEN COALESCE(w.speed_limit,:primary_speed) > 30
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,:primary_lanes) + COALESCE(w.tf_lanes,:primary_lanes) < 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:primary_speed) > 35
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                END
+
+                    -- without rrfb
+                    ELSE        CASE
+                                WHEN COALESCE(w.ft_lanes,:primary_lanes) + COALESCE(w.tf_lanes,:primary_lanes) = 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:primary_speed) > 30 THEN TRUE
+                                            WHEN COALESCE(w.speed_limit,:primary_speed) = 30
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,:primary_lanes) + COALESCE(w.tf_lanes,:primary_lanes) < 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:primary_speed) > 30
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                END
+                    END
+
+        -- one way primary
+        WHEN w.functional_class = 'primary' AND w.one_way IS NOT NULL
+            THEN    CASE
+                    WHEN COALESCE(w.ft_lanes,w.tf_lanes,:primary_lanes) > 2 THEN TRUE
+
+                    -- with rrfb
+                    WHEN i.rrfb
+                        THEN    CASE
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:primary_lanes) = 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:primary_speed) > 40 THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:primary_lanes) < 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:primary_speed) > 35 THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                END
+
+                    -- without rrfb
+                    ELSE        CASE
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:primary_lanes) = 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:primary_speed) > 30 THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:primary_lanes) < 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:primary_speed) > 30 THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                END
+                    END
+
+        -- two way secondary
+        WHEN w.functional_class = 'secondary' AND w.one_way IS NULL
+            THEN    CASE
+                    WHEN COALESCE(w.ft_lanes,:secondary_lanes) + COALESCE(w.tf_lanes,:secondary_lanes) > 4 THEN TRUE
+
+                    -- with rrfb
+                    WHEN i.rrfb
+                        THEN    CASE
+                                WHEN COALESCE(w.ft_lanes,:secondary_lanes) + COALESCE(w.tf_lanes,:secondary_lanes) = 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:secondary_speed) > 40 THEN TRUE
+                                            WHEN COALESCE(w.speed_limit,:secondary_speed) > 30
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,:secondary_lanes) + COALESCE(w.tf_lanes,:secondary_lanes) < 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:secondary_speed) > 35
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                END
+
+                    -- without rrfb
+                    ELSE        CASE
+                                WHEN COALESCE(w.ft_lanes,:secondary_lanes) + COALESCE(w.tf_lanes,:secondary_lanes) = 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:secondary_speed) > 30 THEN TRUE
+                                            WHEN COALESCE(w.speed_limit,:secondary_speed) = 30
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,:secondary_lanes) + COALESCE(w.tf_lanes,:secondary_lanes) < 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:secondary_speed) > 30
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                END
+                    END
+
+        -- one way secondary
+        WHEN w.functional_class = 'secondary' AND w.one_way IS NOT NULL
+            THEN    CASE
+                    WHEN COALESCE(w.ft_lanes,w.tf_lanes,:secondary_lanes) > 2 THEN TRUE
+
+                    -- with rrfb
+                    WHEN i.rrfb
+                        THEN    CASE
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:secondary_lanes) = 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:secondary_speed) > 40 THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:secondary_lanes) < 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:secondary_speed) > 35
+                                                THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                END
+
+                    -- without rrfb
+                    ELSE        CASE
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:secondary_lanes) = 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:secondary_speed) > 30 THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:secondary_lanes) < 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:secondary_speed) > 30
+                                                THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                END
+                    END
+
+        -- two way tertiary
+        WHEN w.functional_class = 'tertiary' AND w.one_way IS NULL
+            THEN    CASE
+                    WHEN COALESCE(w.ft_lanes,:tertiary_lanes) + COALESCE(w.tf_lanes,:tertiary_lanes) > 4 THEN TRUE
+
+                    -- with rrfb
+                    WHEN i.rrfb
+                        THEN    CASE
+                                WHEN COALESCE(w.ft_lanes,:tertiary_lanes) + COALESCE(w.tf_lanes,:tertiary_lanes) = 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:tertiary_speed) > 40 THEN TRUE
+                                            WHEN COALESCE(w.speed_limit,:tertiary_speed) > 30
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,:tertiary_lanes) + COALESCE(w.tf_lanes,:tertiary_lanes) < 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:tertiary_speed) > 35
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                END
+
+                    -- without rrfb
+                    ELSE        CASE
+                                WHEN COALESCE(w.ft_lanes,:tertiary_lanes) + COALESCE(w.tf_lanes,:tertiary_lanes) = 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:tertiary_speed) > 30 THEN TRUE
+                                            WHEN COALESCE(w.speed_limit,:tertiary_speed) = 30
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,:tertiary_lanes) + COALESCE(w.tf_lanes,:tertiary_lanes) < 4
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:tertiary_speed) > 30
+                                                THEN    CASE
+                                                        WHEN i.island THEN FALSE
+                                                        ELSE TRUE
+                                                        END
+                                            ELSE FALSE
+                                            END
+                                END
+                    END
+
+        -- one way tertiary
+        WHEN w.functional_class = 'tertiary' AND w.one_way IS NOT NULL
+            THEN    CASE
+                    WHEN COALESCE(w.ft_lanes,w.tf_lanes,:tertiary_lanes) > 2 THEN TRUE
+
+                    -- with rrfb
+                    WHEN i.rrfb
+                        THEN    CASE
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:tertiary_lanes) = 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:tertiary_speed) > 40 THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:tertiary_lanes) < 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:tertiary_speed) > 35
+                                                THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                END
+
+                    -- without rrfb
+                    ELSE        CASE
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:tertiary_lanes) = 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:tertiary_speed) > 30 THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                WHEN COALESCE(w.ft_lanes,w.tf_lanes,:tertiary_lanes) < 2
+                                    THEN    CASE
+                                            WHEN COALESCE(w.speed_limit,:tertiary_speed) > 30
+                                                THEN TRUE
+                                            ELSE FALSE
+                                            END
+                                END
+                    END
+        END;
+CREATE INDEX tidx_tmp_crossings_int_id ON tmp_crossings (int_id);
+ANALYZE tmp_crossings;
+
+-- stress of the segments and of the intersections
+CREATE TEMP TABLE tmp_stress AS
+SELECT  w.road_id,
+        CASE WHEN w.one_way = 'tf' THEN NULL ELSE seg.ft_seg_stress END AS ft_seg_stress,
+        CASE WHEN w.one_way = 'ft' THEN NULL ELSE seg.tf_seg_stress END AS tf_seg_stress,
+        ints.ft_int_stress,
+        ints.tf_int_stress
+FROM    neighborhood_ways w
+LEFT JOIN (
+            VALUES
+                ('primary', :primary_speed, :primary_lanes),
+                ('secondary', :secondary_speed, :secondary_lanes),
+                ('tertiary', :tertiary_speed, :tertiary_lanes)
+        ) AS d (functional_class, speed, lanes)
+    ON  w.functional_class IN (d.functional_class, d.functional_class||'_link')
+CROSS JOIN LATERAL (
+            -- residential and unclassified, the same in both directions
+            SELECT  CASE
+                    WHEN lower_order.speed = 25
+                        THEN    CASE
+                                WHEN COALESCE(w.ft_park,:default_parking) + COALESCE(w.tf_park,:default_parking) = 2    -- parking on both sides
+                                    THEN    CASE
+                                            WHEN COALESCE(w.width_ft,:default_roadway_width) >= 27
+                                                THEN 1
+                                            ELSE 2
+                                            END
+                                ELSE    CASE                                                                            -- parking on one side
+                                        WHEN COALESCE(w.width_ft,:default_roadway_width) >= 19
+                                            THEN 1
+                                        ELSE 2
+                                        END
+                                END
+                    WHEN lower_order.speed <= 20 THEN 1
+                    ELSE 3
+                    END AS seg_stress
+            FROM    (
+                        SELECT  CASE
+                                WHEN w.functional_class = 'residential'
+                                    THEN COALESCE(w.speed_limit, :city_default, :state_default)
+                                ELSE COALESCE(w.speed_limit,:unclassified_speed)
+                                END AS speed
+                    ) lower_order
+        ) lower_order
+CROSS JOIN LATERAL (
+            SELECT  CASE
+                    WHEN w.functional_class IN ('motorway','motorway_link','trunk','trunk_link') THEN 3
+                    WHEN d.functional_class IS NOT NULL THEN
+                            CASE
+                            WHEN w.ft_bike_infra = 'track' THEN 1
+                            WHEN w.ft_bike_infra = 'buffered_lane'
+                                THEN    CASE
+                                        WHEN COALESCE(w.speed_limit,d.speed) > 35 THEN 3
+                                        WHEN COALESCE(w.speed_limit,d.speed) = 35
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.ft_lanes,d.lanes) > 1 THEN 3
+                                                    ELSE    CASE
+                                                            WHEN COALESCE(w.ft_park,:default_parking) = 1 THEN 2
+                                                            ELSE 1
+                                                            END
+                                                    END
+                                        WHEN COALESCE(w.speed_limit,d.speed) = 30
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.ft_lanes,d.lanes) > 1
+                                                        THEN    CASE
+                                                                WHEN COALESCE(w.ft_park,:default_parking) = 1 THEN 2
+                                                                ELSE 1
+                                                                END
+                                                    ELSE 1
+                                                    END
+                                        WHEN COALESCE(w.speed_limit,d.speed) < 30 THEN 1
+                                        ELSE 3
+                                        END
+                            WHEN w.ft_bike_infra = 'lane' AND COALESCE(w.ft_park,:default_parking) = 0  -- bike lane with no parking
+                                THEN    CASE
+                                        WHEN COALESCE(w.speed_limit,d.speed) > 30 THEN 3
+                                        WHEN COALESCE(w.speed_limit,d.speed) = 30
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.ft_lanes,d.lanes) > 1 THEN 3
+                                                    ELSE 1
+                                                    END
+                                        WHEN COALESCE(w.speed_limit,d.speed) = 25
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.ft_lanes,d.lanes) > 1 THEN 3
+                                                    ELSE 1
+                                                    END
+                                        WHEN COALESCE(w.speed_limit,d.speed) <= 20
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.ft_lanes,d.lanes) > 2 THEN 3
+                                                    ELSE 1
+                                                    END
+                                        ELSE 3
+                                        END
+                            WHEN w.ft_bike_infra = 'lane' AND COALESCE(w.ft_park,:default_parking) = 1
+                                THEN    CASE
+                                        WHEN COALESCE(w.ft_bike_infra_width,:default_facility_width) + :default_parking_width >= 15   -- treat as buffered lane
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.speed_limit,d.speed) > 35 THEN 3
+                                                    WHEN COALESCE(w.speed_limit,d.speed) = 35 THEN 3
+                                                    WHEN COALESCE(w.speed_limit,d.speed) = 30
+                                                        THEN    CASE
+                                                                WHEN COALESCE(w.ft_lanes,d.lanes) > 1 THEN 2
+                                                                ELSE 1
+                                                                END
+                                                    WHEN COALESCE(w.speed_limit,d.speed) < 30 THEN 1
+                                                    ELSE 3
+                                                    END
+                                        WHEN COALESCE(w.ft_bike_infra_width,:default_facility_width) + :default_parking_width >= 12.9   -- treat as bike lane with no parking
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.speed_limit,d.speed) > 30 THEN 3
+                                                    WHEN COALESCE(w.speed_limit,d.speed) = 30
+                                                        THEN    CASE
+                                                                WHEN COALESCE(w.ft_lanes,d.lanes) > 1 THEN 3
+                                                                ELSE 1
+                                                                END
+                                                    WHEN COALESCE(w.speed_limit,d.speed) = 25
+                                                        THEN    CASE
+                                                                WHEN COALESCE(w.ft_lanes,d.lanes) > 1 THEN 3
+                                                                ELSE 1
+                                                                END
+                                                    WHEN COALESCE(w.speed_limit,d.speed) <= 20
+                                                        THEN    CASE
+                                                                WHEN COALESCE(w.ft_lanes,d.lanes) > 2 THEN 3
+                                                                ELSE 1
+                                                                END
+                                                    ELSE 3
+                                                    END
+                                        ELSE 3
+                                        END
+                            ELSE                -- shared lane
+                                        CASE
+                                        WHEN COALESCE(w.speed_limit,d.speed) <= 20
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.ft_lanes,d.lanes) = 1 THEN 1
+                                                    ELSE 3
+                                                    END
+                                        ELSE 3
+                                        END
+                            END
+                    WHEN w.functional_class IN ('residential','unclassified') THEN lower_order.seg_stress
+                    WHEN w.functional_class = 'living_street'
+                        THEN    CASE
+                                WHEN EXISTS (
+                                    SELECT  1
+                                    FROM    neighborhood_osm_full_line osm
+                                    WHERE   osm.osm_id = w.osm_id
+                                    AND     osm.bicycle = 'no'
+                                ) THEN 3
+                                ELSE 1
+                                END
+                    WHEN w.functional_class IN ('track','path') THEN 1
+                    ELSE w.ft_seg_stress
+                    END AS ft_seg_stress,
+                    CASE
+                    WHEN w.functional_class IN ('motorway','motorway_link','trunk','trunk_link') THEN 3
+                    WHEN d.functional_class IS NOT NULL THEN
+                            CASE
+                            WHEN w.tf_bike_infra = 'track' THEN 1
+                            WHEN w.tf_bike_infra = 'buffered_lane'
+                                THEN    CASE
+                                        WHEN COALESCE(w.speed_limit,d.speed) > 35 THEN 3
+                                        WHEN COALESCE(w.speed_limit,d.speed) = 35
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.tf_lanes,d.lanes) > 1 THEN 3
+                                                    ELSE    CASE
+                                                            WHEN COALESCE(w.tf_park,:default_parking) = 1 THEN 2
+                                                            ELSE 1
+                                                            END
+                                                    END
+                                        WHEN COALESCE(w.speed_limit,d.speed) = 30
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.tf_lanes,d.lanes) > 1
+                                                        THEN    CASE
+                                                                WHEN COALESCE(w.tf_park,:default_parking) = 1 THEN 2
+                                                                ELSE 1
+                                                                END
+                                                    ELSE 1
+                                                    END
+                                        WHEN COALESCE(w.speed_limit,d.speed) < 30 THEN 1
+                                        ELSE 3
+                                        END
+                            WHEN w.tf_bike_infra = 'lane' AND COALESCE(w.tf_park,:default_parking) = 0  -- bike lane with no parking
+                                THEN    CASE
+                                        WHEN COALESCE(w.speed_limit,d.speed) > 30 THEN 3
+                                        WHEN COALESCE(w.speed_limit,d.speed) = 30
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.tf_lanes,d.lanes) > 1 THEN 3
+                                                    ELSE 1
+                                                    END
+                                        WHEN COALESCE(w.speed_limit,d.speed) = 25
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.tf_lanes,d.lanes) > 1 THEN 3
+                                                    ELSE 1
+                                                    END
+                                        WHEN COALESCE(w.speed_limit,d.speed) <= 20
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.tf_lanes,d.lanes) > 2 THEN 3
+                                                    ELSE 1
+                                                    END
+                                        ELSE 3
+                                        END
+                            WHEN w.tf_bike_infra = 'lane' AND COALESCE(w.tf_park,:default_parking) = 1
+                                THEN    CASE
+                                        WHEN COALESCE(w.tf_bike_infra_width,:default_facility_width) + :default_parking_width >= 15   -- treat as buffered lane
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.speed_limit,d.speed) > 35 THEN 3
+                                                    WHEN COALESCE(w.speed_limit,d.speed) = 35 THEN 3
+                                                    WHEN COALESCE(w.speed_limit,d.speed) = 30
+                                                        THEN    CASE
+                                                                WHEN COALESCE(w.tf_lanes,d.lanes) > 1 THEN 2
+                                                                ELSE 1
+                                                                END
+                                                    WHEN COALESCE(w.speed_limit,d.speed) < 30 THEN 1
+                                                    ELSE 3
+                                                    END
+                                        WHEN COALESCE(w.tf_bike_infra_width,:default_facility_width) + :default_parking_width >= 12.9   -- treat as bike lane with no parking
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.speed_limit,d.speed) > 30 THEN 3
+                                                    WHEN COALESCE(w.speed_limit,d.speed) = 30
+                                                        THEN    CASE
+                                                                WHEN COALESCE(w.tf_lanes,d.lanes) > 1 THEN 3
+                                                                ELSE 1
+                                                                END
+                                                    WHEN COALESCE(w.speed_limit,d.speed) = 25
+                                                        THEN    CASE
+                                                                WHEN COALESCE(w.tf_lanes,d.lanes) > 1 THEN 3
+                                                                ELSE 1
+                                                                END
+                                                    WHEN COALESCE(w.speed_limit,d.speed) <= 20
+                                                        THEN    CASE
+                                                                WHEN COALESCE(w.tf_lanes,d.lanes) > 2 THEN 3
+                                                                ELSE 1
+                                                                END
+                                                    ELSE 3
+                                                    END
+                                        ELSE 3
+                                        END
+                            ELSE                -- shared lane
+                                        CASE
+                                        WHEN COALESCE(w.speed_limit,d.speed) <= 20
+                                            THEN    CASE
+                                                    WHEN COALESCE(w.tf_lanes,d.lanes) = 1 THEN 1
+                                                    ELSE 3
+                                                    END
+                                        ELSE 3
+                                        END
+                            END
+                    WHEN w.functional_class IN ('residential','unclassified') THEN lower_order.seg_stress
+                    WHEN w.functional_class = 'living_street'
+                        THEN    CASE
+                                WHEN EXISTS (
+                                    SELECT  1
+                                    FROM    neighborhood_osm_full_line osm
+                                    WHERE   osm.osm_id = w.osm_id
+                                    AND     osm.bicycle = 'no'
+                                ) THEN 3
+                                ELSE 1
+                                END
+                    WHEN w.functional_class IN ('track','path') THEN 1
+                    ELSE w.tf_seg_stress
+                    END AS tf_seg_stress
+        ) seg
+CROSS JOIN LATERAL (
+            -- assume low stress for the higher order roads, since these
+            -- junctions would always be controlled or free flowing
+            SELECT  CASE
+                    WHEN w.functional_class LIKE '%_link' THEN 1
+                    WHEN w.functional_class IN ('motorway','trunk','primary','secondary') THEN 1
+                    WHEN w.functional_class IN ('tertiary','residential','unclassified','living_street','track','path')
+                        THEN    CASE
+                                WHEN EXISTS (
+                                    SELECT  1
+                                    FROM    tmp_crossings c
+                                    WHERE   c.int_id = w.intersection_to
+                                    AND     COALESCE(w.name,'a') != c.name
+                                    AND     (w.functional_class != 'tertiary' OR c.functional_class != 'tertiary')
+                                ) THEN 3
+                                ELSE 1
+                                END
+                    ELSE w.ft_int_stress
+                    END AS ft_int_stress,
+                    CASE
+                    WHEN w.functional_class LIKE '%_link' THEN 1
+                    WHEN w.functional_class IN ('motorway','trunk','primary','secondary') THEN 1
+                    WHEN w.functional_class IN ('tertiary','residential','unclassified','living_street','track','path')
+                        THEN    CASE
+                                WHEN EXISTS (
+                                    SELECT  1
+                                    FROM    tmp_crossings c
+                                    WHERE   c.int_id = w.intersection_from
+                                    AND     COALESCE(w.name,'a') != c.name
+                                    AND     (w.functional_class != 'tertiary' OR c.functional_class != 'tertiary')
+                                ) THEN 3
+                                ELSE 1
+                                END
+                    ELSE w.tf_int_stress
+                    END AS tf_int_stress
+        ) ints;
+
+-- write all the stress ratings at once
+UPDATE  neighborhood_ways
+SET     ft_seg_stress = tmp_stress.ft_seg_stress,
+        tf_seg_stress = tmp_stress.tf_seg_stress,
+        ft_int_stress = tmp_stress.ft_int_stress,
+        tf_int_stress = tmp_stress.tf_int_stress
+FROM    tmp_stress
+WHERE   neighborhood_ways.road_id = tmp_stress.road_id;
+
+DROP TABLE tmp_crossings;
+DROP TABLE tmp_stress;
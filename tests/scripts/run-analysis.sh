@@ -46,7 +46,9 @@ bash -x "${GIT_ROOT}/scripts/23-import_osm.sh" "${BNA_OSM_FILE}"
 # Compute.
 bash -x "${GIT_ROOT}/scripts/30-compute-features.sh"
 bash -x "${GIT_ROOT}/scripts/31-compute-stress.sh"
-bash -x "${GIT_ROOT}/scripts/32-compute-run-connectivity.sh"
+bash -x "${GIT_ROOT}/scripts/32-compute-network.sh"
+bash -x "${GIT_ROOT}/scripts/33-compute-reachable-roads.sh"
+bash -x "${GIT_ROOT}/scripts/34-compute-run-connectivity.sh"
 
 # Export.
 rm -fr "${BNA_OUTPUT_DIR}"
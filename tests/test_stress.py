@@ -0,0 +1,203 @@
+"""Compare the single pass stress ratings with the ones of the stress scripts."""
+import pathlib
+import random
+import typing
+
+import psycopg
+import pytest
+from psycopg import sql
+
+from modular_bna.core import (
+    database,
+    pipeline,
+)
+
+SQL_DIR = pathlib.Path(__file__).parent.parent / "sql"
+DBNAME = "modbna_test_stress"
+
+CLASSES = (
+    "motorway",
+    "motorway_link",
+    "trunk",
+    "trunk_link",
+    "primary",
+    "primary_link",
+    "secondary",
+    "secondary_link",
+    "tertiary",
+    "tertiary_link",
+    "residential",
+    "unclassified",
+    "living_street",
+    "track",
+    "path",
+    "service",
+    None,
+)
+BIKE_INFRA = ("track", "buffered_lane", "lane", "sharrow", None)
+NAMES = ("main", "oak", "elm", "a", "b", None)
+STRESS_COLUMNS = ("ft_seg_stress", "tf_seg_stress", "ft_int_stress", "tf_int_stress")
+
+SCHEMA = """
+CREATE SCHEMA generated;
+CREATE SCHEMA received;
+CREATE SCHEMA scratch;
+CREATE TABLE received.neighborhood_ways (
+    road_id SERIAL PRIMARY KEY,
+    osm_id BIGINT,
+    name TEXT,
+    intersection_from INT,
+    intersection_to INT,
+    functional_class TEXT,
+    speed_limit INT,
+    one_way VARCHAR(2),
+    width_ft INT,
+    ft_bike_infra TEXT,
+    ft_bike_infra_width FLOAT,
+    tf_bike_infra TEXT,
+    tf_bike_infra_width FLOAT,
+    ft_lanes INT,
+    tf_lanes INT,
+    ft_park INT,
+    tf_park INT,
+    ft_seg_stress INT,
+    ft_int_stress INT,
+    tf_seg_stress INT,
+    tf_int_stress INT
+);
+CREATE TABLE received.neighborhood_ways_intersections (
+    int_id SERIAL PRIMARY KEY,
+    signalized BOOLEAN,
+    stops BOOLEAN,
+    rrfb BOOLEAN,
+    island BOOLEAN
+);
+CREATE TABLE received.neighborhood_osm_full_line (
+    osm_id BIGINT,
+    bicycle TEXT
+);
+"""
+
+
+@pytest.fixture
+def conn():
+    """Provide a connection to an empty database."""
+    try:
+        admin = psycopg.connect(database.conninfo(), autocommit=True)
+    except psycopg.OperationalError as e:
+        pytest.skip(f"no database available: {e}")
+    identifier = sql.Identifier(DBNAME)
+    with admin:
+        try:
+            admin.execute(sql.SQL("DROP DATABASE IF EXISTS {};").format(identifier))
+            admin.execute(sql.SQL("CREATE DATABASE {};").format(identifier))
+        except psycopg.Error as e:
+            pytest.skip(f"cannot create the test database: {e}")
+        with psycopg.connect(database.conninfo(dbname=DBNAME), autocommit=True) as conn:
+            conn.execute(SCHEMA)
+            conn.execute("SET search_path TO generated,received,scratch,public;")
+            yield conn
+        admin.execute(sql.SQL("DROP DATABASE {};").format(identifier))
+
+
+def populate(conn: psycopg.Connection, seed: int) -> None:
+    """Fill the tables with random roads and intersections."""
+    rnd = random.Random(seed)
+    intersections = 200
+    with conn.cursor() as cur:
+        cur.executemany(
+            """
+            INSERT INTO neighborhood_ways_intersections (
+                signalized, stops, rrfb, island
+            )
+            VALUES (%s, %s, %s, %s);
+            """,
+            [
+                tuple(rnd.choice((True, False, False)) for _ in range(4))
+                for _ in range(intersections)
+            ],
+        )
+        cur.executemany(
+            """
+            INSERT INTO neighborhood_ways (
+                osm_id, name, intersection_from, intersection_to, functional_class,
+                speed_limit, one_way, width_ft, ft_bike_infra, ft_bike_infra_width,
+                tf_bike_infra, tf_bike_infra_width, ft_lanes, tf_lanes, ft_park,
+                tf_park, ft_seg_stress, ft_int_stress, tf_seg_stress, tf_int_stress
+            )
+            VALUES (
+                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+            );
+            """,
+            [
+                (
+                    rnd.randint(1, 50),
+                    rnd.choice(NAMES),
+                    rnd.randint(1, intersections + 5),
+                    rnd.randint(1, intersections + 5),
+                    rnd.choice(CLASSES),
+                    rnd.choice((None, 15, 20, 25, 30, 35, 40, 45)),
+                    rnd.choice((None, None, "ft", "tf")),
+                    rnd.choice((None, 12, 19, 24, 27, 40)),
+                    rnd.choice(BIKE_INFRA),
+                    rnd.choice((None, 4, 5, 7.5)),
+                    rnd.choice(BIKE_INFRA),
+                    rnd.choice((None, 4, 5, 7.5)),
+                    rnd.choice((None, 1, 2, 3)),
+                    rnd.choice((None, 1, 2, 3)),
+                    rnd.choice((None, 0, 1)),
+                    rnd.choice((None, 0, 1)),
+                    *(rnd.choice((None, 1, 3)) for _ in STRESS_COLUMNS),
+                )
+                for _ in range(2_000)
+            ],
+        )
+        cur.executemany(
+            "INSERT INTO neighborhood_osm_full_line (osm_id, bicycle) VALUES (%s, %s);",
+            [(rnd.randint(1, 50), rnd.choice(("no", "yes", None))) for _ in range(40)],
+        )
+
+
+def compute(
+    conn: psycopg.Connection, steps: typing.Sequence[pipeline.Step]
+) -> typing.List[tuple]:
+    """Compute the stress ratings from the initial ones, and return them."""
+    columns = sql.SQL(", ").join(map(sql.Identifier, STRESS_COLUMNS))
+    conn.execute("DROP TABLE IF EXISTS initial_stress;")
+    conn.execute(
+        sql.SQL(
+            """
+            CREATE TEMP TABLE initial_stress AS
+            SELECT road_id, {} FROM neighborhood_ways;
+            """
+        ).format(columns)
+    )
+    for step in steps:
+        for statement in database.load(SQL_DIR / step.sql_file, step.variables):
+            conn.execute(statement)
+    rows = conn.execute(
+        sql.SQL("SELECT road_id, {} FROM neighborhood_ways ORDER BY road_id;").format(
+            columns
+        )
+    ).fetchall()
+    conn.execute(
+        sql.SQL(
+            "UPDATE neighborhood_ways w SET ({}) = (SELECT {} FROM initial_stress i "
+            "WHERE i.road_id = w.road_id);"
+        ).format(columns, columns)
+    )
+    return rows
+
+
+@pytest.mark.xs
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize(
+    "state_default,city_default", [("NULL", "NULL"), ("25", "NULL"), ("30", "20")]
+)
+def test_stress_parity(conn, seed, state_default, city_default):
+    """Ensure the single pass matches the stress scripts."""
+    populate(conn, seed)
+    expected = compute(conn, pipeline.stress_steps(state_default, city_default))
+    actual = compute(conn, [pipeline.stress_step(state_default, city_default)])
+    assert actual == expected